@@ -0,0 +1,36 @@
+"""add_image_variants
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # plant_images was only ever created by the app's create_all at startup,
+    # so on a fresh database the migrations have to create it themselves
+    if not sa.inspect(op.get_bind()).has_table('plant_images'):
+        op.create_table('plant_images',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('url', sa.String(), nullable=True),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('taken_date', sa.DateTime(), nullable=True),
+            sa.Column('variants', sa.JSON(), nullable=True),
+            sa.Column('plant_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['plant_id'], ['plants.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_plant_images_id'), 'plant_images', ['id'], unique=False)
+        return
+    op.add_column('plant_images', sa.Column('variants', sa.JSON(), nullable=True))
+
+def downgrade():
+    op.drop_column('plant_images', 'variants')
@@ -0,0 +1,43 @@
+"""add_query_indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+Composite indexes for the predicates the stats and garden routes filter on.
+Until now only primary keys were indexed, so every per-year stats query and
+every eager load of a plant's harvests or images was a sequential scan.
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Per-year plant lookups, optionally narrowed to a bed
+    op.create_index('ix_plants_year_bed_id', 'plants', ['year', 'bed_id'], unique=False)
+    # Per-year status rollups; quantity is included so SUM(quantity) is index-only
+    op.create_index(
+        'ix_plants_year_status', 'plants', ['year', 'status'],
+        unique=False, postgresql_include=['quantity']
+    )
+    # Bed detail, bed stats and bed deletion across all years
+    op.create_index('ix_plants_bed_id', 'plants', ['bed_id'], unique=False)
+    # Harvests per plant (eager loads and plant joins), in date order
+    op.create_index(
+        'ix_harvests_plant_id_harvest_date', 'harvests', ['plant_id', 'harvest_date'],
+        unique=False
+    )
+    # Images per plant, loaded with every plant list page
+    op.create_index('ix_plant_images_plant_id', 'plant_images', ['plant_id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_plant_images_plant_id', table_name='plant_images')
+    op.drop_index('ix_harvests_plant_id_harvest_date', table_name='harvests')
+    op.drop_index('ix_plants_bed_id', table_name='plants')
+    op.drop_index('ix_plants_year_status', table_name='plants')
+    op.drop_index('ix_plants_year_bed_id', table_name='plants')
@@ -0,0 +1,88 @@
+"""add_rollup_tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+Pre-aggregated totals per (year, bed) and per year, kept current by the
+garden routes (see src/rollups.py) and backfilled here from existing data.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def _total_columns():
+    return [
+        sa.Column(name, sa.Integer(), nullable=False, server_default='0')
+        for name in (
+            'plants_total', 'plants_planted', 'plants_sprouted', 'plants_flowering',
+            'plants_harvesting', 'plants_finished', 'space_used', 'harvest_count'
+        )
+    ] + [sa.Column('harvest_weight', sa.Float(), nullable=False, server_default='0')]
+
+def upgrade():
+    op.create_table('bed_year_rollups',
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('bed_id', sa.Integer(), nullable=False),
+        *_total_columns(),
+        sa.PrimaryKeyConstraint('year', 'bed_id')
+    )
+    op.create_table('year_rollups',
+        sa.Column('year', sa.Integer(), nullable=False),
+        *_total_columns(),
+        sa.PrimaryKeyConstraint('year')
+    )
+
+    op.execute("""
+        INSERT INTO bed_year_rollups (
+            year, bed_id, plants_total, plants_planted, plants_sprouted, plants_flowering,
+            plants_harvesting, plants_finished, space_used, harvest_count, harvest_weight
+        )
+        SELECT p.year, p.bed_id, p.plants_total, p.plants_planted, p.plants_sprouted,
+               p.plants_flowering, p.plants_harvesting, p.plants_finished, p.space_used,
+               coalesce(h.harvest_count, 0), coalesce(h.harvest_weight, 0)
+        FROM (
+            SELECT year, bed_id,
+                   coalesce(sum(quantity), 0) AS plants_total,
+                   coalesce(sum(CASE WHEN status = 'PLANTED' THEN quantity ELSE 0 END), 0) AS plants_planted,
+                   coalesce(sum(CASE WHEN status = 'SPROUTED' THEN quantity ELSE 0 END), 0) AS plants_sprouted,
+                   coalesce(sum(CASE WHEN status = 'FLOWERING' THEN quantity ELSE 0 END), 0) AS plants_flowering,
+                   coalesce(sum(CASE WHEN status = 'HARVESTING' THEN quantity ELSE 0 END), 0) AS plants_harvesting,
+                   coalesce(sum(CASE WHEN status = 'FINISHED' THEN quantity ELSE 0 END), 0) AS plants_finished,
+                   coalesce(sum(quantity * space_required), 0) AS space_used
+            FROM plants
+            WHERE year IS NOT NULL AND bed_id IS NOT NULL
+            GROUP BY year, bed_id
+        ) AS p
+        LEFT OUTER JOIN (
+            SELECT plants.year, plants.bed_id,
+                   count(harvests.id) AS harvest_count,
+                   sum(harvests.quantity * CASE harvests.unit
+                       WHEN 'lbs' THEN 1.0 WHEN 'oz' THEN 1 / 16.0
+                       WHEN 'g' THEN 1 / 453.592 WHEN 'kg' THEN 2.20462 ELSE 1.0 END) AS harvest_weight
+            FROM harvests JOIN plants ON plants.id = harvests.plant_id
+            WHERE harvests.harvest_date IS NOT NULL
+            GROUP BY plants.year, plants.bed_id
+        ) AS h ON h.year = p.year AND h.bed_id = p.bed_id
+    """)
+    op.execute("""
+        INSERT INTO year_rollups (
+            year, plants_total, plants_planted, plants_sprouted, plants_flowering,
+            plants_harvesting, plants_finished, space_used, harvest_count, harvest_weight
+        )
+        SELECT year, sum(plants_total), sum(plants_planted), sum(plants_sprouted),
+               sum(plants_flowering), sum(plants_harvesting), sum(plants_finished),
+               sum(space_used), sum(harvest_count), sum(harvest_weight)
+        FROM bed_year_rollups
+        GROUP BY year
+    """)
+
+def downgrade():
+    op.drop_table('year_rollups')
+    op.drop_table('bed_year_rollups')
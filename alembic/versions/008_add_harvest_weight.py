@@ -0,0 +1,53 @@
+"""add_harvest_weight
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+Store each harvest's quantity converted to pounds, so weight totals are
+SQL sums. Existing rows are backfilled with the unit table from
+src/units.py; count units (pieces, bunches...) keep their quantity.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('harvests', sa.Column('weight_lbs', sa.Float(), nullable=True))
+    op.execute("""
+        UPDATE harvests SET weight_lbs = quantity * CASE lower(trim(unit))
+            WHEN 'lbs' THEN 1.0 WHEN 'lb' THEN 1.0 WHEN 'pound' THEN 1.0 WHEN 'pounds' THEN 1.0
+            WHEN 'oz' THEN 1 / 16.0 WHEN 'ounce' THEN 1 / 16.0 WHEN 'ounces' THEN 1 / 16.0
+            WHEN 'g' THEN 1 / 453.59237 WHEN 'gram' THEN 1 / 453.59237 WHEN 'grams' THEN 1 / 453.59237
+            WHEN 'kg' THEN 1000 / 453.59237 WHEN 'kgs' THEN 1000 / 453.59237
+            WHEN 'kilogram' THEN 1000 / 453.59237 WHEN 'kilograms' THEN 1000 / 453.59237
+            ELSE 1.0
+        END
+        WHERE quantity IS NOT NULL
+    """)
+    # Re-derive the rollup weights from the stored column
+    op.execute("""
+        UPDATE bed_year_rollups r SET harvest_weight = coalesce(h.weight, 0)
+        FROM (
+            SELECT y.year, y.bed_id, sum(harvests.weight_lbs) AS weight
+            FROM bed_year_rollups y
+            LEFT JOIN plants ON plants.year = y.year AND plants.bed_id = y.bed_id
+            LEFT JOIN harvests ON harvests.plant_id = plants.id AND harvests.harvest_date IS NOT NULL
+            GROUP BY y.year, y.bed_id
+        ) AS h
+        WHERE h.year = r.year AND h.bed_id = r.bed_id
+    """)
+    op.execute("""
+        UPDATE year_rollups r SET harvest_weight = b.weight
+        FROM (SELECT year, sum(harvest_weight) AS weight FROM bed_year_rollups GROUP BY year) AS b
+        WHERE b.year = r.year
+    """)
+
+def downgrade():
+    op.drop_column('harvests', 'weight_lbs')
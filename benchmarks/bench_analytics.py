@@ -0,0 +1,238 @@
+"""Compare the vectorized stats charts with the row-by-row loops they replaced.
+
+Times the success rate, top producers and harvest timeline charts for the
+year with the most harvests, both end to end (queries included) and for the
+in-memory part alone. The baseline is the earlier implementation, kept
+below: every plant of the year loaded as an ORM object, harvests grouped by
+``to_char`` month, and dict accumulation in Python loops. Each chart is
+checked to come out the same both ways.
+
+Unless --reuse is given, the target database is reset and seeded through
+scripts/seed_garden.py with about 120k harvests in one year, so it only runs
+against an explicit --database-url (or BENCH_DATABASE_URL):
+
+    python benchmarks/bench_analytics.py --database-url postgresql://localhost/garden_bench
+    python benchmarks/bench_analytics.py --reuse --repeat 20
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import inspect
+import math
+import os
+import statistics
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from src import analytics
+from src.database import Base, async_database_url
+from src.models import DBHarvest, DBPlant, PlantStatus
+from src.routes import stats
+
+
+# --- Baseline: the loop-based implementation from before src/analytics.py ---
+
+async def legacy_plants(db: AsyncSession, year: int) -> list:
+    return (await db.execute(select(DBPlant).where(DBPlant.year == year))).scalars().all()
+
+
+async def legacy_weights(db: AsyncSession, year: int) -> list:
+    result = await db.execute(
+        select(
+            func.to_char(DBHarvest.harvest_date, 'YYYY-MM').label('month'),
+            DBPlant.name.label('plant_name'),
+            func.coalesce(func.sum(DBHarvest.weight_lbs), 0).label('weight')
+        )
+        .join(DBPlant)
+        .where(DBPlant.year == year, DBHarvest.harvest_date.isnot(None))
+        .group_by('month', 'plant_name')
+    )
+    return result.all()
+
+
+def legacy_timeline(weights: list) -> list:
+    timeline_data = {}
+    for row in weights:
+        timeline_data.setdefault(row.month, {})[row.plant_name] = row.weight
+    months = sorted(timeline_data.keys())
+    plants = sorted(set(plant for month_data in timeline_data.values() for plant in month_data.keys()))
+    return [
+        {"x": months, "y": [timeline_data.get(month, {}).get(plant, 0) for month in months], "name": plant}
+        for plant in plants
+    ]
+
+
+def legacy_success_rate(plants: list) -> list:
+    plant_stats = {}
+    for plant in plants:
+        if plant.name not in plant_stats:
+            plant_stats[plant.name] = {"total": 0, "success": 0}
+        plant_stats[plant.name]["total"] += plant.quantity
+        if plant.status in [PlantStatus.HARVESTING.value, PlantStatus.FINISHED.value]:
+            plant_stats[plant.name]["success"] += plant.quantity
+    success_rates = [
+        {"name": name, "rate": (s["success"] / s["total"] * 100) if s["total"] > 0 else 0, "total": s["total"]}
+        for name, s in plant_stats.items()
+        if s["total"] >= 5
+    ]
+    success_rates.sort(key=lambda x: x["rate"], reverse=True)
+    return [(item["name"], item["rate"], item["total"]) for item in success_rates]
+
+
+def legacy_top_producers(plants: list, weights: list) -> list:
+    plant_totals = {}
+    for plant in plants:
+        if plant.name not in plant_totals:
+            plant_totals[plant.name] = 0
+    for row in weights:
+        if row.plant_name in plant_totals:
+            plant_totals[row.plant_name] += row.weight
+    return sorted(plant_totals.items(), key=lambda x: x[1], reverse=True)
+
+
+async def legacy_timeline_for_year(db: AsyncSession, year: int) -> list:
+    return legacy_timeline(await legacy_weights(db, year))
+
+
+async def legacy_success_rate_for_year(db: AsyncSession, year: int) -> list:
+    return legacy_success_rate(await legacy_plants(db, year))
+
+
+async def legacy_top_producers_for_year(db: AsyncSession, year: int) -> list:
+    return legacy_top_producers(await legacy_plants(db, year), await legacy_weights(db, year))
+
+
+# --- Both implementations, reduced to comparable values ---
+
+async def legacy_charts(db: AsyncSession, year: int) -> dict:
+    return {
+        "harvests": await legacy_timeline_for_year(db, year),
+        "success-rate": await legacy_success_rate_for_year(db, year),
+        "top-producers": await legacy_top_producers_for_year(db, year),
+    }
+
+
+async def vectorized_charts(db: AsyncSession, year: int) -> dict:
+    timeline = await stats._harvest_timeline_for_year(db, year)
+    success = (await stats._success_rate_for_year(db, year))["data"][0]
+    producers = (await stats._top_producers_for_year(db, year))["data"][0]
+    totals = [int(text.split("(")[1].split()[0]) for text in success["text"]]
+    return {
+        "harvests": [{"x": t["x"], "y": t["y"], "name": t["name"]} for t in timeline["data"]],
+        "success-rate": list(zip(success["x"], success["y"], totals)),
+        "top-producers": list(zip(producers["x"], producers["y"])),
+    }
+
+
+def same(a, b) -> bool:
+    """Equal, allowing for float sums added up in a different order."""
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[key], b[key]) for key in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+# --- Timing ---
+
+async def median_ms(db: AsyncSession, build, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        result = build()
+        if inspect.isawaitable(result):
+            await result
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def run(database_url: str, repeat: int) -> None:
+    engine = create_async_engine(async_database_url(database_url))
+    async with AsyncSession(engine) as db:
+        year, harvests = (await db.execute(
+            select(DBPlant.year, func.count(DBHarvest.id)).join(DBHarvest)
+            .group_by(DBPlant.year).order_by(func.count(DBHarvest.id).desc()).limit(1)
+        )).one()
+        plants = await db.scalar(select(func.count(DBPlant.id)).where(DBPlant.year == year))
+        print(f"Year {year}: {plants} plants, {harvests} harvests")
+
+        legacy, vectorized = await legacy_charts(db, year), await vectorized_charts(db, year)
+        for chart in legacy:
+            if not same(legacy[chart], vectorized[chart]):
+                raise SystemExit(f"{chart}: the vectorized chart differs from the loop-based one")
+        print("Charts match the loop-based implementation\n")
+
+        # Loaded once for timing the in-memory part on its own
+        plant_rows = await legacy_plants(db, year)
+        weight_rows = await legacy_weights(db, year)
+        plant_columns = await analytics.load_plants(db, year)
+        harvest_weights = await analytics.load_harvest_weights(db, year)
+
+        # chart -> (loops end to end, vectorized end to end, loops in memory, vectorized in memory)
+        cases = {
+            "harvests": (
+                lambda: legacy_timeline_for_year(db, year),
+                lambda: stats._harvest_timeline_for_year(db, year),
+                lambda: legacy_timeline(weight_rows),
+                lambda: stats._harvest_timeline_chart(harvest_weights),
+            ),
+            "success-rate": (
+                lambda: legacy_success_rate_for_year(db, year),
+                lambda: stats._success_rate_for_year(db, year),
+                lambda: legacy_success_rate(plant_rows),
+                lambda: stats._success_rate_chart(plant_columns),
+            ),
+            "top-producers": (
+                lambda: legacy_top_producers_for_year(db, year),
+                lambda: stats._top_producers_for_year(db, year),
+                lambda: legacy_top_producers(plant_rows, weight_rows),
+                lambda: stats._top_producers_chart(plant_columns, harvest_weights),
+            ),
+        }
+
+        print(f"{'':15} {'end to end (ms)':^30}   {'in memory only (ms)':^30}")
+        print(f"{'chart':15} {'loops':>10} {'vectorized':>10} {'speedup':>8}   "
+              f"{'loops':>10} {'vectorized':>10} {'speedup':>8}")
+        for chart, builds in cases.items():
+            old_ms, new_ms, old_cpu, new_cpu = [await median_ms(db, build, repeat) for build in builds]
+            print(f"{chart:15} {old_ms:10.1f} {new_ms:10.1f} {old_ms / new_ms:7.1f}x   "
+                  f"{old_cpu:10.2f} {new_cpu:10.2f} {old_cpu / new_cpu:7.1f}x")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--reuse", action="store_true", help="benchmark the data already in the database")
+    parser.add_argument("--beds", type=int, default=1000, help="beds to seed; 1000 gives about 120k harvests a year")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set BENCH_DATABASE_URL; its tables are dropped")
+
+    if not args.reuse:
+        from sqlalchemy import create_engine
+        from scripts.seed_garden import seed_garden
+
+        engine = create_engine(args.database_url)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        print(f"Seeding {args.beds} beds...")
+        with Session(engine) as session:
+            seed_garden(session, beds=args.beds, years=2, plants_per_bed=10, harvests_per_plant=12)
+        engine.dispose()
+
+    asyncio.run(run(args.database_url, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
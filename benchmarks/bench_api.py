@@ -0,0 +1,225 @@
+"""Drive every /api/garden and /api/stats endpoint against growing gardens.
+
+For each dataset size the target database is reset and seeded with
+scripts/seed_garden.py, then each endpoint is requested repeatedly through
+the app in-process. The report gives p50/p95/p99 latency and SQL statements
+per request for every endpoint, plus the process's peak RSS after each size.
+The stats cache is cleared before every request, so stats timings measure
+the real computation; pass --warm-cache to measure cache hits instead.
+
+The benchmark DROPS AND RECREATES every table in the target database:
+
+    python benchmarks/bench_api.py --database-url postgresql://localhost/garden_bench
+    python benchmarks/bench_api.py --sizes small medium --json results.json
+    python benchmarks/bench_api.py --only "GET /garden/beds" "GET /garden/plants?limit"
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+SIZES = {
+    "small": {"beds": 10, "years": 2, "plants_per_bed": 8, "harvests_per_plant": 4},
+    "medium": {"beds": 60, "years": 4, "plants_per_bed": 10, "harvests_per_plant": 6},
+    "large": {"beds": 200, "years": 6, "plants_per_bed": 12, "harvests_per_plant": 8},
+    "xlarge": {"beds": 500, "years": 8, "plants_per_bed": 10, "harvests_per_plant": 12},
+}
+
+
+def percentile(timings: list[float], pct: int) -> float:
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[pct - 1]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def read_requests(year: int, bed_id: int, plant_id: int) -> list[tuple[str, str]]:
+    """(name, path) for every read endpoint, using ids that exist in the seeded data."""
+    return [
+        ("GET /garden/beds", "/api/garden/beds"),
+        ("GET /garden/beds/{id}", f"/api/garden/beds/{bed_id}"),
+        ("GET /garden/plants", "/api/garden/plants"),
+        ("GET /garden/plants?limit=500", "/api/garden/plants?limit=500"),
+        ("GET /garden/plants?year&bed_id", f"/api/garden/plants?year={year}&bed_id={bed_id}"),
+        ("GET /garden/plants/{id}", f"/api/garden/plants/{plant_id}"),
+        ("GET /garden/plants/{id}/harvests", f"/api/garden/plants/{plant_id}/harvests"),
+        ("GET /stats", "/api/stats"),
+        ("GET /stats/beds/{id}", f"/api/stats/beds/{bed_id}?year={year}"),
+        ("GET /stats/years", "/api/stats/years"),
+        ("GET /stats/metrics", f"/api/stats/metrics?year={year}"),
+        ("GET /stats/charts/plants-by-year", "/api/stats/charts/plants-by-year"),
+        ("GET /stats/charts/plants-by-season", "/api/stats/charts/plants-by-season"),
+        ("GET /stats/charts/status", f"/api/stats/charts/status?year={year}"),
+        ("GET /stats/charts/harvests", f"/api/stats/charts/harvests?year={year}"),
+        ("GET /stats/charts/success-rate", f"/api/stats/charts/success-rate?year={year}"),
+        ("GET /stats/charts/top-producers", f"/api/stats/charts/top-producers?year={year}"),
+        ("GET /stats/dashboard", f"/api/stats/dashboard?year={year}"),
+    ]
+
+
+def write_cycle(client, year: int, bed_id: int):
+    """Create, update and delete a bed, a plant and a harvest, yielding (name, response)."""
+    bed_data = {"name": "Bench Bed", "dimensions": "4x8", "notes": ""}
+    bed = client.post("/api/garden/beds", json=bed_data)
+    yield "POST /garden/beds", bed
+    new_bed_id = bed.json()["id"]
+    yield "PATCH /garden/beds/{id}", client.patch(
+        f"/api/garden/beds/{new_bed_id}", json={**bed_data, "notes": "updated"}
+    )
+
+    plant_data = {
+        "name": "Bench Tomato",
+        "planting_date": f"{year}-04-01",
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED",
+        "year": year
+    }
+    plant = client.post("/api/garden/plants", json=plant_data)
+    yield "POST /garden/plants", plant
+    plant_id = plant.json()["id"]
+    yield "PATCH /garden/plants/{id}", client.patch(
+        f"/api/garden/plants/{plant_id}", json={**plant_data, "notes": "updated"}
+    )
+    for status in ("SPROUTED", "FLOWERING"):  # Harvests need a flowering plant
+        yield "PATCH /garden/plants/{id}/status", client.patch(
+            f"/api/garden/plants/{plant_id}/status", json={"new_status": status}
+        )
+    harvest = client.post(f"/api/garden/plants/{plant_id}/harvests", json={
+        "plant_id": plant_id,
+        "harvest_date": f"{year}-07-01",
+        "quantity": 2,
+        "unit": "lbs"
+    })
+    yield "POST /garden/plants/{id}/harvests", harvest
+    yield "DELETE /garden/plants/{id}/harvests/{id}", client.delete(
+        f"/api/garden/plants/{plant_id}/harvests/{harvest.json()['id']}"
+    )
+    yield "DELETE /garden/plants/{id}", client.delete(f"/api/garden/plants/{plant_id}")
+    yield "DELETE /garden/beds/{id}", client.delete(f"/api/garden/beds/{new_bed_id}")
+
+
+def run_size(client, engine, size: str, requests: int, warm_cache: bool, only: list[str] | None = None) -> dict:
+    from sqlalchemy import event, func, select
+    from sqlalchemy.orm import Session
+    from scripts.seed_garden import seed_garden
+    from src.cache import stats_cache
+    from src.database import Base
+    from src.models import DBHarvest, DBPlant
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with Session(engine) as session:
+        counts = seed_garden(session, **SIZES[size])
+        year = datetime.now().year
+        plant_id, bed_id = session.execute(
+            select(DBPlant.id, DBPlant.bed_id).join(DBHarvest)
+            .where(DBPlant.year == year - 1)
+            .group_by(DBPlant.id).order_by(func.count(DBHarvest.id).desc()).limit(1)
+        ).one()
+    print(f"\n[{size}] {counts['beds']} beds, {counts['plants']} plants, {counts['harvests']} harvests "
+          f"(seeded in {time.perf_counter() - started:.1f}s)")
+    stats_cache.clear()
+
+    from src.database import async_engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    samples: dict[str, list[tuple[float, int]]] = {}
+    try:
+        for name, path in read_requests(year - 1, bed_id, plant_id):
+            if only and not any(part in name for part in only):
+                continue
+            client.get(path)  # Warm up connections and imports
+            for _ in range(requests):
+                if not warm_cache:
+                    stats_cache.clear()
+                statements.clear()
+                begun = time.perf_counter()
+                response = client.get(path)
+                elapsed = (time.perf_counter() - begun) * 1000
+                response.raise_for_status()
+                samples.setdefault(name, []).append((elapsed, len(statements)))
+
+        for _ in range(0 if only else requests):
+            cycle = write_cycle(client, year, bed_id)
+            while True:
+                statements.clear()
+                begun = time.perf_counter()
+                try:
+                    name, response = next(cycle)  # Issues the next request in the cycle
+                except StopIteration:
+                    break
+                elapsed = (time.perf_counter() - begun) * 1000
+                response.raise_for_status()
+                samples.setdefault(name, []).append((elapsed, len(statements)))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    results = {}
+    for name, values in samples.items():
+        timings = [elapsed for elapsed, _ in values]
+        results[name] = {
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "queries": round(statistics.mean(queries for _, queries in values), 1),
+        }
+    return {"dataset": counts, "endpoints": results, "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+
+def print_report(size: str, report: dict) -> None:
+    print(f"{'endpoint':42} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:42} {row['p50_ms']:8.2f} {row['p95_ms']:8.2f} {row['p99_ms']:8.2f} {row['queries']:8.1f}")
+    print(f"peak RSS after {size}: {report['peak_rss_mb']:.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["small", "medium", "large"])
+    parser.add_argument("--requests", type=int, default=20, help="requests per endpoint")
+    parser.add_argument("--warm-cache", action="store_true", help="keep the stats cache between requests")
+    parser.add_argument("--only", nargs="+", metavar="TEXT", help="only read endpoints whose name contains TEXT")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set BENCH_DATABASE_URL; its tables are dropped")
+
+    # The app reads its database settings at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.chdir(ROOT)  # Static files and templates are resolved relative to the repo
+    from fastapi.testclient import TestClient
+    from main import app
+    from src.database import engine
+
+    reports = {}
+    with TestClient(app) as client:
+        for size in args.sizes:
+            reports[size] = run_size(client, engine, size, args.requests, args.warm_cache, args.only)
+            print_report(size, reports[size])
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
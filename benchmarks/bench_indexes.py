@@ -0,0 +1,176 @@
+"""Compare query plans and latency for the hot queries with and without indexes.
+
+Seeds a large garden with plain INSERT ... SELECT generate_series statements,
+then runs each query the stats and garden routes issue, first without the
+indexes added in migration 006 and then with them, printing median latency
+and the top of each EXPLAIN ANALYZE plan.
+
+The benchmark DROPS AND RECREATES every table in the target database, so it
+only runs against an explicit --database-url (or BENCH_DATABASE_URL):
+
+    python benchmarks/bench_indexes.py --database-url postgresql://localhost/garden_bench
+"""
+from pathlib import Path
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.dialects import postgresql
+from src.database import Base
+from src.models import DBHarvest, DBPlant, DBPlantImage
+
+# Indexes from migration 006, as declared on the models
+BENCHMARKED_INDEXES = (
+    "ix_plants_year_bed_id",
+    "ix_plants_year_status",
+    "ix_plants_bed_id",
+    "ix_harvests_plant_id_harvest_date",
+    "ix_plant_images_plant_id",
+)
+
+
+def seed(conn, beds: int, plants: int, harvests: int, years: int) -> None:
+    """Fill the tables with a synthetic multi-year garden."""
+    first_year = 2025 - years
+    conn.execute(text(
+        "INSERT INTO garden_beds (name, dimensions, notes) "
+        "SELECT 'Bed ' || n, '4x8', NULL FROM generate_series(1, :beds) AS n"
+    ), {"beds": beds})
+    conn.execute(text(
+        "INSERT INTO plants (name, variety, planting_date, bed_id, status, year, quantity, space_required) "
+        "SELECT (ARRAY['Tomato','Pepper','Basil','Kale','Lettuce','Squash','Bean','Carrot'])[1 + n % 8], "
+        "       'Variety ' || (n % 40), "
+        "       make_date(:first_year + n % :years, 3 + n % 4, 1 + n % 28), "
+        "       1 + (n::bigint * 7919) % :beds, "
+        "       (ARRAY['PLANTED','SPROUTED','FLOWERING','HARVESTING','FINISHED'])[1 + (n / 3) % 5], "
+        "       :first_year + n % :years, 1 + n % 6, 4 "
+        "FROM generate_series(1, :plants) AS n"
+    ), {"first_year": first_year, "years": years, "beds": beds, "plants": plants})
+    conn.execute(text(
+        "INSERT INTO harvests (plant_id, harvest_date, quantity, unit) "
+        "SELECT p.id, p.planting_date + ((60 + n % 90) || ' days')::interval, 1 + n % 5, "
+        "       (ARRAY['pieces','lbs','oz','kg'])[1 + n % 4] "
+        "FROM generate_series(1::bigint, :harvests) AS n "
+        "JOIN plants p ON p.id = 1 + (n * 104729) % :plants"
+    ), {"harvests": harvests, "plants": plants})
+    conn.execute(text(
+        "INSERT INTO plant_images (url, taken_date, plant_id) "
+        "SELECT 'http://localhost/api/images/files/' || n, now(), 1 + n % :plants "
+        "FROM generate_series(1, :images) AS n"
+    ), {"images": plants // 4, "plants": plants})
+
+
+def hot_queries(year: int, bed_id: int, plant_ids: list[int]) -> dict:
+    """The statements the routes issue, keyed by a short description."""
+    return {
+        "plants for year (metrics)": select(DBPlant).where(DBPlant.year == year),
+        "plants for year and bed (list filter)": (
+            select(DBPlant).where(DBPlant.year == year, DBPlant.bed_id == bed_id).order_by(DBPlant.id)
+        ),
+        "plants for bed (bed detail loader)": select(DBPlant).where(DBPlant.bed_id.in_([bed_id])),
+        "status rollup for year (plant_rollup)": (
+            select(DBPlant.year, DBPlant.status, func.coalesce(func.sum(DBPlant.quantity), 0))
+            .where(DBPlant.year == year)
+            .group_by(DBPlant.year, DBPlant.status)
+        ),
+        "harvest count for year (metrics)": (
+            select(func.count(DBHarvest.id)).join(DBPlant)
+            .where(DBPlant.year == year).where(DBHarvest.harvest_date.isnot(None))
+        ),
+        # Matches about a tenth of all harvests, so Postgres hash-joins a
+        # sequential scan whatever indexes exist; a month index would go unused
+        "monthly harvest weights for year (charts)": (
+            select(
+                func.date_trunc("month", DBHarvest.harvest_date).label("month"),
+                DBPlant.name,
+                func.coalesce(func.sum(DBHarvest.weight_lbs), 0)
+            )
+            .join(DBPlant)
+            .where(DBPlant.year == year, DBHarvest.harvest_date.isnot(None))
+            .group_by("month", DBPlant.name)
+        ),
+        "harvests for a plant page (selectinload)": (
+            select(DBHarvest).where(DBHarvest.plant_id.in_(plant_ids)).order_by(DBHarvest.plant_id)
+        ),
+        "images for a plant page (selectinload)": (
+            select(DBPlantImage).where(DBPlantImage.plant_id.in_(plant_ids)).order_by(DBPlantImage.id)
+        ),
+    }
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def measure(conn, sql: str, repeat: int) -> tuple[float, list[str]]:
+    """Return the median latency in ms and the first lines of the executed plan."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql)).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    plan = [row[0] for row in conn.execute(text(f"EXPLAIN (ANALYZE, COSTS OFF) {sql}"))]
+    return statistics.median(timings), plan[:4]
+
+
+def run(conn, queries: dict, repeat: int) -> dict:
+    # VACUUM also sets the visibility map, which index-only scans rely on
+    conn.execute(text("VACUUM ANALYZE"))
+    return {name: measure(conn, compile_sql(query), repeat) for name, query in queries.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--beds", type=int, default=500)
+    parser.add_argument("--plants", type=int, default=100_000)
+    parser.add_argument("--harvests", type=int, default=500_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set BENCH_DATABASE_URL; its tables are dropped")
+
+    engine = create_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    indexes = [
+        index for table in Base.metadata.sorted_tables for index in table.indexes
+        if index.name in BENCHMARKED_INDEXES
+    ]
+
+    with engine.begin() as conn:
+        print(f"Seeding {args.beds} beds, {args.plants} plants, {args.harvests} harvests...")
+        seed(conn, args.beds, args.plants, args.harvests, args.years)
+        year = conn.scalar(text("SELECT max(year) FROM plants"))
+        bed_id = conn.scalar(text("SELECT bed_id FROM plants WHERE year = :year LIMIT 1"), {"year": year})
+        plant_ids = list(conn.scalars(text(
+            "SELECT id FROM plants WHERE year = :year ORDER BY id LIMIT 100"
+        ), {"year": year}))
+        queries = hot_queries(year, bed_id, plant_ids)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for index in indexes:
+            index.drop(bind=conn)
+        before = run(conn, queries, args.repeat)
+        for index in indexes:
+            index.create(bind=conn)
+        after = run(conn, queries, args.repeat)
+
+    print(f"\n{'query':45} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in queries:
+        before_ms, after_ms = before[name][0], after[name][0]
+        print(f"{name:45} {before_ms:10.2f} {after_ms:10.2f} {before_ms / after_ms:7.1f}x")
+    for name in queries:
+        print(f"\n== {name}")
+        print("  before: " + "\n          ".join(before[name][1]))
+        print("  after:  " + "\n          ".join(after[name][1]))
+
+
+if __name__ == "__main__":
+    main()
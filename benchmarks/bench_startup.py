@@ -0,0 +1,142 @@
+"""Measure how long the app takes to import and start, and its baseline memory.
+
+Each run starts a fresh Python process, which imports ``main``, runs the
+app's startup through the TestClient and serves ``GET /health`` once. The
+report gives the median, min and max over the runs of:
+
+- import time and RSS after importing ``main``
+- startup time (the lifespan, which creates missing tables)
+- time to the first ``/health`` response and RSS after it
+
+It also lists which heavy optional libraries the import loaded; none of them
+should appear, since they are only imported where they are used.
+
+The database only needs to be reachable; startup creates missing tables but
+nothing is dropped or written:
+
+    python benchmarks/bench_startup.py --database-url postgresql://localhost/garden_bench
+    python benchmarks/bench_startup.py --runs 10 --json startup.json
+"""
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Libraries worth keeping out of the web process until a request needs them
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "pyzbar", "boto3")
+
+
+def rss_mb() -> float:
+    """Current resident set size; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_once() -> dict:
+    """Runs in the child process started by main()."""
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)  # Static files and templates are resolved relative to the repo
+
+    started = time.perf_counter()
+    from main import app
+    imported = time.perf_counter()
+    import_rss = rss_mb()
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    from fastapi.testclient import TestClient
+    client_ready = time.perf_counter()
+    with TestClient(app) as client:
+        started_up = time.perf_counter()
+        client.get("/health").raise_for_status()
+        first_response = time.perf_counter()
+        first_response_rss = rss_mb()
+
+    return {
+        "import_ms": (imported - started) * 1000,
+        "import_rss_mb": import_rss,
+        "startup_ms": (started_up - client_ready) * 1000,
+        # Import plus startup plus the request, leaving out importing the TestClient
+        "first_response_ms": ((imported - started) + (first_response - client_ready)) * 1000,
+        "first_response_rss_mb": first_response_rss,
+        "heavy_modules": heavy,
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = {}
+    for key in runs[0]:
+        if key == "heavy_modules":
+            summary[key] = sorted({name for run in runs for name in run[key]})
+            continue
+        values = [run[key] for run in runs]
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def print_report(summary: dict, runs: int) -> None:
+    print(f"{runs} runs")
+    print(f"{'':<24}{'median':>10}{'min':>10}{'max':>10}")
+    labels = {
+        "import_ms": "import main (ms)",
+        "import_rss_mb": "RSS after import (MB)",
+        "startup_ms": "startup (ms)",
+        "first_response_ms": "first response (ms)",
+        "first_response_rss_mb": "RSS after /health (MB)",
+    }
+    for key, label in labels.items():
+        values = summary[key]
+        print(f"{label:<24}{values['median']:>10.1f}{values['min']:>10.1f}{values['max']:>10.1f}")
+    print(f"heavy modules imported: {', '.join(summary['heavy_modules']) or 'none'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to measure")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return
+    if not args.database_url:
+        parser.error("pass --database-url or set BENCH_DATABASE_URL")
+
+    # The app reads its database settings at import time
+    env = {**os.environ, "DATABASE_URL": args.database_url}
+    env.pop("ASYNC_DATABASE_URL", None)
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"],
+            env=env, check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+
+    summary = summarize(runs)
+    print_report(summary, len(runs))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"summary": summary, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
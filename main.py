@@ -1,29 +1,67 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-from src.routes import garden, images, stats, frontend
-from src.database import engine
+from fastapi.responses import RedirectResponse, Response
+from src.routes import export, garden, images, imports, stats, frontend
+from src.database import async_engine, engine
+from src.barcode import barcode_cache, barcode_pool
+from src.cache import stats_cache
+from src.variants import variant_worker
 from src.models import Base
+from src.instrumentation import QueryStatsMiddleware
+from src.metrics import CONTENT_TYPE, MetricsMiddleware, pool_metrics, render_metrics
+from src.replica import ReadYourWritesMiddleware, dispose_replica, replica_health, replica_router
+from src.responses import APIJSONResponse
 
-# Initialize database tables
-Base.metadata.create_all(bind=engine)
+# Connection pool checkouts and usage for GET /metrics
+pool_metrics.watch("async", async_engine.sync_engine.pool)
+pool_metrics.watch("sync", engine.pool)
+if replica_router.enabled:
+    pool_metrics.watch("replica", replica_router.engine.sync_engine.pool)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create any missing tables at startup rather than on import, so importing
+    # the app (tests, scripts, workers) needs no database round trip
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    # Stop barcode decode and image variant workers
+    barcode_pool.shutdown()
+    variant_worker.shutdown()
+    # Close pooled connections while their event loop is still running
+    await async_engine.dispose()
+    await dispose_replica()
 
 app = FastAPI(
     title="Garden Manager",
     description="A web application for managing garden beds and plants",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Server-Timing header and slow-request log for every request, including /api
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request counts and latency for GET /metrics. It wraps the /api
+# mount as well, so api_app needs no middleware of its own.
+app.add_middleware(MetricsMiddleware)
+
+# Clients that just wrote read from the primary, not the replica
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Create an API router for all API routes
-api_app = FastAPI(title="Garden Manager API")
+api_app = FastAPI(title="Garden Manager API", default_response_class=APIJSONResponse)
 
 # Include all API routes
 api_app.include_router(garden.router)
 api_app.include_router(images.router)
 api_app.include_router(stats.router)
+api_app.include_router(export.router)
+api_app.include_router(imports.router)
 
 # Root route for API
 @api_app.get("/")
@@ -45,6 +83,18 @@ app.include_router(frontend.router)
 async def redirect_to_ui():
     return RedirectResponse(url="/ui")
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Request, connection pool and cache metrics in the Prometheus text format."""
+    return Response(
+        render_metrics({"stats": stats_cache, "barcode": barcode_cache}),
+        media_type=CONTENT_TYPE
+    )
+
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    health = {"status": "healthy", "database_pools": pool_metrics.stats()}
+    replica = replica_health()
+    if replica is not None:
+        health["replica"] = replica
+    return health
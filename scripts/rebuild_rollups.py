@@ -0,0 +1,41 @@
+"""Recompute the year and (year, bed) rollup tables from plants and harvests.
+
+Run after changing rows outside the API, or whenever the dashboard totals
+look out of step with the data:
+
+    python scripts/rebuild_rollups.py
+
+Uses DATABASE_URL unless --database-url is given. Garden writes wait while
+the rebuild runs.
+"""
+from pathlib import Path
+import argparse
+import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from src.models import DBBedYearRollup, DBYearRollup
+from src.rollups import rebuild_statements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set DATABASE_URL")
+
+    with Session(create_engine(args.database_url)) as session:
+        for statement in rebuild_statements():
+            session.execute(statement)
+        session.commit()
+        years = session.scalar(select(func.count()).select_from(DBYearRollup))
+        beds = session.scalar(select(func.count()).select_from(DBBedYearRollup))
+    print(f"Rebuilt rollups for {years} years and {beds} bed-years")
+
+
+if __name__ == "__main__":
+    main()
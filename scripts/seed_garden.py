@@ -0,0 +1,181 @@
+"""Fill a database with a realistic multi-year garden.
+
+Beds, plants and harvests are built through the app's own models, so the
+seeded data looks exactly like data entered through the API: past seasons
+are finished and fully harvested, the current season is still in progress.
+The same seed always produces the same garden.
+
+    python scripts/seed_garden.py --beds 100 --years 5 --reset
+
+Uses DATABASE_URL unless --database-url is given. --reset drops and
+recreates every table first.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from src.database import Base
+from src.models import DBGardenBed, DBHarvest, DBPlant, PlantStatus
+from src.rollups import rebuild_statements
+from src.units import to_pounds
+
+
+class CatalogueEntry(NamedTuple):
+    name: str
+    varieties: tuple[str, ...]
+    days_to_harvest: int
+    unit: str
+    harvest_range: tuple[float, float]  # Quantity per picking
+    space_required: int
+
+
+PLANT_CATALOGUE = (
+    CatalogueEntry("Tomato", ("Sungold", "Cherokee Purple", "Roma", "Brandywine"), 75, "lbs", (0.5, 4.0), 4),
+    CatalogueEntry("Pepper", ("California Wonder", "Jalapeno", "Shishito"), 80, "pieces", (2, 12), 2),
+    CatalogueEntry("Zucchini", ("Black Beauty", "Costata Romanesco"), 55, "pieces", (1, 5), 9),
+    CatalogueEntry("Bean", ("Provider", "Kentucky Wonder", "Dragon Tongue"), 60, "oz", (4, 24), 1),
+    CatalogueEntry("Lettuce", ("Buttercrunch", "Little Gem", "Red Sails"), 45, "heads", (1, 4), 1),
+    CatalogueEntry("Kale", ("Lacinato", "Red Russian"), 55, "bunches", (1, 3), 2),
+    CatalogueEntry("Carrot", ("Danvers", "Nantes", "Cosmic Purple"), 70, "lbs", (0.25, 2.0), 1),
+    CatalogueEntry("Cucumber", ("Marketmore", "Lemon"), 60, "pieces", (1, 8), 4),
+    CatalogueEntry("Basil", ("Genovese", "Thai"), 50, "oz", (1, 6), 1),
+    CatalogueEntry("Strawberry", ("Seascape", "Albion"), 90, "kg", (0.1, 0.8), 1),
+)
+
+# Share of current-season plants in each status
+CURRENT_SEASON_STATUSES = (
+    (PlantStatus.PLANTED, 0.2),
+    (PlantStatus.SPROUTED, 0.2),
+    (PlantStatus.FLOWERING, 0.2),
+    (PlantStatus.HARVESTING, 0.3),
+    (PlantStatus.FINISHED, 0.1),
+)
+
+
+def _status(rng: random.Random, year: int, current_year: int) -> PlantStatus:
+    if year < current_year:
+        return PlantStatus.FINISHED if rng.random() < 0.9 else PlantStatus.HARVESTING
+    statuses, weights = zip(*CURRENT_SEASON_STATUSES)
+    return rng.choices(statuses, weights)[0]
+
+
+def _harvests(
+    rng: random.Random,
+    entry: CatalogueEntry,
+    planting_date: datetime,
+    pickings: int
+) -> list[DBHarvest]:
+    first = planting_date + timedelta(days=entry.days_to_harvest + rng.randint(-5, 10))
+    low, high = entry.harvest_range
+    harvests = []
+    for picking in range(pickings):
+        quantity = rng.uniform(low, high)
+        quantity = round(quantity, 2) if isinstance(low, float) else max(1, round(quantity))
+        harvests.append(DBHarvest(
+            harvest_date=first + timedelta(days=7 * picking + rng.randint(0, 3)),
+            quantity=quantity,
+            unit=entry.unit,
+            weight_lbs=to_pounds(quantity, entry.unit)
+        ))
+    return harvests
+
+
+def seed_garden(
+    session: Session,
+    beds: int = 20,
+    years: int = 3,
+    plants_per_bed: int = 8,
+    harvests_per_plant: int = 6,
+    current_year: int | None = None,
+    seed: int = 0
+) -> dict[str, int]:
+    """Add ``beds`` beds with ``years`` seasons of plants and harvests to ``session``.
+
+    Each bed gets about ``plants_per_bed`` plants per season. Harvesting and
+    finished plants get about ``harvests_per_plant`` weekly pickings.
+    Commits once per bed, then rebuilds the rollup tables, and returns the
+    number of rows added per table.
+    """
+    rng = random.Random(seed)
+    current_year = current_year or datetime.now().year
+    existing_beds = session.scalar(select(func.count(DBGardenBed.id))) or 0
+    counts = {"beds": 0, "plants": 0, "harvests": 0}
+
+    for bed_number in range(existing_beds + 1, existing_beds + beds + 1):
+        bed = DBGardenBed(
+            name=f"Bed {bed_number}",
+            dimensions=rng.choice(("4x8", "4x4", "3x6", "3x10", "2x12")),
+            notes=None
+        )
+        for year in range(current_year - years + 1, current_year + 1):
+            for _ in range(max(1, plants_per_bed + rng.randint(-2, 2))):
+                entry = rng.choice(PLANT_CATALOGUE)
+                planting_date = datetime(year, rng.randint(3, 6), rng.randint(1, 28))
+                status = _status(rng, year, current_year)
+                plant = DBPlant(
+                    name=entry.name,
+                    variety=rng.choice(entry.varieties),
+                    planting_date=planting_date,
+                    status=status.value,
+                    year=year,
+                    quantity=rng.randint(1, 6),
+                    space_required=entry.space_required,
+                    expected_harvest_date=planting_date + timedelta(days=entry.days_to_harvest),
+                    notes=None
+                )
+                if status in (PlantStatus.HARVESTING, PlantStatus.FINISHED):
+                    pickings = rng.randint(1, max(1, 2 * harvests_per_plant - 1))
+                    plant.harvests = _harvests(rng, entry, planting_date, pickings)
+                    counts["harvests"] += pickings
+                bed.plants.append(plant)
+                counts["plants"] += 1
+        session.add(bed)
+        session.commit()
+        counts["beds"] += 1
+
+    # Rows added here bypass the routes that keep the rollups current
+    for statement in rebuild_statements():
+        session.execute(statement)
+    session.commit()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--beds", type=int, default=20)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--plants-per-bed", type=int, default=8)
+    parser.add_argument("--harvests-per-plant", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set DATABASE_URL")
+
+    engine = create_engine(args.database_url)
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        counts = seed_garden(
+            session,
+            beds=args.beds,
+            years=args.years,
+            plants_per_bed=args.plants_per_bed,
+            harvests_per_plant=args.harvests_per_plant,
+            seed=args.seed
+        )
+    print(f"Added {counts['beds']} beds, {counts['plants']} plants and {counts['harvests']} harvests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""SQL-side aggregations shared by the stats routes.
+
+These helpers push the GROUP BY/SUM work into the database so the routes only
+ever see rolled-up rows instead of building an ORM object per plant.
+"""
+from typing import Iterable, NamedTuple, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import PlantStatus, DBPlant
+
+
+class PlantRollupRow(NamedTuple):
+    year: Optional[int]
+    status: str
+    quantity: int
+
+
+async def plant_rollup(
+    db: AsyncSession,
+    year: int | None = None,
+    bed_id: int | None = None
+) -> list[PlantRollupRow]:
+    """Sum plant quantities per (year, status), optionally narrowed to a year or bed."""
+    query = select(
+        DBPlant.year,
+        DBPlant.status,
+        func.coalesce(func.sum(DBPlant.quantity), 0)
+    )
+    if year is not None:
+        query = query.where(DBPlant.year == year)
+    if bed_id is not None:
+        query = query.where(DBPlant.bed_id == bed_id)
+
+    result = await db.execute(query.group_by(DBPlant.year, DBPlant.status).order_by(DBPlant.year))
+    rows = result.all()
+    return [PlantRollupRow(row[0], row[1], int(row[2])) for row in rows]
+
+
+def total_quantity(rows: Iterable[PlantRollupRow]) -> int:
+    return sum(row.quantity for row in rows)
+
+
+def quantity_by_status(rows: Iterable[PlantRollupRow]) -> dict[str, int]:
+    """Collapse rollup rows into per-status totals, with every status present.
+
+    Any rows exposing ``status`` and ``quantity`` work, including loaded DBPlant objects.
+    """
+    status_counts = {status.value: 0 for status in PlantStatus}
+    for row in rows:
+        if row.status in status_counts:
+            status_counts[row.status] += row.quantity
+    return status_counts
+
+
+def quantity_by_year(
+    rows: Iterable[PlantRollupRow],
+    include_unknown: bool = True
+) -> dict[str, int]:
+    """Collapse rollup rows into per-year totals keyed by the year as a string."""
+    year_counts: dict[str, int] = {}
+    for row in rows:
+        if row.year is None and not include_unknown:
+            continue
+        key = str(row.year)
+        year_counts[key] = year_counts.get(key, 0) + row.quantity
+    return year_counts
@@ -0,0 +1,179 @@
+"""Barcode decoding off the event loop.
+
+Decoding a phone photo with Pillow and zbar is CPU bound, so scans run in a
+small process pool. The pool only accepts a bounded number of outstanding
+jobs; once that is reached callers get DecoderBusy straight away instead of
+queueing behind a burst of uploads. Results are cached by a hash of the
+uploaded bytes, so re-scanning the same photo never reaches the pool.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+from PIL import Image
+from .cache import TTLCache
+
+BARCODE_WORKERS = int(os.getenv("BARCODE_WORKERS", "2"))
+BARCODE_QUEUE_LIMIT = int(os.getenv("BARCODE_QUEUE_LIMIT", "8"))
+BARCODE_TIMEOUT = float(os.getenv("BARCODE_TIMEOUT", "10"))
+BARCODE_RETRY_AFTER = int(os.getenv("BARCODE_RETRY_AFTER", "2"))  # seconds, sent when busy
+BARCODE_CACHE_SIZE = int(os.getenv("BARCODE_CACHE_SIZE", "256"))
+BARCODE_CACHE_TTL = float(os.getenv("BARCODE_CACHE_TTL", "3600"))  # seconds
+
+
+class DecoderBusy(Exception):
+    """Raised when the decode pool already holds its maximum number of jobs."""
+
+
+class DecodeTimeout(Exception):
+    """Raised when a decode job does not finish within the configured timeout."""
+
+
+# Longest image side for each downscaled pass, tried before full resolution.
+DECODE_SCALES = (1024, 2048)
+
+
+def _load_grayscale(contents: bytes, max_side: int | None) -> Image.Image:
+    """Open ``contents`` as a grayscale image no larger than ``max_side``."""
+    image = Image.open(io.BytesIO(contents))
+    if max_side is not None:
+        # JPEG decodes straight to grayscale at 1/2, 1/4 or 1/8 scale in draft
+        # mode; allow the draft to land anywhere between half and full target size
+        image.draft("L", (max_side // 2, max_side // 2))
+    image = image.convert("L")
+    if max_side is not None:
+        image.thumbnail((max_side, max_side))
+    return image
+
+
+def _candidate_regions(width: int, height: int) -> list[tuple[int, int, int, int]]:
+    """Crop boxes to scan when the whole frame misses: the center, then overlapping quadrants."""
+    regions = [(width // 4, height // 4, width * 3 // 4, height * 3 // 4)]
+    region_w, region_h = width * 3 // 5, height * 3 // 5
+    for left in (0, width - region_w):
+        for top in (0, height - region_h):
+            regions.append((left, top, left + region_w, top + region_h))
+    return regions
+
+
+def decode(image: Image.Image) -> list:
+    """zbar's decoder, imported on first use so only pool workers load libzbar."""
+    from pyzbar.pyzbar import decode as zbar_decode
+    return zbar_decode(image)
+
+
+def _decoded(barcodes) -> list[tuple[str, str]]:
+    return [(barcode.data.decode(), barcode.type) for barcode in barcodes]
+
+
+def decode_barcodes(contents: bytes) -> list[tuple[str, str]]:
+    """Decode every barcode in an image, returning (data, type) pairs.
+
+    Most seed packet photos decode from a small grayscale copy, so the image
+    is scanned at increasing sizes and only decoded at full resolution, and
+    then region by region, when the smaller passes find nothing.
+
+    Runs inside a pool worker, so it only takes and returns picklable values.
+    """
+    with Image.open(io.BytesIO(contents)) as header:
+        longest_side = max(header.size)
+
+    for max_side in DECODE_SCALES:
+        if max_side >= longest_side:
+            break  # No smaller than the full resolution pass
+        barcodes = decode(_load_grayscale(contents, max_side))
+        if barcodes:
+            return _decoded(barcodes)
+
+    image = _load_grayscale(contents, None)
+    barcodes = decode(image)
+    if barcodes:
+        return _decoded(barcodes)
+
+    for box in _candidate_regions(*image.size):
+        barcodes = decode(image.crop(box))
+        if barcodes:
+            return _decoded(barcodes)
+    return []
+
+
+class BarcodeDecoderPool:
+    def __init__(
+        self,
+        workers: int = BARCODE_WORKERS,
+        queue_limit: int = BARCODE_QUEUE_LIMIT,
+        timeout: float = BARCODE_TIMEOUT
+    ):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._lock = Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Jobs that may be running or waiting at once."""
+        return self.workers + self.queue_limit
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's event loop or threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def decode(self, contents: bytes) -> list[tuple[str, str]]:
+        """Decode ``contents`` in the pool.
+
+        Raises DecoderBusy when the pool is saturated and DecodeTimeout when
+        the job takes longer than ``timeout`` seconds. A timed-out job keeps
+        its slot until the worker actually finishes it, so slow images still
+        count against the queue limit.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise DecoderBusy()
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(decode_barcodes, contents)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise DecodeTimeout() from None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def content_key(contents: bytes) -> str:
+    """Cache key for an uploaded image: the SHA-256 of its bytes."""
+    return hashlib.sha256(contents).hexdigest()
+
+
+barcode_pool = BarcodeDecoderPool()
+barcode_cache = TTLCache(maxsize=BARCODE_CACHE_SIZE, ttl=BARCODE_CACHE_TTL)
@@ -0,0 +1,207 @@
+"""In-process caches for stats responses and barcode scans.
+
+Stats payloads are cached per endpoint and year and evicted least recently
+used first once the cache is full. Each entry records which plant years and
+which bed it was computed from, so the garden mutation routes can drop only
+the entries a write actually affects.
+
+The caches live in the worker process; with several workers each keeps its
+own copy and only sees invalidations for writes it served itself.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Hashable, Iterable, NamedTuple, Optional
+import os
+import time
+
+
+class _Entry(NamedTuple):
+    value: Any
+    years: Optional[frozenset]  # None means the value depends on every year
+    bed_id: Optional[int]  # None means the value depends on every bed
+
+
+class StatsCache:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        years: Iterable[int] | None = None,
+        bed_id: int | None = None
+    ) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        ``years`` and ``bed_id`` describe the data the value was built from and
+        drive invalidation; leave them as None when the value spans all of them.
+        """
+        found, value, generation = self._lookup(key)
+        if found:
+            return value
+        value = compute()
+        self._store(key, value, generation, years, bed_id)
+        return value
+
+    async def get_or_compute_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        years: Iterable[int] | None = None,
+        bed_id: int | None = None
+    ) -> Any:
+        """Async counterpart of get_or_compute for coroutine-producing computations."""
+        found, value, generation = self._lookup(key)
+        if found:
+            return value
+        value = await compute()
+        self._store(key, value, generation, years, bed_id)
+        return value
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any, int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry.value, self._generation
+            self.misses += 1
+            return False, None, self._generation
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: int,
+        years: Iterable[int] | None,
+        bed_id: int | None
+    ) -> None:
+        with self._lock:
+            # Skip storing results that may predate a concurrent invalidation
+            if generation != self._generation or self.maxsize <= 0:
+                return
+            self._entries[key] = _Entry(
+                value,
+                frozenset(years) if years is not None else None,
+                bed_id
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(
+        self,
+        years: Iterable[int | None] | None = None,
+        bed_ids: Iterable[int | None] | None = None
+    ) -> int:
+        """Drop entries built from any of ``years`` and any of ``bed_ids``.
+
+        None for either argument means the write may have touched every year
+        or every bed. Returns the number of entries removed.
+        """
+        year_set = set(years) if years is not None else None
+        bed_set = set(bed_ids) if bed_ids is not None else None
+
+        def affected(entry: _Entry) -> bool:
+            year_match = year_set is None or entry.years is None or bool(entry.years & year_set)
+            bed_match = bed_set is None or entry.bed_id is None or entry.bed_id in bed_set
+            return year_match and bed_match
+
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items() if affected(entry)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire ``ttl`` seconds after being stored."""
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]  # Expired
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+stats_cache = StatsCache(maxsize=int(os.getenv("STATS_CACHE_SIZE", "256")))
@@ -0,0 +1,80 @@
+"""Per-request SQL timing: a Server-Timing header and a slow-request log.
+
+``QueryStatsMiddleware`` gives each HTTP request a fresh ``QueryStats``
+that the engine events in ``src/database.py`` fill in. When the response
+starts, the statement count, total database time and slowest statement
+so far are added as a ``Server-Timing`` header, which browser dev tools
+show next to each request. When the response is finished, requests slower than
+``SLOW_REQUEST_MS``, or with a statement slower than ``SLOW_QUERY_MS``,
+are logged as one JSON object, so N+1 patterns and slow stats queries
+can be found in production logs.
+"""
+import json
+import logging
+import os
+import time
+from starlette.datastructures import MutableHeaders
+from .database import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# Logged statements are cut to this many characters
+MAX_LOGGED_STATEMENT = 1000
+
+
+def server_timing(stats: QueryStats, elapsed_ms: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"',
+        f'db-slowest;dur={stats.slowest_ms:.1f}',
+        f'app;dur={elapsed_ms:.1f}',
+    ])
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Mounted apps rewrite the scope in place, so note the request first
+        method, path = scope["method"], scope.get("root_path", "") + scope["path"]
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats, elapsed_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= SLOW_REQUEST_MS or stats.slowest_ms >= SLOW_QUERY_MS:
+                log_slow_request(method, path, status_code, elapsed_ms, stats)
+
+
+def log_slow_request(method: str, path: str, status_code: int | None, elapsed_ms: float, stats: QueryStats) -> None:
+    logger.warning(json.dumps({
+        "event": "slow_request",
+        "method": method,
+        "path": path,
+        "status": status_code,
+        "duration_ms": round(elapsed_ms, 1),
+        "db_statements": stats.count,
+        "db_ms": round(stats.total_ms, 1),
+        "slowest_statement_ms": round(stats.slowest_ms, 1),
+        "slowest_statement": (stats.slowest_statement or "")[:MAX_LOGGED_STATEMENT],
+    }))
@@ -0,0 +1,49 @@
+"""Eager-loading profiles for the routes that walk ORM relationships.
+
+Each profile names the relationship paths an endpoint touches. Collections
+are loaded with ``selectinload`` (one extra SELECT per path, however many
+parents) and scalar relationships with ``joinedload`` so that serializing a
+response never falls back to per-row lazy loads.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+from .models import DBGardenBed, DBHarvest, DBPlant
+
+# Relationship paths to eager load, per endpoint. Nested paths are dotted.
+LOADER_PROFILES: dict[str, tuple[type, tuple[str, ...]]] = {
+    "bed_list": (DBGardenBed, ("plants",)),
+    "bed_detail": (DBGardenBed, ("plants",)),
+    "bed_stats": (DBGardenBed, ("plants",)),
+    "plant_list": (DBPlant, ("images",)),
+    "plant_detail": (DBPlant, ("images",)),
+    "plant_harvests": (DBPlant, ("harvests",)),
+    "harvest_plant": (DBHarvest, ("plant",)),
+}
+
+
+def _loader_for_path(entity: type, path: str):
+    """Build a loader option chain for a dotted relationship path."""
+    option = None
+    current = entity
+    for name in path.split("."):
+        attribute = getattr(current, name)
+        prop = attribute.property
+        if option is None:
+            option = selectinload(attribute) if prop.uselist else joinedload(attribute)
+        else:
+            option = option.selectinload(attribute) if prop.uselist else option.joinedload(attribute)
+        current = prop.mapper.class_
+    return option
+
+
+def loader_options(profile: str) -> list:
+    """Return the loader options configured for ``profile``."""
+    try:
+        entity, paths = LOADER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {profile}") from None
+    return [_loader_for_path(entity, path) for path in paths]
+
+
+def apply_profile(query, profile: str):
+    """Attach the eager-loading options for ``profile`` to a Query or select()."""
+    return query.options(*loader_options(profile))
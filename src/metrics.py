@@ -0,0 +1,205 @@
+"""Prometheus text-format metrics for requests, database pools and caches.
+
+``MetricsMiddleware`` wraps the main app, and through its ``/api`` mount the
+API app too. It counts requests per route template and status, records
+their latency in a histogram and tracks requests in flight. ``GET /metrics``
+renders those together with connection pool and cache counters in the
+Prometheus exposition format.
+
+Like the caches, metrics live in the worker process; with several workers
+each one is scraped, or reports, separately.
+"""
+from bisect import bisect_left
+from threading import Lock
+from typing import Iterable
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, as in the Prometheus client libraries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _header(name: str, metric_type: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestMetrics:
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self._requests: dict[tuple[str, str, str], int] = {}
+        # (method, route) -> [per-bucket counts (last one is +Inf), sum of seconds]
+        self._latency: dict[tuple[str, str], list] = {}
+        self._lock = Lock()
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            latency = self._latency.setdefault((method, route), [[0] * (len(self.buckets) + 1), 0.0])
+            latency[0][bisect_left(self.buckets, seconds)] += 1
+            latency[1] += seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency.clear()
+
+    def render(self) -> list[str]:
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted((key, (list(counts), total)) for key, (counts, total) in self._latency.items())
+            in_flight = self.in_flight
+
+        lines = _header("garden_http_requests_total", "counter", "HTTP requests handled, by route template and status.")
+        for (method, route, status), count in requests:
+            lines.append(f"garden_http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        name = "garden_http_request_duration_seconds"
+        lines += _header(name, "histogram", "HTTP request latency in seconds, until the response body was sent.")
+        for (method, route), (counts, total) in latency:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(method=method, route=route)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(method=method, route=route)} {cumulative}")
+
+        lines += _header("garden_http_requests_in_flight", "gauge", "HTTP requests being handled.")
+        lines.append(f"garden_http_requests_in_flight {in_flight}")
+        return lines
+
+
+class PoolMetrics:
+    """Checkout counts and current usage for named connection pools."""
+
+    def __init__(self):
+        self._pools: dict[str, Pool] = {}
+        self._checkouts: dict[str, int] = {}
+        self._lock = Lock()
+
+    def watch(self, name: str, pool: Pool) -> None:
+        self._pools[name] = pool
+        self._checkouts.setdefault(name, 0)
+
+        @event.listens_for(pool, "checkout")
+        def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self._checkouts[name] += 1
+
+    def stats(self) -> dict:
+        """Checkouts and current usage per pool, for the health endpoint."""
+        with self._lock:
+            checkouts = dict(self._checkouts)
+        stats = {}
+        for name, pool in sorted(self._pools.items()):
+            values = {"pool": type(pool).__name__, "checkouts": checkouts[name]}
+            for key, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+                if hasattr(pool, method):  # NullPool and friends keep no counts
+                    values[key] = getattr(pool, method)()
+            stats[name] = values
+        return stats
+
+    def render(self) -> list[str]:
+        gauges = {
+            "garden_db_pool_size": ("size", "Connections the pool keeps open."),
+            "garden_db_pool_checked_out": ("checked_out", "Connections currently checked out."),
+            "garden_db_pool_overflow": ("overflow", "Connections open beyond the pool size; negative while the pool is filling."),
+        }
+        stats = self.stats()
+
+        lines = _header("garden_db_pool_checkouts_total", "counter", "Connections checked out of the pool.")
+        for name, values in stats.items():
+            lines.append(f"garden_db_pool_checkouts_total{_labels(pool=name)} {values['checkouts']}")
+        for metric, (key, help_text) in gauges.items():
+            lines += _header(metric, "gauge", help_text)
+            for name, values in stats.items():
+                if key in values:
+                    lines.append(f"{metric}{_labels(pool=name)} {values[key]}")
+        return lines
+
+
+def render_cache_metrics(caches: dict) -> list[str]:
+    """Render ``{name: cache}`` for caches with a StatsCache/TTLCache-style ``stats()``."""
+    stats = {name: cache.stats() for name, cache in sorted(caches.items())}
+    metrics = (
+        ("garden_cache_hits_total", "counter", "hits", "Cache lookups answered from the cache."),
+        ("garden_cache_misses_total", "counter", "misses", "Cache lookups that had to compute the value."),
+        ("garden_cache_evictions_total", "counter", "evictions", "Entries evicted to stay within the size limit."),
+        ("garden_cache_hit_ratio", "gauge", "hit_ratio", "Hits over lookups since start or the last clear."),
+        ("garden_cache_entries", "gauge", "size", "Entries currently cached."),
+    )
+    lines = []
+    for metric, metric_type, key, help_text in metrics:
+        lines += _header(metric, metric_type, help_text)
+        for name, values in stats.items():
+            lines.append(f"{metric}{_labels(cache=name)} {_number(values[key])}")
+    return lines
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, so ids do not create a series per value."""
+    route = scope.get("route")
+    if route is not None:
+        return scope.get("root_path", "") + route.path
+    if "endpoint" in scope:  # A mount without routes, e.g. static files
+        return scope.get("root_path", "") + "/*"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: RequestMetrics | None = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500  # Unless a response starts
+        started = time.perf_counter()
+        self.metrics.started()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Routing fills in the route as the request passes through the app and its mounts
+            self.metrics.finished(method, route_template(scope), status_code, time.perf_counter() - started)
+
+
+request_metrics = RequestMetrics()
+pool_metrics = PoolMetrics()
+
+
+def render_metrics(caches: dict) -> str:
+    lines = request_metrics.render() + pool_metrics.render() + render_cache_metrics(caches)
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from datetime import datetime, date
 from enum import Enum
-from pydantic import BaseModel, HttpUrl, validator, Field
+from pydantic import AnyHttpUrl, BaseModel, validator, Field
 import sqlalchemy as sa
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -26,9 +26,12 @@ class BarcodeData(BaseModel):
     manufacturer: Optional[str] = None
 
 class PlantImage(BaseModel):
-    url: HttpUrl
+    id: Optional[int] = None
+    url: AnyHttpUrl
     description: Optional[str] = None
     taken_date: datetime
+    thumbnail_url: Optional[AnyHttpUrl] = None  # Unset until the variants are generated
+    variants: dict[str, AnyHttpUrl] = {}
 
 class Harvest(BaseModel):
     id: Optional[int] = None
@@ -91,6 +94,32 @@ class Plant(BaseModel):
             raise ValueError(f'Year must be between 2000 and {current_year + 1}')
         return v
 
+class BatchStatusUpdate(BaseModel):
+    """Move every selected plant to ``new_status``; select by ``plant_ids`` or by ``bed_id`` and ``year``."""
+    new_status: PlantStatus
+    plant_ids: Optional[List[int]] = None
+    bed_id: Optional[int] = None
+    year: Optional[int] = None  # With bed_id; defaults to the current year
+
+    @validator('year', always=True)
+    def validate_selector(cls, v, values):
+        if (values.get('plant_ids') is None) == (values.get('bed_id') is None):
+            raise ValueError('Select plants with either plant_ids or bed_id')
+        if values.get('bed_id') is not None and v is None:
+            return datetime.now().year
+        return v
+
+class StatusTransitionResult(BaseModel):
+    plant_id: int
+    outcome: str  # "updated", "unchanged", "invalid_transition" or "not_found"
+    previous_status: Optional[PlantStatus] = None
+    detail: Optional[str] = None
+
+class BatchStatusResult(BaseModel):
+    new_status: PlantStatus
+    updated: int
+    results: List[StatusTransitionResult]
+
 class GardenBed(BaseModel):
     id: Optional[int] = None
     name: str
@@ -122,17 +151,27 @@ class DBGardenBed(Base):
 
 class DBHarvest(Base):
     __tablename__ = "harvests"
+    __table_args__ = (
+        sa.Index("ix_harvests_plant_id_harvest_date", "plant_id", "harvest_date"),
+    )
     
     id = sa.Column(sa.Integer, primary_key=True, index=True)
     plant_id = sa.Column(sa.Integer, sa.ForeignKey("plants.id"))
     harvest_date = sa.Column(sa.DateTime)
     quantity = sa.Column(sa.Float)
     unit = sa.Column(sa.String)
+    weight_lbs = sa.Column(sa.Float, nullable=True)  # quantity in pounds, see src/units.py
     notes = sa.Column(sa.String, nullable=True)
     plant = relationship("DBPlant", back_populates="harvests")
 
 class DBPlant(Base):
     __tablename__ = "plants"
+    __table_args__ = (
+        # Stats and list filters: year alone, year + bed, and per-year status rollups
+        sa.Index("ix_plants_year_bed_id", "year", "bed_id"),
+        sa.Index("ix_plants_year_status", "year", "status", postgresql_include=["quantity"]),
+        sa.Index("ix_plants_bed_id", "bed_id"),
+    )
     
     id = sa.Column(sa.Integer, primary_key=True, index=True)
     name = sa.Column(sa.String)
@@ -146,15 +185,42 @@ class DBPlant(Base):
     expected_harvest_date = sa.Column(sa.DateTime, nullable=True)
     notes = sa.Column(sa.String, nullable=True)
     garden_bed = relationship("DBGardenBed", back_populates="plants")
-    images = relationship("DBPlantImage", back_populates="plant")
+    images = relationship("DBPlantImage", back_populates="plant", order_by="DBPlantImage.id")
     harvests = relationship("DBHarvest", back_populates="plant")
 
 class DBPlantImage(Base):
     __tablename__ = "plant_images"
+    __table_args__ = (
+        sa.Index("ix_plant_images_plant_id", "plant_id"),
+    )
     
     id = sa.Column(sa.Integer, primary_key=True, index=True)
     url = sa.Column(sa.String)
     description = sa.Column(sa.String, nullable=True)
     taken_date = sa.Column(sa.DateTime)
+    variants = sa.Column(sa.JSON, nullable=True)  # Variant name -> URL
     plant_id = sa.Column(sa.Integer, sa.ForeignKey("plants.id"))
     plant = relationship("DBPlant", back_populates="images")
+
+class _RollupTotals:
+    """Totals shared by the rollup tables; see src/rollups.py."""
+    plants_total = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    plants_planted = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    plants_sprouted = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    plants_flowering = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    plants_harvesting = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    plants_finished = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    space_used = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    harvest_count = sa.Column(sa.Integer, nullable=False, default=0, server_default="0")
+    harvest_weight = sa.Column(sa.Float, nullable=False, default=0, server_default="0")  # Pounds
+
+class DBBedYearRollup(_RollupTotals, Base):
+    __tablename__ = "bed_year_rollups"
+    
+    year = sa.Column(sa.Integer, primary_key=True)
+    bed_id = sa.Column(sa.Integer, primary_key=True)
+
+class DBYearRollup(_RollupTotals, Base):
+    __tablename__ = "year_rollups"
+    
+    year = sa.Column(sa.Integer, primary_key=True)
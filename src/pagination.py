@@ -0,0 +1,35 @@
+"""Opaque keyset cursors for paginated list endpoints.
+
+A cursor records the id of the last row on a page; the next page is simply
+``WHERE id > :id ORDER BY id LIMIT :n``, so fetching any page costs the same
+however deep into the list it is. Cursors are base64 encoded so clients treat
+them as opaque tokens rather than building them by hand.
+"""
+import base64
+import json
+import os
+
+PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+
+def page_size(limit: int | None) -> int:
+    """Clamp a requested page size to the configured cap."""
+    return min(limit or PAGE_SIZE, MAX_PAGE_SIZE)
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the id a cursor points after; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+    if not isinstance(last_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return last_id
@@ -0,0 +1,203 @@
+"""Send read-only routes to a read replica when one is configured.
+
+Read-only routes depend on ``get_read_db`` instead of ``get_async_db``. It
+hands out a session on the replica (``DATABASE_REPLICA_URL``) unless:
+
+- the client wrote something in the last ``REPLICA_STICKY_SECONDS``, so it
+  reads its own writes. ``ReadYourWritesMiddleware`` marks successful
+  writes with a short-lived cookie, which also works across workers;
+- the replica is behind by more than ``REPLICA_MAX_LAG_SECONDS``, or could
+  not be reached. Lag is checked at most every ``REPLICA_CHECK_SECONDS``,
+  and the replica connection is opened before the route gets the session,
+  so a replica that went down between checks also falls back.
+
+In either case the route gets the primary session, as it would without a
+replica. Stats routes use ``get_cached_read_db``: their results are cached
+for every client, so they also stay on the primary for the sticky window
+after any write this worker served, or a lagging replica could put stale
+totals back into the cache right after the write invalidated them.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import asyncio
+import logging
+import os
+import time
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import MutableHeaders
+from .database import get_async_db, replica_engine
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "2"))
+REPLICA_CHECK_SECONDS = float(os.getenv("REPLICA_CHECK_SECONDS", "5"))
+REPLICA_CHECK_TIMEOUT = float(os.getenv("REPLICA_CHECK_TIMEOUT", "1"))
+
+# Holds the time (Unix seconds) until which the client reads from the primary
+STICKY_COOKIE = "garden_read_primary_until"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# A replica that is caught up with what it has received reports no lag, even
+# when the last replayed transaction is old because the primary is idle
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Errors that mean the replica is down rather than that a query was wrong
+REPLICA_ERRORS = (OSError, asyncio.TimeoutError, OperationalError, InterfaceError)
+
+
+class ReplicaRouter:
+    """Decides per request whether reads may go to the replica."""
+
+    def __init__(self, engine: AsyncEngine | None):
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        ) if engine is not None else None
+        self.lag: float | None = None  # seconds; None when the replica could not be reached
+        self.last_write = float("-inf")  # monotonic time of the last write this worker served
+        self._checked_at = float("-inf")
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None
+
+    async def available(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at >= REPLICA_CHECK_SECONDS:
+            self._checked_at = now  # Concurrent requests use the last result meanwhile
+            self.lag = await self._measure_lag()
+        return self.lag is not None and self.lag <= REPLICA_MAX_LAG_SECONDS
+
+    async def _measure_lag(self) -> float | None:
+        async def query() -> float:
+            async with self.engine.connect() as conn:
+                return float((await conn.execute(LAG_QUERY)).scalar())
+
+        try:
+            lag = await asyncio.wait_for(query(), timeout=REPLICA_CHECK_TIMEOUT)
+        except REPLICA_ERRORS as e:
+            logger.warning("Read replica unavailable, reading from the primary: %r", e)
+            return None
+        if lag > REPLICA_MAX_LAG_SECONDS:
+            logger.warning("Read replica is %.1fs behind, reading from the primary", lag)
+        return lag
+
+    def failed(self) -> None:
+        """Stop using the replica until the next check, after a request failed on it."""
+        self.lag = None
+        self._checked_at = time.monotonic()
+
+    def client_is_sticky(self, request: Request) -> bool:
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+        except ValueError:
+            return False
+
+    def worker_is_sticky(self) -> bool:
+        return time.monotonic() - self.last_write < REPLICA_STICKY_SECONDS
+
+    def sticky_cookie(self) -> str:
+        until = time.time() + REPLICA_STICKY_SECONDS
+        return f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(REPLICA_STICKY_SECONDS) + 1}; Path=/; HttpOnly; SameSite=Lax"
+
+    def stats(self) -> dict:
+        return {"lag_seconds": self.lag, "in_use": self.lag is not None and self.lag <= REPLICA_MAX_LAG_SECONDS}
+
+    @asynccontextmanager
+    async def session(self, request: Request, primary: AsyncSession, shared: bool) -> AsyncIterator[AsyncSession]:
+        """The replica session when this request may use it, otherwise ``primary``.
+
+        ``shared`` marks results that are cached for every client.
+        """
+        if (
+            not self.enabled
+            or self.client_is_sticky(request)
+            or (shared and self.worker_is_sticky())
+            or not await self.available()
+        ):
+            yield primary
+            return
+
+        # Connect before handing the session out: the replica may have gone
+        # down since the last lag check, and this request can still use the primary
+        db = self.session_factory()
+        try:
+            await db.connection()
+        except REPLICA_ERRORS as e:
+            await db.close()
+            logger.warning("Read replica unavailable, reading from the primary: %r", e)
+            self.failed()
+            yield primary
+            return
+
+        async with db:
+            try:
+                yield db
+            except REPLICA_ERRORS:
+                # The route already started reading; its results can't be replayed
+                self.failed()
+                raise
+
+
+replica_router = ReplicaRouter(replica_engine)
+
+
+def replica_health() -> dict | None:
+    """Replica lag for the health endpoint, or None without a replica."""
+    return replica_router.stats() if replica_router.enabled else None
+
+
+async def dispose_replica() -> None:
+    """Close the replica's pooled connections at shutdown, if a replica is configured."""
+    if replica_router.enabled:
+        await replica_router.engine.dispose()
+
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """Session for read-only routes: the replica when it may serve this client, else the primary."""
+    async with replica_router.session(request, primary, shared=False) as db:
+        yield db
+
+
+async def get_cached_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """Like get_read_db, for results cached for every client; see the module docstring."""
+    async with replica_router.session(request, primary, shared=True) as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote, so their reads go to the primary for a while."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        router = replica_router
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        # Before the route runs, as it invalidates cached stats before responding
+        router.last_write = time.monotonic()
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                router.last_write = time.monotonic()
+                MutableHeaders(scope=message).append("Set-Cookie", router.sticky_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,27 @@
+"""JSON responses serialized with orjson.
+
+``APIJSONResponse`` is the API's default response class. Routes that build
+their response models from database rows can also return it directly,
+which skips FastAPI's second validation pass over the ``response_model``
+and its ``jsonable_encoder`` walk; pydantic models are then serialized by
+orjson through ``.dict()``.
+"""
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class APIJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
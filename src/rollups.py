@@ -0,0 +1,148 @@
+"""Pre-aggregated plant and harvest totals per (year, bed) and per year.
+
+The garden mutation routes call ``refresh_rollups`` inside their own
+transaction with the (year, bed) pairs they touched. Each affected bed row
+is recomputed from the plants and harvests of that bed and year, and each
+affected year row is then re-summed from its bed rows, so a write costs a
+handful of indexed queries however large the garden is. ``rebuild_rollups``
+recomputes everything and recovers from any drift, e.g. after rows were
+written outside the API (``python scripts/rebuild_rollups.py``).
+
+Concurrent writers lock the rows they refresh, bed rows before year rows
+and each in key order, so they serialize instead of overwriting each
+other's totals.
+"""
+from typing import Iterable
+from sqlalchemy import delete, func, insert, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import case
+from .models import DBBedYearRollup, DBHarvest, DBPlant, DBYearRollup, PlantStatus
+from .units import pounds_expression
+
+STATUS_COLUMNS = {status.value: f"plants_{status.value.lower()}" for status in PlantStatus}
+TOTAL_COLUMNS = ("plants_total", *STATUS_COLUMNS.values(), "space_used", "harvest_count", "harvest_weight")
+
+
+def _bed_year_totals(keys: list[tuple[int, int]] | None = None):
+    """SELECT computing the rollup totals per (year, bed_id) from plants and harvests."""
+    plant_totals = (
+        select(
+            DBPlant.year,
+            DBPlant.bed_id,
+            func.coalesce(func.sum(DBPlant.quantity), 0).label("plants_total"),
+            *[
+                func.coalesce(func.sum(case((DBPlant.status == status, DBPlant.quantity), else_=0)), 0).label(column)
+                for status, column in STATUS_COLUMNS.items()
+            ],
+            func.coalesce(func.sum(DBPlant.quantity * DBPlant.space_required), 0).label("space_used"),
+        )
+        .where(DBPlant.year.isnot(None), DBPlant.bed_id.isnot(None))
+        .group_by(DBPlant.year, DBPlant.bed_id)
+    )
+    harvest_totals = (
+        select(
+            DBPlant.year,
+            DBPlant.bed_id,
+            func.count(DBHarvest.id).label("harvest_count"),
+            func.sum(DBHarvest.weight_lbs).label("harvest_weight"),
+        )
+        .join(DBPlant)
+        .where(DBHarvest.harvest_date.isnot(None))
+        .group_by(DBPlant.year, DBPlant.bed_id)
+    )
+    if keys is not None:
+        plant_totals = plant_totals.where(tuple_(DBPlant.year, DBPlant.bed_id).in_(keys))
+        harvest_totals = harvest_totals.where(tuple_(DBPlant.year, DBPlant.bed_id).in_(keys))
+    plants = plant_totals.subquery()
+    harvests = harvest_totals.subquery()
+
+    return select(
+        plants.c.year,
+        plants.c.bed_id,
+        *[plants.c[column] for column in TOTAL_COLUMNS if column not in ("harvest_count", "harvest_weight")],
+        func.coalesce(harvests.c.harvest_count, 0).label("harvest_count"),
+        func.coalesce(harvests.c.harvest_weight, 0).label("harvest_weight"),
+    ).outerjoin(
+        harvests,
+        (harvests.c.year == plants.c.year) & (harvests.c.bed_id == plants.c.bed_id)
+    )
+
+
+def _year_totals(years: list[int] | None = None):
+    """SELECT summing the bed rollup rows per year."""
+    query = select(
+        DBBedYearRollup.year,
+        *[func.coalesce(func.sum(getattr(DBBedYearRollup, column)), 0).label(column) for column in TOTAL_COLUMNS]
+    ).group_by(DBBedYearRollup.year)
+    if years is not None:
+        query = query.where(DBBedYearRollup.year.in_(years))
+    return query
+
+
+async def _lock_rows(db: AsyncSession, model, keys: list[dict]) -> None:
+    """Create any missing rollup rows for ``keys`` and lock them all, in key order."""
+    table = model.__table__
+    await db.execute(pg_insert(table).values(keys).on_conflict_do_nothing())
+    columns = [table.c[name] for name in keys[0]]
+    await db.execute(
+        select(table)
+        .where(tuple_(*columns).in_([tuple(key.values()) for key in keys]))
+        .order_by(*columns)
+        .with_for_update()
+    )
+
+
+async def refresh_rollups(db: AsyncSession, keys: Iterable[tuple[int | None, int | None]]) -> None:
+    """Recompute the rollups for the given (year, bed_id) pairs in the current transaction.
+
+    Call after making the plant or harvest changes and before committing.
+    Pairs with no year or bed are skipped; such plants are not rolled up.
+    """
+    keys = sorted({(year, bed_id) for year, bed_id in keys if year is not None and bed_id is not None})
+    if not keys:
+        return
+    years = sorted({year for year, _ in keys})
+    await db.flush()  # The totals must see this session's pending changes
+
+    await _lock_rows(db, DBBedYearRollup, [{"year": year, "bed_id": bed_id} for year, bed_id in keys])
+    totals = {(row.year, row.bed_id): row for row in (await db.execute(_bed_year_totals(keys))).all()}
+    for year, bed_id in keys:
+        row = totals.get((year, bed_id))
+        await db.execute(
+            update(DBBedYearRollup)
+            .where(DBBedYearRollup.year == year, DBBedYearRollup.bed_id == bed_id)
+            .values(**{column: row._mapping[column] if row else 0 for column in TOTAL_COLUMNS})
+        )
+
+    await _lock_rows(db, DBYearRollup, [{"year": year} for year in years])
+    totals = {row.year: row for row in (await db.execute(_year_totals(years))).all()}
+    for year in years:
+        row = totals.get(year)
+        await db.execute(
+            update(DBYearRollup)
+            .where(DBYearRollup.year == year)
+            .values(**{column: row._mapping[column] if row else 0 for column in TOTAL_COLUMNS})
+        )
+
+
+def rebuild_statements() -> list:
+    """Statements that recompute every rollup row from scratch, in execution order."""
+    return [
+        # Writers wait for the rebuild rather than refreshing rows it is replacing
+        text("LOCK TABLE bed_year_rollups, year_rollups IN EXCLUSIVE MODE"),
+        # Harvests inserted outside the API may not have their weight yet
+        update(DBHarvest)
+        .where(DBHarvest.weight_lbs.is_(None), DBHarvest.quantity.isnot(None))
+        .values(weight_lbs=pounds_expression(DBHarvest.quantity, DBHarvest.unit)),
+        delete(DBBedYearRollup),
+        delete(DBYearRollup),
+        insert(DBBedYearRollup).from_select(["year", "bed_id", *TOTAL_COLUMNS], _bed_year_totals()),
+        insert(DBYearRollup).from_select(["year", *TOTAL_COLUMNS], _year_totals()),
+    ]
+
+
+async def rebuild_rollups(db: AsyncSession) -> None:
+    """Recompute every rollup row; the caller commits."""
+    for statement in rebuild_statements():
+        await db.execute(statement)
@@ -0,0 +1,86 @@
+from datetime import date, datetime
+from typing import AsyncIterator
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from ..replica import get_read_db
+from ..models import DBGardenBed, DBHarvest, DBPlant, DBPlantImage
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Rows fetched per round trip; also the rows per streamed chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_TABLES = {
+    "beds": DBGardenBed.__table__,
+    "plants": DBPlant.__table__,
+    "harvests": DBHarvest.__table__,
+    "images": DBPlantImage.__table__,
+}
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+def _ndjson_chunk(columns: list[str], rows) -> str:
+    return "".join(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows)
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+async def _export_rows(bind: AsyncEngine, table, export_format: str) -> AsyncIterator[str]:
+    """Stream every row of ``table`` in id order, one chunk per batch.
+
+    The response outlives the request's session, so this opens its own. Rows
+    come from a server-side cursor ``EXPORT_BATCH_SIZE`` at a time, so memory
+    stays flat however large the table is.
+    """
+    columns = [column.name for column in table.columns]
+    if export_format == "csv":
+        yield _csv_chunk([columns])
+
+    query = select(table).order_by(table.c.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    async with AsyncSession(bind) as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield _csv_chunk(rows) if export_format == "csv" else _ndjson_chunk(columns, rows)
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query(default="ndjson"),
+    db: AsyncSession = Depends(get_read_db)
+) -> StreamingResponse:
+    """Stream every bed, plant, harvest or image row as NDJSON (default) or CSV."""
+    if dataset not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export. Choose from: {', '.join(EXPORT_TABLES)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Choose from: {', '.join(EXPORT_FORMATS)}")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        _export_rows(db.bind, EXPORT_TABLES[dataset], format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="garden-{dataset}.{extension}"'}
+    )
@@ -1,11 +1,31 @@
-from typing import Optional, List
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Body, UploadFile, File
-from sqlalchemy.orm import Session
+from typing import List
+from datetime import date, datetime, time, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request
+from sqlalchemy import delete, distinct, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from ..database import get_db
-from ..models import Plant, GardenBed, PlantStatus, DBPlant, DBGardenBed, DBPlantImage, Harvest, DBHarvest
+from ..database import get_async_db
+from ..replica import get_read_db
+from ..loaders import apply_profile, loader_options
+from ..cache import stats_cache
+from ..pagination import decode_cursor, encode_cursor, page_size
+from ..responses import APIJSONResponse
+from ..rollups import refresh_rollups
+from ..units import to_pounds
+from ..models import (
+    BatchStatusResult,
+    BatchStatusUpdate,
+    DBGardenBed,
+    DBHarvest,
+    DBPlant,
+    GardenBed,
+    Harvest,
+    Plant,
+    PlantStatus,
+    StatusTransitionResult,
+)
 from . import VALID_STATUS_TRANSITIONS
+from .images import plant_image_response
 
 router = APIRouter(prefix="/garden")
 
@@ -18,7 +38,7 @@ VALID_STATUS_TRANSITIONS = {
 }
 
 @router.post("/beds", response_model=GardenBed)
-def create_garden_bed(garden_bed: GardenBed, db: Session = Depends(get_db)) -> GardenBed:
+async def create_garden_bed(garden_bed: GardenBed, db: AsyncSession = Depends(get_async_db)) -> GardenBed:
     try:
         db_bed = DBGardenBed(
             name=garden_bed.name,
@@ -26,8 +46,9 @@ def create_garden_bed(garden_bed: GardenBed, db: Session = Depends(get_db)) -> G
             notes=garden_bed.notes
         )
         db.add(db_bed)
-        db.commit()
-        db.refresh(db_bed)
+        await db.commit()
+        await db.refresh(db_bed)
+        stats_cache.invalidate(bed_ids=[db_bed.id])
         return GardenBed(
             id=db_bed.id,
             name=db_bed.name,
@@ -36,24 +57,26 @@ def create_garden_bed(garden_bed: GardenBed, db: Session = Depends(get_db)) -> G
             plants=[]
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="Database connection error"
         ) from e
 
 @router.get("/beds", response_model=list[GardenBed])
-def list_garden_beds(db: Session = Depends(get_db)) -> list[GardenBed]:
+async def list_garden_beds(db: AsyncSession = Depends(get_read_db)) -> list[GardenBed]:
     try:
-        db_beds = db.query(DBGardenBed).all()
-        return [
-            GardenBed(
+        result = await db.execute(apply_profile(select(DBGardenBed), "bed_list"))
+        db_beds = result.scalars().all()
+        # Built from stored rows, so skip validation here and in response_model
+        return APIJSONResponse([
+            GardenBed.construct(
                 id=bed.id,
                 name=bed.name,
                 dimensions=bed.dimensions,
                 notes=bed.notes,
                 plants=[
-                    Plant(
+                    Plant.construct(
                         id=p.id,
                         name=p.name,
                         variety=p.variety,
@@ -68,23 +91,27 @@ def list_garden_beds(db: Session = Depends(get_db)) -> list[GardenBed]:
                 ]
             )
             for bed in db_beds
-        ]
+        ])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/beds/{bed_id}")
-def get_garden_bed(bed_id: int, db: Session = Depends(get_db)) -> GardenBed:
-    db_bed = db.query(DBGardenBed).filter(DBGardenBed.id == bed_id).first()
+async def get_garden_bed(bed_id: int, db: AsyncSession = Depends(get_read_db)) -> GardenBed:
+    result = await db.execute(
+        apply_profile(select(DBGardenBed), "bed_detail")
+        .where(DBGardenBed.id == bed_id)
+    )
+    db_bed = result.scalars().first()
     if not db_bed:
         raise HTTPException(status_code=404, detail="Garden bed not found")
     
-    return GardenBed(
+    return APIJSONResponse(GardenBed.construct(
         id=db_bed.id,
         name=db_bed.name,
         dimensions=db_bed.dimensions,
         notes=db_bed.notes,
         plants=[
-            Plant(
+            Plant.construct(
                 id=p.id,
                 name=p.name,
                 variety=p.variety,
@@ -99,11 +126,15 @@ def get_garden_bed(bed_id: int, db: Session = Depends(get_db)) -> GardenBed:
             )
             for p in db_bed.plants
         ]
-    )
+    ))
 
 @router.patch("/beds/{bed_id}", response_model=GardenBed)
-def update_garden_bed(bed_id: int, garden_bed: GardenBed, db: Session = Depends(get_db)) -> GardenBed:
-    db_bed = db.query(DBGardenBed).filter(DBGardenBed.id == bed_id).first()
+async def update_garden_bed(bed_id: int, garden_bed: GardenBed, db: AsyncSession = Depends(get_async_db)) -> GardenBed:
+    result = await db.execute(
+        apply_profile(select(DBGardenBed), "bed_detail")
+        .where(DBGardenBed.id == bed_id)
+    )
+    db_bed = result.scalars().first()
     if not db_bed:
         raise HTTPException(status_code=404, detail="Garden bed not found")
     
@@ -111,8 +142,9 @@ def update_garden_bed(bed_id: int, garden_bed: GardenBed, db: Session = Depends(
     db_bed.dimensions = garden_bed.dimensions
     db_bed.notes = garden_bed.notes
     
-    db.commit()
-    db.refresh(db_bed)
+    await db.commit()
+    await db.refresh(db_bed)
+    stats_cache.invalidate(bed_ids=[bed_id])
     
     return GardenBed(
         id=db_bed.id,
@@ -136,7 +168,7 @@ def update_garden_bed(bed_id: int, garden_bed: GardenBed, db: Session = Depends(
     )
 
 @router.post("/plants", response_model=Plant)
-def create_plant(plant: Plant, db: Session = Depends(get_db)) -> Plant:
+async def create_plant(plant: Plant, db: AsyncSession = Depends(get_async_db)) -> Plant:
     # Extract bed ID from location string
     try:
         bed_id = int(plant.location.split()[1])
@@ -147,7 +179,7 @@ def create_plant(plant: Plant, db: Session = Depends(get_db)) -> Plant:
         )
     
     # Verify bed exists
-    db_bed = db.query(DBGardenBed).filter(DBGardenBed.id == bed_id).first()
+    db_bed = await db.get(DBGardenBed, bed_id)
     if not db_bed:
         raise HTTPException(status_code=404, detail="Garden bed not found")
     
@@ -164,8 +196,10 @@ def create_plant(plant: Plant, db: Session = Depends(get_db)) -> Plant:
         notes=plant.notes
     )
     db.add(db_plant)
-    db.commit()
-    db.refresh(db_plant)
+    await refresh_rollups(db, [(db_plant.year, bed_id)])
+    await db.commit()
+    await db.refresh(db_plant)
+    stats_cache.invalidate(years=[db_plant.year], bed_ids=[bed_id])
     
     return Plant(
         id=db_plant.id,
@@ -183,17 +217,63 @@ def create_plant(plant: Plant, db: Session = Depends(get_db)) -> Plant:
     )
 
 @router.get("/plants", response_model=list[Plant])
-def list_plants(
+async def list_plants(
+    request: Request,
     year: int | None = None,
-    db: Session = Depends(get_db)
+    bed_id: int | None = None,
+    status: list[PlantStatus] | None = Query(None),
+    name: str | None = None,
+    planted_from: date | None = None,
+    planted_to: date | None = None,
+    harvest_from: date | None = None,
+    harvest_to: date | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1),
+    db: AsyncSession = Depends(get_read_db)
 ) -> list[Plant]:
-    query = db.query(DBPlant)
+    """List plants one page at a time, ordered by id.
+    
+    When more plants match, the cursor for the next page is returned in the
+    ``X-Next-Cursor`` header and as a ``Link: rel="next"`` URL. Date ranges
+    are inclusive.
+    """
+    query = apply_profile(select(DBPlant), "plant_list")
     if year:
-        query = query.filter(DBPlant.year == year)
+        query = query.where(DBPlant.year == year)
+    if bed_id is not None:
+        query = query.where(DBPlant.bed_id == bed_id)
+    if status:
+        query = query.where(DBPlant.status.in_([s.value for s in status]))
+    if name:
+        query = query.where(func.lower(DBPlant.name).contains(name.lower(), autoescape=True))
+    if planted_from:
+        query = query.where(DBPlant.planting_date >= datetime.combine(planted_from, time.min))
+    if planted_to:
+        query = query.where(DBPlant.planting_date < datetime.combine(planted_to + timedelta(days=1), time.min))
+    if harvest_from:
+        query = query.where(DBPlant.expected_harvest_date >= datetime.combine(harvest_from, time.min))
+    if harvest_to:
+        query = query.where(DBPlant.expected_harvest_date < datetime.combine(harvest_to + timedelta(days=1), time.min))
+    if cursor:
+        try:
+            query = query.where(DBPlant.id > decode_cursor(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    db_plants = query.all()
-    return [
-        Plant(
+    size = page_size(limit)
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(query.order_by(DBPlant.id).limit(size + 1))
+    db_plants = result.scalars().all()
+    headers = {}
+    if len(db_plants) > size:
+        db_plants = db_plants[:size]
+        next_cursor = encode_cursor(db_plants[-1].id)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    
+    # Built from stored rows, so skip validation here and in response_model
+    return APIJSONResponse([
+        Plant.construct(
             id=p.id,
             name=p.name,
             variety=p.variety,
@@ -204,19 +284,20 @@ def list_plants(
             quantity=p.quantity,
             space_required=p.space_required,
             expected_harvest_date=p.expected_harvest_date,
-            notes=p.notes
+            notes=p.notes,
+            images=[plant_image_response(image) for image in p.images]
         )
         for p in db_plants
-    ]
+    ], headers=headers)
 
 @router.get("/plants/{plant_id}", response_model=Plant)
-def get_plant(plant_id: int, db: Session = Depends(get_db)) -> Plant:
+async def get_plant(plant_id: int, db: AsyncSession = Depends(get_read_db)) -> Plant:
     """Get a single plant by ID."""
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    db_plant = await db.get(DBPlant, plant_id, options=loader_options("plant_detail"))
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
-    return Plant(
+    return APIJSONResponse(Plant.construct(
         id=db_plant.id,
         name=db_plant.name,
         variety=db_plant.variety,
@@ -228,16 +309,68 @@ def get_plant(plant_id: int, db: Session = Depends(get_db)) -> Plant:
         space_required=db_plant.space_required,
         expected_harvest_date=db_plant.expected_harvest_date,
         notes=db_plant.notes,
-        images=[]  # Images loaded separately
-    )
+        images=[plant_image_response(image) for image in db_plant.images]
+    ))
+
+@router.patch("/plants/status", response_model=BatchStatusResult)
+async def update_plant_statuses(batch: BatchStatusUpdate, db: AsyncSession = Depends(get_async_db)) -> BatchStatusResult:
+    """Move many plants to a new status with one UPDATE.
+
+    Each selected plant is checked against ``VALID_STATUS_TRANSITIONS``;
+    plants that may move are updated together and the rest are reported
+    with the reason they were skipped.
+    """
+    query = select(DBPlant.id, DBPlant.status, DBPlant.year, DBPlant.bed_id)
+    if batch.plant_ids is not None:
+        query = query.where(DBPlant.id.in_(batch.plant_ids))
+    else:
+        if not await db.get(DBGardenBed, batch.bed_id):
+            raise HTTPException(status_code=404, detail="Garden bed not found")
+        query = query.where(DBPlant.bed_id == batch.bed_id, DBPlant.year == batch.year)
+    # Locked so a concurrent change cannot slip in between the check and the update
+    plants = {row.id: row for row in (await db.execute(query.order_by(DBPlant.id).with_for_update())).all()}
+    
+    results = []
+    to_update = []
+    selected = dict.fromkeys(batch.plant_ids) if batch.plant_ids is not None else plants
+    for plant_id in selected:
+        plant = plants.get(plant_id)
+        if plant is None:
+            results.append(StatusTransitionResult(plant_id=plant_id, outcome="not_found", detail="Plant not found"))
+            continue
+        current_status = PlantStatus(plant.status)
+        result = StatusTransitionResult(plant_id=plant_id, outcome="updated", previous_status=current_status)
+        if current_status == batch.new_status:
+            result.outcome = "unchanged"
+        elif batch.new_status not in VALID_STATUS_TRANSITIONS[current_status]:
+            valid_transitions = VALID_STATUS_TRANSITIONS[current_status]
+            result.outcome = "invalid_transition"
+            result.detail = f"From {current_status.value}, can only transition to: {[s.value for s in valid_transitions]}"
+        else:
+            to_update.append(plant_id)
+        results.append(result)
+    
+    if to_update:
+        await db.execute(
+            update(DBPlant)
+            .where(DBPlant.id.in_(to_update))
+            .values(status=batch.new_status.value)
+            .execution_options(synchronize_session=False)
+        )
+        keys = {(plants[plant_id].year, plants[plant_id].bed_id) for plant_id in to_update}
+        await refresh_rollups(db, keys)
+        await db.commit()
+        stats_cache.invalidate(years={year for year, _ in keys}, bed_ids={bed_id for _, bed_id in keys})
+    
+    return BatchStatusResult(new_status=batch.new_status, updated=len(to_update), results=results)
 
 @router.patch("/plants/{plant_id}/status", response_model=Plant)
-def update_plant_status(
+async def update_plant_status(
     plant_id: int,
     new_status: PlantStatus = Body(..., embed=True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Plant:
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    db_plant = await db.get(DBPlant, plant_id)
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
@@ -250,8 +383,10 @@ def update_plant_status(
         )
     
     db_plant.status = new_status.value
-    db.commit()
-    db.refresh(db_plant)
+    await refresh_rollups(db, [(db_plant.year, db_plant.bed_id)])
+    await db.commit()
+    await db.refresh(db_plant)
+    stats_cache.invalidate(years=[db_plant.year], bed_ids=[db_plant.bed_id])
     
     return Plant(
         id=db_plant.id,
@@ -267,9 +402,9 @@ def update_plant_status(
     )
 
 @router.patch("/plants/{plant_id}", response_model=Plant)
-def update_plant(plant_id: int, plant_update: Plant, db: Session = Depends(get_db)) -> Plant:
+async def update_plant(plant_id: int, plant_update: Plant, db: AsyncSession = Depends(get_async_db)) -> Plant:
     """Update a plant's details."""
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    db_plant = await db.get(DBPlant, plant_id)
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
@@ -282,8 +417,10 @@ def update_plant(plant_id: int, plant_update: Plant, db: Session = Depends(get_d
     db_plant.expected_harvest_date = plant_update.expected_harvest_date
     db_plant.notes = plant_update.notes
     
-    db.commit()
-    db.refresh(db_plant)
+    await refresh_rollups(db, [(db_plant.year, db_plant.bed_id)])
+    await db.commit()
+    await db.refresh(db_plant)
+    stats_cache.invalidate(years=[db_plant.year], bed_ids=[db_plant.bed_id])
     
     return Plant(
         id=db_plant.id,
@@ -300,34 +437,40 @@ def update_plant(plant_id: int, plant_update: Plant, db: Session = Depends(get_d
     )
 
 @router.delete("/plants/{plant_id}", response_model=dict)
-def delete_plant(plant_id: int, db: Session = Depends(get_db)) -> dict:
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+async def delete_plant(plant_id: int, db: AsyncSession = Depends(get_async_db)) -> dict:
+    db_plant = await db.get(DBPlant, plant_id)
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
-    db.delete(db_plant)
-    db.commit()
+    year, bed_id = db_plant.year, db_plant.bed_id
+    await db.delete(db_plant)
+    await refresh_rollups(db, [(year, bed_id)])
+    await db.commit()
+    stats_cache.invalidate(years=[year], bed_ids=[bed_id])
     return {"status": "success"}
 
 @router.delete("/beds/{bed_id}", response_model=dict)
-def delete_garden_bed(bed_id: int, db: Session = Depends(get_db)) -> dict:
+async def delete_garden_bed(bed_id: int, db: AsyncSession = Depends(get_async_db)) -> dict:
     """Delete a garden bed and its associated plants."""
-    db_bed = db.query(DBGardenBed).filter(DBGardenBed.id == bed_id).first()
+    db_bed = await db.get(DBGardenBed, bed_id)
     if not db_bed:
         raise HTTPException(status_code=404, detail="Garden bed not found")
     
     # Delete associated plants first
-    db.query(DBPlant).filter(DBPlant.bed_id == bed_id).delete()
+    years = (await db.execute(select(distinct(DBPlant.year)).where(DBPlant.bed_id == bed_id))).scalars().all()
+    await db.execute(delete(DBPlant).where(DBPlant.bed_id == bed_id))
+    await refresh_rollups(db, [(year, bed_id) for year in years])
     
     # Delete the bed
-    db.delete(db_bed)
-    db.commit()
+    await db.delete(db_bed)
+    await db.commit()
+    stats_cache.invalidate(bed_ids=[bed_id])
     return {"status": "success"}
 
 @router.post("/plants/{plant_id}/harvests", response_model=Harvest)
-def add_harvest(plant_id: int, harvest: Harvest, db: Session = Depends(get_db)) -> Harvest:
+async def add_harvest(plant_id: int, harvest: Harvest, db: AsyncSession = Depends(get_async_db)) -> Harvest:
     """Record a new harvest for a plant."""
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    db_plant = await db.get(DBPlant, plant_id)
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
@@ -348,11 +491,14 @@ def add_harvest(plant_id: int, harvest: Harvest, db: Session = Depends(get_db))
         harvest_date=harvest.harvest_date,
         quantity=harvest.quantity,
         unit=harvest.unit,
+        weight_lbs=to_pounds(harvest.quantity, harvest.unit),
         notes=harvest.notes
     )
     db.add(db_harvest)
-    db.commit()
-    db.refresh(db_harvest)
+    await refresh_rollups(db, [(db_plant.year, db_plant.bed_id)])
+    await db.commit()
+    await db.refresh(db_harvest)
+    stats_cache.invalidate(years=[db_plant.year], bed_ids=[db_plant.bed_id])
     
     return Harvest(
         id=db_harvest.id,
@@ -364,9 +510,13 @@ def add_harvest(plant_id: int, harvest: Harvest, db: Session = Depends(get_db))
     )
 
 @router.get("/plants/{plant_id}/harvests", response_model=List[Harvest])
-def list_harvests(plant_id: int, db: Session = Depends(get_db)) -> List[Harvest]:
+async def list_harvests(plant_id: int, db: AsyncSession = Depends(get_read_db)) -> List[Harvest]:
     """List all harvests for a plant."""
-    db_plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    result = await db.execute(
+        apply_profile(select(DBPlant), "plant_harvests")
+        .where(DBPlant.id == plant_id)
+    )
+    db_plant = result.scalars().first()
     if not db_plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
@@ -383,16 +533,19 @@ def list_harvests(plant_id: int, db: Session = Depends(get_db)) -> List[Harvest]
     ]
 
 @router.delete("/plants/{plant_id}/harvests/{harvest_id}")
-def delete_harvest(plant_id: int, harvest_id: int, db: Session = Depends(get_db)):
+async def delete_harvest(plant_id: int, harvest_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a harvest record."""
-    db_harvest = (
-        db.query(DBHarvest)
-        .filter(DBHarvest.id == harvest_id, DBHarvest.plant_id == plant_id)
-        .first()
+    result = await db.execute(
+        apply_profile(select(DBHarvest), "harvest_plant")
+        .where(DBHarvest.id == harvest_id, DBHarvest.plant_id == plant_id)
     )
+    db_harvest = result.scalars().first()
     if not db_harvest:
         raise HTTPException(status_code=404, detail="Harvest not found")
     
-    db.delete(db_harvest)
-    db.commit()
+    year, bed_id = db_harvest.plant.year, db_harvest.plant.bed_id
+    await db.delete(db_harvest)
+    await refresh_rollups(db, [(year, bed_id)])
+    await db.commit()
+    stats_cache.invalidate(years=[year], bed_ids=[bed_id])
     return {"message": "Harvest deleted successfully"}
\ No newline at end of file
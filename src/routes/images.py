@@ -1,57 +1,175 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-import io
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from PIL import Image
-from pyzbar.pyzbar import decode
+from ..barcode import (
+    BARCODE_RETRY_AFTER,
+    DecodeTimeout,
+    DecoderBusy,
+    barcode_cache,
+    barcode_pool,
+    content_key,
+)
 from ..models import PlantImage, BarcodeData, DBPlant, DBPlantImage
-from ..database import get_db
+from ..database import get_async_db
+from ..storage import (
+    CHUNK_SIZE,
+    IMAGE_CACHE_CONTROL,
+    IMAGE_TYPES,
+    RangeNotSatisfiable,
+    StorageBackend,
+    UnsupportedImageType,
+    get_storage,
+    is_image_type,
+    new_image_key,
+    parse_byte_range,
+)
+from ..variants import VARIANTS, generate_variants, variant_key
 
 router = APIRouter(prefix="/images", tags=["images"])
 
+def plant_image_response(db_image: DBPlantImage) -> PlantImage:
+    variants = db_image.variants or {}
+    return PlantImage.construct(
+        id=db_image.id,
+        url=db_image.url,
+        description=db_image.description,
+        taken_date=db_image.taken_date,
+        thumbnail_url=variants.get("thumb_jpeg"),
+        variants=variants
+    )
+
+async def _upload_chunks(file: UploadFile):
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
 @router.post("/plants/{plant_id}/upload")
 async def upload_plant_image(
     plant_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     description: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage)
 ) -> PlantImage:
-    plant = db.query(DBPlant).filter(DBPlant.id == plant_id).first()
+    plant = await db.get(DBPlant, plant_id)
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
     
-    # In production, save image to cloud storage and return URL
-    # For demo, we'll pretend we saved it
-    image_url = f"http://example.com/images/{file.filename}"
+    try:
+        key = new_image_key(plant_id, file.content_type)
+    except UnsupportedImageType:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported image type; expected one of {', '.join(IMAGE_TYPES)}"
+        )
+    # The stored content type follows from the key's extension
+    await storage.save(key, _upload_chunks(file))
     
     db_image = DBPlantImage(
-        url=image_url,
+        url=str(request.url_for("get_image_file", key=key)),
         description=description,
         taken_date=datetime.now(),
         plant_id=plant_id
     )
     db.add(db_image)
-    db.commit()
-    db.refresh(db_image)
+    try:
+        await db.commit()
+    except Exception:
+        await storage.delete(key)  # Don't leave an orphaned file behind
+        raise
+    await db.refresh(db_image)
     
-    return PlantImage(
-        url=db_image.url,
-        description=db_image.description,
-        taken_date=db_image.taken_date
+    # Thumbnails and WebP/AVIF copies are rendered after the response is sent
+    variant_urls = {
+        name: str(request.url_for("get_image_file", key=variant_key(key, name)))
+        for name in VARIANTS
+    }
+    background_tasks.add_task(generate_variants, db_image.id, key, variant_urls, storage, db.bind)
+    
+    return plant_image_response(db_image)
+
+@router.get("/files/{key:path}", name="get_image_file")
+async def get_image_file(
+    key: str,
+    range: str = Header(None),
+    if_none_match: str = Header(None),
+    storage: StorageBackend = Depends(get_storage)
+):
+    stored = await storage.stat(key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # Keys are never reused, so the key itself identifies the content
+    etag = f'"{key}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMAGE_CACHE_CONTROL,
+        "ETag": etag,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if not is_image_type(stored.content_type):
+        # Anything but an image (e.g. stored before uploads were checked) is
+        # downloaded rather than rendered from the app's origin
+        headers["Content-Disposition"] = "attachment"
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        byte_range = parse_byte_range(range, stored.size)
+    except RangeNotSatisfiable:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{stored.size}"}
+        )
+    
+    status_code = 200
+    start, end = 0, stored.size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{stored.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    
+    return StreamingResponse(
+        storage.read(key, start, end),
+        status_code=status_code,
+        media_type=stored.content_type,
+        headers=headers
     )
 
 @router.post("/scan-barcode")
 async def scan_barcode(file: UploadFile = File(...)) -> BarcodeData:
     contents = await file.read()
-    image = Image.open(io.BytesIO(contents))
-    barcodes = decode(image)
+    
+    # Repeat uploads of the same photo are answered from the cache
+    key = content_key(contents)
+    barcodes = barcode_cache.get(key)
+    if barcodes is None:
+        try:
+            barcodes = await barcode_pool.decode(contents)
+        except DecoderBusy:
+            raise HTTPException(
+                status_code=503,
+                detail="Barcode scanner is busy, please retry shortly",
+                headers={"Retry-After": str(BARCODE_RETRY_AFTER)}
+            )
+        except DecodeTimeout:
+            raise HTTPException(status_code=504, detail="Barcode decoding timed out")
+        barcode_cache.set(key, barcodes)
     
     if not barcodes:
         raise HTTPException(status_code=400, detail="No barcode found in image")
     
-    barcode = barcodes[0]
+    code, barcode_type = barcodes[0]
     return BarcodeData(
-        code=barcode.data.decode(),
-        type=barcode.type,
-    )
\ No newline at end of file
+        code=code,
+        type=barcode_type,
+    )
+
+@router.get("/scan-barcode/cache")
+async def get_barcode_cache_stats():
+    """Get hit/miss counters for the barcode scan result cache."""
+    return barcode_cache.stats()
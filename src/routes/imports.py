@@ -0,0 +1,232 @@
+from typing import AsyncIterator
+import codecs
+import csv
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..cache import stats_cache
+from ..database import get_async_db
+from ..models import DBGardenBed, DBHarvest, DBPlant, Harvest, Plant, PlantStatus
+from ..rollups import refresh_rollups
+from ..units import to_pounds
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+# Rows per multi-row INSERT, and harvest rows per plant lookup
+IMPORT_BATCH_SIZE = 1000
+
+# Row errors reported back; the total count is always given
+IMPORT_MAX_ERRORS = 100
+
+# Imported history may include finished plants, unlike POST .../harvests
+HARVESTABLE_STATUSES = {PlantStatus.FLOWERING.value, PlantStatus.HARVESTING.value, PlantStatus.FINISHED.value}
+
+class ImportErrors:
+    """Row errors collected while validating an import."""
+    def __init__(self):
+        self.count = 0
+        self.errors: list[dict] = []
+
+    def add(self, row: int, field: str, message: str) -> None:
+        self.count += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "field": field, "message": message})
+
+    def add_validation_error(self, row: int, error: ValidationError) -> None:
+        for detail in error.errors():
+            self.add(row, ".".join(str(part) for part in detail["loc"]), detail["msg"])
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+class BatchInserter:
+    """Insert rows into ``table`` with one multi-row INSERT per batch, keeping the new ids in order."""
+    def __init__(self, db: AsyncSession, table):
+        self.db = db
+        self.table = table
+        self.ids: list[int] = []
+        self._pending: list[dict] = []
+
+    async def add(self, values: dict) -> None:
+        self._pending.append(values)
+        if len(self._pending) >= IMPORT_BATCH_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        result = await self.db.execute(
+            insert(self.table).values(self._pending).returning(self.table.c.id)
+        )
+        self.ids.extend(result.scalars().all())
+        self._pending = []
+
+async def _csv_lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request body as it arrives and yield it line by line, newlines kept."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+async def _csv_rows(request: Request) -> AsyncIterator[tuple[int, dict]]:
+    """Yield (row number, values) for each CSV record; empty cells are left out so defaults apply."""
+    header = None
+    row_number = 0
+    record = ""
+    async for line in _csv_lines(request):
+        record += line
+        if record.count('"') % 2:
+            continue  # A quoted value spans lines
+        fields = next(csv.reader([record]), [])
+        record = ""
+        if not any(field.strip() for field in fields):
+            continue
+        if header is None:
+            header = [field.strip() for field in fields]
+            continue
+        row_number += 1
+        yield row_number, {name: value for name, value in zip(header, fields) if value != ""}
+
+async def _import_rows(request: Request) -> AsyncIterator[tuple[int, object]]:
+    """Yield (row number, values) from a JSON array body or a streamed ``text/csv`` body."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        async for row in _csv_rows(request):
+            yield row
+        return
+
+    try:
+        rows = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or text/csv")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or text/csv")
+    for row_number, row in enumerate(rows, 1):
+        yield row_number, row
+
+def _location_bed_id(location: str) -> int | None:
+    try:
+        return int(location.split()[1])
+    except (IndexError, ValueError):
+        return None
+
+async def _finish(db: AsyncSession, errors: ImportErrors, inserter: BatchInserter, keys: set) -> dict:
+    """Roll back and report the row errors, or refresh the rollups and commit the import."""
+    if errors:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail={
+            "message": "Nothing was imported; fix these rows and retry",
+            "error_count": errors.count,
+            "errors": errors.errors
+        })
+    await refresh_rollups(db, keys)
+    await db.commit()
+    if keys:
+        stats_cache.invalidate(years={year for year, _ in keys}, bed_ids={bed_id for _, bed_id in keys})
+    return {"imported": len(inserter.ids), "ids": inserter.ids}
+
+@router.post("/plants")
+async def import_plants(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
+    """Create many plants in one transaction from a JSON array or a CSV body.
+
+    Rows take the same fields as ``POST /garden/plants``. Every row is
+    validated; if any fails, nothing is imported and the row errors are
+    returned with status 422. Otherwise the new plant ids are returned in
+    row order.
+    """
+    bed_ids = set((await db.execute(select(DBGardenBed.id))).scalars().all())
+    inserter = BatchInserter(db, DBPlant.__table__)
+    errors = ImportErrors()
+    keys = set()
+
+    async for row_number, row in _import_rows(request):
+        try:
+            plant = Plant.parse_obj(row)
+        except ValidationError as e:
+            errors.add_validation_error(row_number, e)
+            continue
+        bed_id = _location_bed_id(plant.location)
+        if bed_id not in bed_ids:
+            errors.add(row_number, "location", "Must be 'Bed N' where N is an existing garden bed ID")
+            continue
+        if errors:
+            continue  # Nothing will be committed; keep validating the remaining rows
+        await inserter.add({
+            "name": plant.name,
+            "variety": plant.variety,
+            "planting_date": plant.planting_date,
+            "bed_id": bed_id,
+            "status": plant.status.value,
+            "year": plant.year,
+            "quantity": plant.quantity,
+            "space_required": plant.space_required,
+            "expected_harvest_date": plant.expected_harvest_date,
+            "notes": plant.notes
+        })
+        keys.add((plant.year, bed_id))
+
+    await inserter.flush()
+    return await _finish(db, errors, inserter, keys)
+
+@router.post("/harvests")
+async def import_harvests(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
+    """Record many harvests in one transaction from a JSON array or a CSV body.
+
+    Rows take the same fields as ``POST /garden/plants/{id}/harvests``,
+    including ``plant_id``. Plants must be FLOWERING, HARVESTING or FINISHED;
+    flowering plants move to HARVESTING, as with a single harvest. Errors
+    are reported as for plant imports.
+    """
+    inserter = BatchInserter(db, DBHarvest.__table__)
+    errors = ImportErrors()
+    plants: dict[int, tuple] = {}  # plant id -> (year, bed_id, status)
+    pending: list[tuple[int, Harvest]] = []
+
+    async def add_pending() -> None:
+        missing = {harvest.plant_id for _, harvest in pending} - plants.keys()
+        if missing:
+            result = await db.execute(
+                select(DBPlant.id, DBPlant.year, DBPlant.bed_id, DBPlant.status).where(DBPlant.id.in_(missing))
+            )
+            plants.update({plant_id: (year, bed_id, status) for plant_id, year, bed_id, status in result.all()})
+        for row_number, harvest in pending:
+            plant = plants.get(harvest.plant_id)
+            if plant is None:
+                errors.add(row_number, "plant_id", "Plant not found")
+            elif plant[2] not in HARVESTABLE_STATUSES:
+                errors.add(row_number, "plant_id", f"Cannot record harvest for plant in {plant[2]} status")
+            elif not errors:
+                await inserter.add({
+                    "plant_id": harvest.plant_id,
+                    "harvest_date": harvest.harvest_date,
+                    "quantity": harvest.quantity,
+                    "unit": harvest.unit,
+                    "weight_lbs": to_pounds(harvest.quantity, harvest.unit),
+                    "notes": harvest.notes
+                })
+        pending.clear()
+
+    async for row_number, row in _import_rows(request):
+        try:
+            pending.append((row_number, Harvest.parse_obj(row)))
+        except ValidationError as e:
+            errors.add_validation_error(row_number, e)
+            continue
+        if len(pending) >= IMPORT_BATCH_SIZE:
+            await add_pending()
+
+    await add_pending()
+    await inserter.flush()
+    if not errors:
+        flowering = [plant_id for plant_id, plant in plants.items() if plant[2] == PlantStatus.FLOWERING.value]
+        if flowering:
+            await db.execute(
+                update(DBPlant).where(DBPlant.id.in_(flowering)).values(status=PlantStatus.HARVESTING.value)
+            )
+    return await _finish(db, errors, inserter, {(year, bed_id) for year, bed_id, _ in plants.values()})
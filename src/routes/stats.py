@@ -1,52 +1,38 @@
 from datetime import datetime
 from typing import Dict, List
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import distinct, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import distinct, select
 from fastapi.responses import JSONResponse
-import pandas as pd
-import plotly.express as px
-import numpy as np
-from ..models import GardenStats, PlantStatus, DBPlant, DBGardenBed, DBHarvest
-from ..database import get_db
+from ..models import GardenStats, PlantStatus, DBPlant, DBGardenBed, DBBedYearRollup, DBYearRollup
+from ..replica import get_cached_read_db
+from ..loaders import apply_profile
+from ..cache import stats_cache
+from ..aggregates import plant_rollup, quantity_by_status, quantity_by_year, total_quantity
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 @router.get("", response_model=GardenStats)
-def get_garden_stats(db: Session = Depends(get_db)) -> GardenStats:
-    all_plants = db.query(DBPlant).all()
-    
-    # Initialize counts for all statuses
-    status_counts = {status.value: 0 for status in PlantStatus}
-    season_counts = {"SPRING": 0, "SUMMER": 0, "FALL": 0, "WINTER": 0}
-    total_plants = 0
-    plants_by_year = {}
-    
-    # Count plants
-    for plant in all_plants:
-        if plant.status in status_counts:
-            status_counts[plant.status] += plant.quantity
-        total_plants += plant.quantity
-        plants_by_year[str(plant.year)] = plants_by_year.get(str(plant.year), 0) + plant.quantity
+async def get_garden_stats(db: AsyncSession = Depends(get_cached_read_db)) -> GardenStats:
+    return await stats_cache.get_or_compute_async(("stats",), lambda: _garden_stats(db))
+
+async def _garden_stats(db: AsyncSession) -> GardenStats:
+    rollup = await plant_rollup(db)
     
     return GardenStats(
-        total_plants=total_plants,
-        plants_by_status=status_counts,
-        plants_by_season=season_counts,
-        plants_by_year=plants_by_year
+        total_plants=total_quantity(rollup),
+        plants_by_status=quantity_by_status(rollup),
+        plants_by_season={"SPRING": 0, "SUMMER": 0, "FALL": 0, "WINTER": 0},
+        plants_by_year=quantity_by_year(rollup)
     )
 
 @router.get("/beds/{bed_id}")
-def get_bed_stats(
+async def get_bed_stats(
     bed_id: int,
     year: str | None = Query(default=None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_cached_read_db)
 ):
     """Get statistics for a specific garden bed."""
-    bed = db.query(DBGardenBed).filter(DBGardenBed.id == bed_id).first()
-    if not bed:
-        raise HTTPException(status_code=404, detail="Garden bed not found")
-    
     # Convert year to int if provided
     year_int = None
     if year and year.strip():
@@ -55,6 +41,31 @@ def get_bed_stats(
         except ValueError:
             raise HTTPException(status_code=422, detail="Year must be a valid integer")
     
+    return await stats_cache.get_or_compute_async(
+        ("beds", bed_id, year_int),
+        lambda: _bed_stats(db, bed_id, year_int),
+        years=[year_int] if year_int is not None else None,
+        bed_id=bed_id
+    )
+
+async def _bed_stats(db: AsyncSession, bed_id: int, year_int: int | None) -> dict:
+    result = await db.execute(
+        apply_profile(select(DBGardenBed), "bed_stats")
+        .where(DBGardenBed.id == bed_id)
+    )
+    bed = result.scalars().first()
+    if not bed:
+        raise HTTPException(status_code=404, detail="Garden bed not found")
+    
+    # If year filter is applied, only count plants from that year
+    plants = [
+        plant for plant in bed.plants
+        if year_int is None or plant.year == year_int
+    ]
+    return _bed_summary(bed, plants)
+
+def _bed_summary(bed: DBGardenBed, plants: List[DBPlant]) -> dict:
+    """Summarize plant counts and space usage for a bed from already-loaded plants."""
     # Initialize counts
     total_plants = 0
     total_space_used = 0  # in square inches
@@ -63,11 +74,7 @@ def get_bed_stats(
     plants_by_year = {}
     
     # Count plants in this bed
-    for plant in bed.plants:
-        # If year filter is applied, only count plants from that year
-        if year_int is not None and plant.year != year_int:
-            continue
-            
+    for plant in plants:
         total_plants += plant.quantity
         total_space_used += plant.quantity * plant.space_required
         plants_by_status[plant.status] += plant.quantity
@@ -96,32 +103,25 @@ def get_bed_stats(
     }
 
 @router.get("/charts/plants-by-year")
-def get_plants_by_year_chart(db: Session = Depends(get_db)):
+async def get_plants_by_year_chart(db: AsyncSession = Depends(get_cached_read_db)):
     """Get a chart showing plant distribution by year"""
-    plants = db.query(DBPlant).all()
-    
-    # Count plants by year
-    year_counts = {}
-    for plant in plants:
-        if plant.year:
-            year_counts[str(plant.year)] = year_counts.get(str(plant.year), 0) + plant.quantity
-    
-    # Create dataframe
-    df = pd.DataFrame([
-        {"year": year, "count": count} 
-        for year, count in year_counts.items()
-    ])
-    
-    if df.empty:
-        current_year = str(datetime.now().year)
-        df = pd.DataFrame([{"year": current_year, "count": 0}])
+    chart_data = await stats_cache.get_or_compute_async(
+        ("charts/plants-by-year",),
+        lambda: _plants_by_year_chart(db)
+    )
+    return JSONResponse(content=chart_data)
+
+async def _plants_by_year_chart(db: AsyncSession) -> dict:
+    year_counts = quantity_by_year(await plant_rollup(db), include_unknown=False)
+    if not year_counts:
+        year_counts = {str(datetime.now().year): 0}
     
     # Create chart data directly instead of using plotly
     chart_data = {
         "data": [
             {
-                "x": df["year"].tolist(),
-                "y": df["count"].tolist(),
+                "x": list(year_counts),
+                "y": list(year_counts.values()),
                 "type": "bar",
                 "name": "Plants"
             }
@@ -138,27 +138,19 @@ def get_plants_by_year_chart(db: Session = Depends(get_db)):
         }
     }
     
-    return JSONResponse(content=chart_data)
+    return chart_data
 
 @router.get("/charts/plants-by-season")
-def get_plants_by_season_chart(db: Session = Depends(get_db)):
+async def get_plants_by_season_chart():
     """Get a chart showing plant distribution by season."""
-    plants = db.query(DBPlant).all()
-    
     # Initialize counts for all seasons
     season_counts = {"SPRING": 0, "SUMMER": 0, "FALL": 0, "WINTER": 0}
     
-    # Create dataframe for the chart
-    df = pd.DataFrame([
-        {"season": season, "count": count}
-        for season, count in season_counts.items()
-    ])
-    
     # Create chart data directly
     chart_data = {
         "data": [{
-            "x": df["season"].tolist(),
-            "y": df["count"].tolist(),
+            "x": list(season_counts),
+            "y": list(season_counts.values()),
             "type": "bar",
             "name": "Plants"
         }],
@@ -177,20 +169,24 @@ def get_plants_by_season_chart(db: Session = Depends(get_db)):
     return chart_data
 
 @router.get("/years")
-def get_available_years(db: Session = Depends(get_db)):
+async def get_available_years(db: AsyncSession = Depends(get_cached_read_db)):
     """Get list of years that have plants, plus current and next year"""
+    return await stats_cache.get_or_compute_async(("years",), lambda: _available_years(db))
+
+async def _available_years(db: AsyncSession) -> list[int]:
     current_year = datetime.now().year
     
     # First check if there are any garden beds at all
-    if not db.query(DBGardenBed).first():
+    if (await db.execute(select(DBGardenBed.id).limit(1))).first() is None:
         return sorted([current_year, current_year + 1], reverse=True)
     
     # Get years from plants that belong to existing beds
-    years = db.query(distinct(DBPlant.year)).\
-        join(DBGardenBed).\
-        filter(DBPlant.bed_id == DBGardenBed.id).\
-        filter(DBPlant.year.isnot(None)).\
-        all()
+    years = (await db.execute(
+        select(distinct(DBPlant.year))
+        .join(DBGardenBed)
+        .where(DBPlant.bed_id == DBGardenBed.id)
+        .where(DBPlant.year.isnot(None))
+    )).all()
     # Convert from list of tuples to list of integers, excluding None values
     plant_years = [year[0] for year in years if year[0] is not None]
     
@@ -201,88 +197,58 @@ def get_available_years(db: Session = Depends(get_db)):
     
     return sorted(result, reverse=True)
 
-def _convert_numpy(obj):
-    """Convert numpy types to Python native types for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: _convert_numpy(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_numpy(x) for x in obj]
-    elif isinstance(obj, (np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    return obj
-
 @router.get("/metrics")
-def get_metrics(year: int = Query(default=None), db: Session = Depends(get_db)):
+async def get_metrics(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
     """Get key metrics for the dashboard."""
     current_year = datetime.now().year
     year = year or current_year
-    
-    # Get current year stats
-    curr_plants = db.query(DBPlant).filter(DBPlant.year == year).all()
-    curr_total = sum(p.quantity for p in curr_plants)
-    
-    # Get previous year stats for trends
-    prev_plants = db.query(DBPlant).filter(DBPlant.year == year - 1).all()
-    prev_total = sum(p.quantity for p in prev_plants)
-    
-    # Calculate active plants (not FINISHED)
-    active_plants = sum(p.quantity for p in curr_plants if p.status != PlantStatus.FINISHED.value)
-    
-    # Get harvest stats with proper joins and filters, handle harvest_date
-    curr_harvests = (
-        db.query(DBHarvest)
-        .join(DBPlant)
-        .filter(DBPlant.year == year)
-        .filter(DBHarvest.harvest_date.isnot(None))
-        .all()
-    )
-    curr_harvests_count = len(curr_harvests)
-    
-    prev_harvests = (
-        db.query(DBHarvest)
-        .join(DBPlant)
-        .filter(DBPlant.year == year - 1)
-        .filter(DBHarvest.harvest_date.isnot(None))
-        .all()
+    return await stats_cache.get_or_compute_async(
+        ("metrics", year),
+        lambda: _metrics(db, year),
+        years=[year, year - 1]
     )
-    prev_harvests_count = len(prev_harvests)
 
-    # Calculate trends
-    plants_trend = ((curr_total - prev_total) / prev_total * 100) if prev_total else 0
-    harvest_trend = ((curr_harvests_count - prev_harvests_count) / prev_harvests_count * 100) if prev_harvests_count else 0
+async def _metrics(db: AsyncSession, year: int) -> dict:
+    # Current and previous year totals come straight from the rollup tables
+    result = await db.execute(select(DBYearRollup).where(DBYearRollup.year.in_([year, year - 1])))
+    rollups = {row.year: row for row in result.scalars().all()}
+    
+    # Space utilization is measured against the beds planted in each year
+    result = await db.execute(
+        select(DBBedYearRollup.year, DBGardenBed.dimensions)
+        .join(DBGardenBed, DBGardenBed.id == DBBedYearRollup.bed_id)
+        .where(DBBedYearRollup.year.in_([year, year - 1]), DBBedYearRollup.plants_total > 0)
+    )
+    bed_space = {year: 0, year - 1: 0}
+    for bed_year, dimensions in result.all():
+        width, length = dimensions.split('x')
+        bed_space[bed_year] += int(width) * int(length)
     
-    # Calculate space utilization
-    curr_beds = (db.query(DBGardenBed)
-                 .join(DBPlant)
-                 .filter(DBPlant.year == year)
-                 .distinct()
-                 .all())
-    prev_beds = (db.query(DBGardenBed)
-                 .join(DBPlant)
-                 .filter(DBPlant.year == year - 1)
-                 .distinct()
-                 .all())
-    
-    def calculate_space_usage(plants, beds):
-        total_space = sum(
-            int(bed.dimensions.split('x')[0]) * int(bed.dimensions.split('x')[1])
-            for bed in beds
-        ) if beds else 0
-        used_space = sum(p.space_required * p.quantity for p in plants if p.space_required)
-        return used_space, total_space
+    return _metrics_summary(rollups.get(year), rollups.get(year - 1), bed_space[year], bed_space[year - 1])
+
+def _metrics_summary(
+    curr: DBYearRollup | None,
+    prev: DBYearRollup | None,
+    curr_total_space: int,
+    prev_total_space: int
+) -> dict:
+    """Build the dashboard key metrics from two years of rollup totals."""
+    def total(rollup: DBYearRollup | None, column: str):
+        return getattr(rollup, column) if rollup is not None else 0
+    
+    curr_total = total(curr, "plants_total")
+    prev_total = total(prev, "plants_total")
+    curr_harvests_count = total(curr, "harvest_count")
+    prev_harvests_count = total(prev, "harvest_count")
     
-    curr_used, curr_total_space = calculate_space_usage(curr_plants, curr_beds)
-    prev_used, prev_total_space = calculate_space_usage(prev_plants, prev_beds)
+    # Calculate active plants (not FINISHED)
+    active_plants = curr_total - total(curr, "plants_finished")
     
     # Calculate trends
     plants_trend = ((curr_total - prev_total) / prev_total * 100) if prev_total else 0
     harvest_trend = ((curr_harvests_count - prev_harvests_count) / prev_harvests_count * 100) if prev_harvests_count else 0
-    curr_util = (curr_used / curr_total_space * 100) if curr_total_space else 0
-    prev_util = (prev_used / prev_total_space * 100) if prev_total_space else 0
+    curr_util = (total(curr, "space_used") / curr_total_space * 100) if curr_total_space else 0
+    prev_util = (total(prev, "space_used") / prev_total_space * 100) if prev_total_space else 0
     space_trend = curr_util - prev_util if prev_total_space else 0
     
     return {
@@ -297,18 +263,22 @@ def get_metrics(year: int = Query(default=None), db: Session = Depends(get_db)):
     }
 
 @router.get("/charts/status")
-def get_status_chart(year: int = Query(default=None), db: Session = Depends(get_db)):
+async def get_status_chart(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
     """Get plant lifecycle distribution chart data."""
     year = year or datetime.now().year
     
     # Count plants by status
-    plants = db.query(DBPlant).filter(DBPlant.year == year).all()
-    status_counts = {status.value: 0 for status in PlantStatus}
-    
-    for plant in plants:
-        if plant.status in status_counts:
-            status_counts[plant.status] += plant.quantity
-    
+    return await stats_cache.get_or_compute_async(
+        ("charts/status", year),
+        lambda: _status_chart_for_year(db, year),
+        years=[year]
+    )
+
+async def _status_chart_for_year(db: AsyncSession, year: int) -> dict:
+    return _status_chart(quantity_by_status(await plant_rollup(db, year=year)))
+
+def _status_chart(status_counts: Dict[str, int]) -> dict:
+    """Build the lifecycle pie chart from per-status plant counts."""
     # Filter out statuses with 0 plants
     status_data = {k: v for k, v in status_counts.items() if v > 0}
     
@@ -338,55 +308,46 @@ def get_status_chart(year: int = Query(default=None), db: Session = Depends(get_
     return chart_data
 
 @router.get("/charts/harvests")
-def get_harvest_timeline(year: int = Query(default=None), db: Session = Depends(get_db)):
+async def get_harvest_timeline(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
     """Get harvest timeline chart data."""
     year = year or datetime.now().year
     
-    # Get all harvests for the year with plant info
-    harvests = db.query(
-        DBHarvest, 
-        DBPlant.name.label('plant_name')
-    ).join(DBPlant).filter(
-        DBPlant.year == year
-    ).all()
-    
-    # Create timeline data
-    timeline_data = {}
-    for harvest, plant_name in harvests:
-        month = harvest.harvest_date.strftime('%Y-%m')
-        timeline_data.setdefault(month, {})
-        
-        # Normalize all harvests to pounds for consistency
-        quantity = harvest.quantity
-        if harvest.unit == 'oz':
-            quantity = quantity / 16
-        elif harvest.unit == 'g':
-            quantity = quantity / 453.592
-        elif harvest.unit == 'kg':
-            quantity = quantity * 2.20462
-        
-        timeline_data[month][plant_name] = timeline_data[month].get(plant_name, 0) + quantity
-    
-    # Convert to plotly format
-    months = sorted(timeline_data.keys())
-    plants = sorted(set(plant for month_data in timeline_data.values() for plant in month_data.keys()))
+    return await stats_cache.get_or_compute_async(
+        ("charts/harvests", year),
+        lambda: _harvest_timeline_for_year(db, year),
+        years=[year]
+    )
+
+def _analytics():
+    """The analytics module, imported on first use so NumPy stays out of startup."""
+    from .. import analytics
+    return analytics
+
+async def _plants_for_year(db: AsyncSession, year: int) -> List[DBPlant]:
+    result = await db.execute(select(DBPlant).where(DBPlant.year == year))
+    return result.scalars().all()
+
+async def _harvest_timeline_for_year(db: AsyncSession, year: int) -> dict:
+    return _harvest_timeline_chart(await _analytics().load_harvest_weights(db, year))
+
+def _harvest_timeline_chart(harvests) -> dict:
+    """Build the monthly harvest timeline from a year's analytics.HarvestWeights."""
+    months, plants, weights = _analytics().monthly_timeline(harvests)
     
     # If no data, create empty chart with current month
     if not months:
-        current_month = datetime.now().strftime('%Y-%m')
-        months = [current_month]
-        plants = []
+        months = [datetime.now().strftime('%Y-%m')]
     
-    traces = []
-    for plant in plants:
-        trace = {
+    traces = [
+        {
             "x": months,
-            "y": [timeline_data.get(month, {}).get(plant, 0) for month in months],
+            "y": plant_weights,
             "name": plant,
             "type": "scatter",
             "mode": "lines+markers"
         }
-        traces.append(trace)
+        for plant, plant_weights in zip(plants, weights)
+    ]
     
     # Always return at least one trace for empty data
     if not traces:
@@ -413,50 +374,37 @@ def get_harvest_timeline(year: int = Query(default=None), db: Session = Depends(
     return chart_data
 
 @router.get("/charts/success-rate")
-def get_success_rate_chart(year: int = Query(default=None), db: Session = Depends(get_db)):
+async def get_success_rate_chart(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
     """Get plant success rate chart data."""
     year = year or datetime.now().year
     
     # Get all plants for the year
-    plants = db.query(DBPlant).filter(DBPlant.year == year).all()
-    
-    # Group plants by name
-    plant_stats = {}
-    for plant in plants:
-        if plant.name not in plant_stats:
-            plant_stats[plant.name] = {"total": 0, "success": 0}
-        
-        plant_stats[plant.name]["total"] += plant.quantity
-        if plant.status in [PlantStatus.HARVESTING.value, PlantStatus.FINISHED.value]:
-            plant_stats[plant.name]["success"] += plant.quantity
-    
-    # Calculate success rates
-    success_rates = [
-        {
-            "name": name,
-            "rate": (stats["success"] / stats["total"] * 100) if stats["total"] > 0 else 0,
-            "total": stats["total"]
-        }
-        for name, stats in plant_stats.items()
-        if stats["total"] >= 5  # Only show plants with meaningful sample size
-    ]
-    
-    # Sort by success rate
-    success_rates.sort(key=lambda x: x["rate"], reverse=True)
+    return await stats_cache.get_or_compute_async(
+        ("charts/success-rate", year),
+        lambda: _success_rate_for_year(db, year),
+        years=[year]
+    )
+
+async def _success_rate_for_year(db: AsyncSession, year: int) -> dict:
+    return _success_rate_chart(await _analytics().load_plants(db, year))
+
+def _success_rate_chart(plants) -> dict:
+    """Build the success rate chart from a year's analytics.PlantColumns."""
+    names, rates, totals = _analytics().success_rates(plants)
     
     chart_data = {
         "data": [{
-            "x": [item["name"] for item in success_rates],
-            "y": [item["rate"] for item in success_rates],
+            "x": names,
+            "y": rates,
             "type": "bar",
-            "text": [f"{item['rate']:.1f}%<br>({item['total']} plants)" for item in success_rates],
+            "text": [f"{rate:.1f}%<br>({total} plants)" for rate, total in zip(rates, totals)],
             "textposition": "auto",
             "marker": {
                 "color": [
-                    "success" if rate["rate"] >= 80 else
-                    "warning" if rate["rate"] >= 60 else
+                    "success" if rate >= 80 else
+                    "warning" if rate >= 60 else
                     "danger"
-                    for rate in success_rates
+                    for rate in rates
                 ]
             }
         }],
@@ -475,41 +423,29 @@ def get_success_rate_chart(year: int = Query(default=None), db: Session = Depend
     return chart_data
 
 @router.get("/charts/top-producers")
-def get_top_producers_chart(year: int = Query(default=None), db: Session = Depends(get_db)):
+async def get_top_producers_chart(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
     """Get chart data for top producing plants."""
     year = year or datetime.now().year
 
-    def convert_to_lbs(quantity: float, unit: str) -> float:
-        conversions = {
-            "lbs": 1,
-            "oz": 1/16,
-            "g": 0.00220462,
-            "kg": 2.20462
-        }
-        return quantity * conversions.get(unit, 1)
+    return await stats_cache.get_or_compute_async(
+        ("charts/top-producers", year),
+        lambda: _top_producers_for_year(db, year),
+        years=[year]
+    )
 
-    # Get all plants with harvests for the year with eager loading
-    plants = (db.query(DBPlant)
-            .options(joinedload(DBPlant.harvests))
-            .filter(DBPlant.year == year)
-            .all())
+async def _top_producers_for_year(db: AsyncSession, year: int) -> dict:
+    analytics = _analytics()
+    return _top_producers_chart(
+        await analytics.load_plants(db, year),
+        await analytics.load_harvest_weights(db, year)
+    )
 
-    # Group and sum harvests by plant name
-    plant_totals = {}
-    
-    # First collect all plant names, even those without harvests
-    for plant in plants:
-        if plant.name not in plant_totals:
-            plant_totals[plant.name] = 0
-        
-        # Add up harvests if any exist
-        if plant.harvests:
-            plant_totals[plant.name] += sum(
-                convert_to_lbs(h.quantity, h.unit) 
-                for h in plant.harvests
-            )
-
-    if not plant_totals:
+def _top_producers_chart(plants, harvests) -> dict:
+    """Build the top producers chart from a year's analytics.PlantColumns and HarvestWeights."""
+    # Every plant type of the year is listed, even those without harvests
+    plant_names, plant_weights = _analytics().producer_totals(plants, harvests)
+
+    if not plant_names:
         return {
             "data": [{
                 "x": ["No harvests"],
@@ -520,11 +456,6 @@ def get_top_producers_chart(year: int = Query(default=None), db: Session = Depen
             }]
         }
 
-    # Sort by total weight and format for chart
-    sorted_plants = sorted(plant_totals.items(), key=lambda x: x[1], reverse=True)
-    plant_names = [plant[0] for plant in sorted_plants]
-    plant_weights = [plant[1] for plant in sorted_plants]
-
     return {
         "data": [{
             "x": plant_names,
@@ -533,4 +464,52 @@ def get_top_producers_chart(year: int = Query(default=None), db: Session = Depen
             "text": [f"{weight:.2f} lbs" for weight in plant_weights],
             "textposition": "auto"
         }]
-    }
\ No newline at end of file
+    }
+
+@router.get("/dashboard")
+async def get_dashboard(year: int = Query(default=None), db: AsyncSession = Depends(get_cached_read_db)):
+    """Get every stats page payload for a year in a single response.
+    
+    The year's plants, its monthly harvest weights and the beds are loaded
+    once and the charts and per-bed summaries are built from that shared
+    working set. The key metrics, including the comparison with the previous
+    year, are read from the year and bed rollup tables, so no previous-year
+    plants are loaded.
+    """
+    year = year or datetime.now().year
+    return await stats_cache.get_or_compute_async(
+        ("dashboard", year),
+        lambda: _dashboard(db, year),
+        years=[year, year - 1]
+    )
+
+async def _dashboard(db: AsyncSession, year: int) -> dict:
+    analytics = _analytics()
+    curr_plants = await _plants_for_year(db, year)
+    plant_columns = analytics.PlantColumns.from_plants(curr_plants)
+    curr_weights = await analytics.load_harvest_weights(db, year)
+    beds = (await db.execute(select(DBGardenBed).order_by(DBGardenBed.id))).scalars().all()
+    
+    plants_by_bed: Dict[int, List[DBPlant]] = {}
+    for plant in curr_plants:
+        plants_by_bed.setdefault(plant.bed_id, []).append(plant)
+    
+    return {
+        "year": year,
+        "metrics": await _metrics(db, year),
+        "charts": {
+            "status": _status_chart(quantity_by_status(curr_plants)),
+            "harvests": _harvest_timeline_chart(curr_weights),
+            "success_rate": _success_rate_chart(plant_columns),
+            "top_producers": _top_producers_chart(plant_columns, curr_weights)
+        },
+        "beds": [
+            {"id": bed.id, **_bed_summary(bed, plants_by_bed.get(bed.id, []))}
+            for bed in beds
+        ]
+    }
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get hit/miss counters for the stats response cache."""
+    return stats_cache.stats()
@@ -0,0 +1,301 @@
+"""Pluggable storage for uploaded plant images.
+
+Uploads are written through a StorageBackend chunk by chunk, so an image is
+never held in memory in full, and read back in chunks for an optional byte
+range. The local filesystem backend is the default; the S3 backend works with
+AWS or any S3-compatible server such as MinIO and needs ``boto3`` installed
+(the ``s3`` extra).
+
+Stored keys are never reused, so served files can be cached indefinitely.
+Only the image types in IMAGE_TYPES are accepted, and a key's extension
+comes from its content type, never from the client's filename, so nothing
+stored can be served back as HTML or script.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, NamedTuple, Optional
+import mimetypes
+import os
+import uuid
+import aiofiles
+import aiofiles.os
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+IMAGE_STORAGE = os.getenv("IMAGE_STORAGE", "local")
+IMAGE_STORAGE_PATH = os.getenv("IMAGE_STORAGE_PATH", "data/images")
+IMAGE_S3_BUCKET = os.getenv("IMAGE_S3_BUCKET", "garden-images")
+IMAGE_S3_ENDPOINT_URL = os.getenv("IMAGE_S3_ENDPOINT_URL")  # e.g. http://minio:9000
+IMAGE_S3_REGION = os.getenv("IMAGE_S3_REGION")
+
+CHUNK_SIZE = 64 * 1024
+S3_PART_SIZE = 8 * 1024 * 1024  # S3 multipart parts must be at least 5 MiB
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Accepted upload content type -> stored file extension
+IMAGE_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/heic": "heic",
+    "image/avif": "avif",
+}
+_EXTENSION_TYPES = {extension: content_type for content_type, extension in IMAGE_TYPES.items()}
+
+
+class StoredObject(NamedTuple):
+    size: int
+    content_type: str
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header asks for bytes outside the stored object."""
+
+
+class UnsupportedImageType(Exception):
+    """Raised when an upload's content type is not one of IMAGE_TYPES."""
+
+
+def _guess_type(key: str) -> str:
+    extension = os.path.splitext(key)[1][1:].lower()
+    return _EXTENSION_TYPES.get(extension) or mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+def is_image_type(content_type: str | None) -> bool:
+    """Whether ``content_type`` is safe to serve inline from the app's origin."""
+    return (content_type or "").split(";")[0].strip().lower() in IMAGE_TYPES
+
+
+def new_image_key(plant_id: int, content_type: str | None) -> str:
+    """Build a fresh storage key for an image uploaded to ``plant_id``.
+
+    Raises UnsupportedImageType unless ``content_type`` is one of IMAGE_TYPES.
+    """
+    extension = IMAGE_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if extension is None:
+        raise UnsupportedImageType(content_type)
+    return f"plants/{plant_id}/{uuid.uuid4().hex}.{extension}"
+
+
+def parse_byte_range(header: str | None, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single ``bytes=`` Range header into an inclusive (start, end) pair.
+
+    Returns None when the whole object should be sent: no header, a header we
+    do not understand, or a multi-range request. Raises RangeNotSatisfiable
+    when the range starts past the end of the object.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            suffix = int(end_text)  # bytes=-N asks for the last N bytes
+            if suffix == 0:
+                raise RangeNotSatisfiable()
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class StorageBackend(ABC):
+    """Interface implemented by every image store."""
+
+    @abstractmethod
+    async def save(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None = None
+    ) -> int:
+        """Write ``chunks`` under ``key`` and return the number of bytes stored."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Return the size and content type stored under ``key``, or None if missing."""
+
+    @abstractmethod
+    def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Yield the bytes of ``key`` from ``start`` to ``end`` inclusive."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove ``key``; a missing key is not an error."""
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str = IMAGE_STORAGE_PATH):
+        self.root = os.path.realpath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise FileNotFoundError(key)  # Keys may not escape the storage root
+        return path
+
+    async def save(self, key, chunks, content_type=None):
+        path = self._path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the target and rename, so readers never see a partial file
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        size = 0
+        try:
+            async with aiofiles.open(partial, "wb") as out:
+                async for chunk in chunks:
+                    await out.write(chunk)
+                    size += len(chunk)
+            await aiofiles.os.replace(partial, path)
+        except BaseException:
+            if await aiofiles.os.path.exists(partial):
+                await aiofiles.os.remove(partial)
+            raise
+        return size
+
+    async def stat(self, key):
+        try:
+            path = self._path(key)
+            result = await aiofiles.os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not os.path.isfile(path):
+            return None
+        return StoredObject(result.st_size, _guess_type(key))
+
+    async def read(self, key, start, end):
+        remaining = end - start + 1
+        async with aiofiles.open(self._path(key), "rb") as source:
+            await source.seek(start)
+            while remaining > 0:
+                chunk = await source.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    async def delete(self, key):
+        try:
+            await aiofiles.os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage(StorageBackend):
+    """Store images in an S3 bucket; boto3's blocking calls run in the threadpool."""
+
+    def __init__(
+        self,
+        bucket: str = IMAGE_S3_BUCKET,
+        endpoint_url: str | None = IMAGE_S3_ENDPOINT_URL,
+        region: str | None = IMAGE_S3_REGION,
+        part_size: int = S3_PART_SIZE,
+        client: Any = None
+    ):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("IMAGE_STORAGE=s3 requires boto3 (pip install boto3)") from None
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.bucket = bucket
+        self.part_size = part_size
+        self._client = client
+        self._client_error = client.exceptions.ClientError
+
+    async def save(self, key, chunks, content_type=None):
+        content_type = content_type or _guess_type(key)
+        buffer = bytearray()
+        parts = []
+        upload_id = None
+        size = 0
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) < self.part_size:
+                    continue
+                # Only switch to a multipart upload once the image outgrows one part
+                if upload_id is None:
+                    upload = await run_in_threadpool(
+                        self._client.create_multipart_upload,
+                        Bucket=self.bucket, Key=key, ContentType=content_type
+                    )
+                    upload_id = upload["UploadId"]
+                parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+                buffer.clear()
+
+            if upload_id is None:
+                await run_in_threadpool(
+                    self._client.put_object,
+                    Bucket=self.bucket, Key=key, Body=bytes(buffer), ContentType=content_type
+                )
+                return size
+            if buffer:
+                parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+            await run_in_threadpool(
+                self._client.complete_multipart_upload,
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            if upload_id is not None:
+                await run_in_threadpool(
+                    self._client.abort_multipart_upload,
+                    Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            raise
+        return size
+
+    async def _upload_part(self, key: str, upload_id: str, number: int, body: bytes) -> dict:
+        response = await run_in_threadpool(
+            self._client.upload_part,
+            Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body
+        )
+        return {"ETag": response["ETag"], "PartNumber": number}
+
+    async def stat(self, key):
+        try:
+            head = await run_in_threadpool(self._client.head_object, Bucket=self.bucket, Key=key)
+        except self._client_error as error:
+            if error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(head["ContentLength"], head.get("ContentType") or _guess_type(key))
+
+    async def read(self, key, start, end):
+        response = await run_in_threadpool(
+            self._client.get_object,
+            Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            async for chunk in iterate_in_threadpool(body.iter_chunks(CHUNK_SIZE)):
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key):
+        await run_in_threadpool(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+
+def storage_from_env() -> StorageBackend:
+    if IMAGE_STORAGE == "local":
+        return LocalStorage()
+    if IMAGE_STORAGE == "s3":
+        return S3Storage()
+    raise ValueError(f"Unknown IMAGE_STORAGE backend: {IMAGE_STORAGE}")
+
+
+_storage: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    """FastAPI dependency returning the configured storage backend."""
+    global _storage
+    if _storage is None:
+        _storage = storage_from_env()
+    return _storage
@@ -0,0 +1,57 @@
+"""Canonical harvest units and their conversion to pounds.
+
+Harvests are recorded in whatever unit the gardener picked. Each harvest
+also stores its quantity in pounds (``DBHarvest.weight_lbs``), computed with
+``to_pounds`` when it is written, so weight totals are plain SQL sums.
+Quantities in count units (pieces, bunches, heads...) have no known weight
+and count as-is, as the charts always have.
+"""
+from sqlalchemy import case, func
+
+GRAMS_PER_POUND = 453.59237
+
+# Canonical unit -> pounds per unit
+POUNDS_PER_UNIT = {
+    "lbs": 1.0,
+    "oz": 1 / 16,
+    "g": 1 / GRAMS_PER_POUND,
+    "kg": 1000 / GRAMS_PER_POUND,
+}
+
+# Spellings accepted for each canonical unit, compared case-insensitively
+UNIT_ALIASES = {
+    "lb": "lbs",
+    "pound": "lbs",
+    "pounds": "lbs",
+    "ounce": "oz",
+    "ounces": "oz",
+    "gram": "g",
+    "grams": "g",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "kgs": "kg",
+}
+
+
+def canonical_unit(unit: str | None) -> str | None:
+    """The canonical name of a weight unit, or None for count and unknown units."""
+    if unit is None:
+        return None
+    name = unit.strip().lower()
+    name = UNIT_ALIASES.get(name, name)
+    return name if name in POUNDS_PER_UNIT else None
+
+
+def to_pounds(quantity: float, unit: str | None) -> float:
+    unit = canonical_unit(unit)
+    return quantity * (POUNDS_PER_UNIT[unit] if unit else 1.0)
+
+
+def pounds_expression(quantity, unit):
+    """SQL expression converting ``quantity`` in ``unit`` to pounds, matching to_pounds."""
+    name = func.lower(func.trim(unit))
+    spellings = {**{canonical: canonical for canonical in POUNDS_PER_UNIT}, **UNIT_ALIASES}
+    return quantity * case(
+        *[(name == spelling, POUNDS_PER_UNIT[canonical]) for spelling, canonical in spellings.items()],
+        else_=1.0
+    )
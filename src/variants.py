@@ -0,0 +1,151 @@
+"""Thumbnail and responsive variants for uploaded plant images.
+
+After an upload is stored, a background task reads the original back,
+renders the variants in a worker process and records their URLs on the
+image row. List views then use a small thumbnail instead of the original.
+AVIF support is optional: without ``pillow-avif-plugin`` (or a Pillow
+built with AVIF) the AVIF variants are skipped and only JPEG and WebP are
+rendered.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import posixpath
+from PIL import Image, ImageOps
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from .models import DBPlantImage
+from .storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "1"))
+
+THUMBNAIL_SIZE = 96  # Square crop, twice the 48px list thumbnail
+MEDIUM_SIZE = 1024  # Longest side for detail views
+
+# Variant name -> (size, image format, content type, file extension)
+VARIANTS = {
+    "thumb_jpeg": (THUMBNAIL_SIZE, "JPEG", "image/jpeg", "jpg"),
+    "thumb_webp": (THUMBNAIL_SIZE, "WEBP", "image/webp", "webp"),
+    "thumb_avif": (THUMBNAIL_SIZE, "AVIF", "image/avif", "avif"),
+    "medium_webp": (MEDIUM_SIZE, "WEBP", "image/webp", "webp"),
+    "medium_avif": (MEDIUM_SIZE, "AVIF", "image/avif", "avif"),
+}
+
+
+def variant_key(key: str, name: str) -> str:
+    """Storage key for variant ``name`` of the original stored under ``key``."""
+    extension = VARIANTS[name][3]
+    return f"{posixpath.splitext(key)[0]}/{name}.{extension}"
+
+
+def _can_save(image_format: str) -> bool:
+    if image_format == "AVIF":
+        try:
+            import pillow_avif  # noqa: F401 - registers the AVIF plugin
+        except ImportError:
+            pass
+    Image.init()
+    return image_format in Image.SAVE
+
+
+def render_variants(contents: bytes) -> dict[str, bytes]:
+    """Render every supported variant of an image, keyed by variant name.
+
+    Runs inside a worker process, so it only takes and returns picklable values.
+    """
+    with Image.open(io.BytesIO(contents)) as original:
+        image = ImageOps.exif_transpose(original)  # Phone photos are often stored rotated
+        image = image.convert("RGB")
+
+    thumbnail = ImageOps.fit(image, (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    medium = image.copy()
+    medium.thumbnail((MEDIUM_SIZE, MEDIUM_SIZE))
+
+    rendered = {}
+    for name, (size, image_format, _content_type, _extension) in VARIANTS.items():
+        if not _can_save(image_format):
+            continue
+        buffer = io.BytesIO()
+        source = thumbnail if size == THUMBNAIL_SIZE else medium
+        source.save(buffer, format=image_format, quality=80)
+        rendered[name] = buffer.getvalue()
+    return rendered
+
+
+class ImageVariantWorker:
+    def __init__(self, workers: int = IMAGE_VARIANT_WORKERS):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def render(self, contents: bytes) -> dict[str, bytes]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), render_variants, contents)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+async def _read_all(storage: StorageBackend, key: str) -> bytes | None:
+    stored = await storage.stat(key)
+    if stored is None:
+        return None
+    return b"".join([chunk async for chunk in storage.read(key, 0, stored.size - 1)])
+
+
+async def generate_variants(
+    image_id: int,
+    key: str,
+    variant_urls: dict[str, str],
+    storage: StorageBackend,
+    bind: AsyncEngine
+) -> dict[str, str]:
+    """Render, store and record the variants of image ``image_id``.
+
+    Runs as a background task after the upload response, so it opens its own
+    session on ``bind`` rather than reusing the request's. ``variant_urls``
+    maps each variant name to the URL it will be served from. Failures are
+    logged and leave the image without variants; views then fall back to the
+    original. Returns the variant URLs that were recorded.
+    """
+    try:
+        contents = await _read_all(storage, key)
+        if contents is None:
+            return {}
+        # Reading the header is cheap and keeps non-images out of the worker pool
+        Image.open(io.BytesIO(contents)).close()
+        rendered = await variant_worker.render(contents)
+        for name, data in rendered.items():
+            await storage.save(variant_key(key, name), _single_chunk(data), VARIANTS[name][2])
+
+        stored_urls = {name: variant_urls[name] for name in rendered}
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            db_image = await db.get(DBPlantImage, image_id)
+            if db_image is None:
+                return {}  # Deleted while the variants rendered
+            db_image.variants = stored_urls
+            await db.commit()
+        return stored_urls
+    except Exception:
+        logger.exception("Could not generate variants for image %s", image_id)
+        return {}
+
+
+async def _single_chunk(data: bytes):
+    yield data
+
+
+variant_worker = ImageVariantWorker()
@@ -26,4 +26,21 @@ function showNotification(message, type = 'success') {
 function handleApiError(error) {
     console.error('API Error:', error);
     showNotification(error.message || 'An error occurred', 'danger');
-}
\ No newline at end of file
+}
+
+// Fetch every page of a cursor-paginated list endpoint into one array
+async function fetchAllPages(url) {
+    const items = [];
+    let next = new URL(url, window.location.origin);
+    while (next) {
+        const response = await fetch(next);
+        if (!response.ok) {
+            throw new Error(`Request failed with status ${response.status}`);
+        }
+        items.push(...await response.json());
+        const cursor = response.headers.get('X-Next-Cursor');
+        next = cursor ? new URL(next) : null;
+        if (next) next.searchParams.set('cursor', cursor);
+    }
+    return items;
+}
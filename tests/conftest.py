@@ -1,13 +1,17 @@
 """Test configuration and fixtures."""
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from fastapi.testclient import TestClient
 from contextlib import contextmanager
-from src.database import Base, get_db
+from src.database import Base, get_db, get_async_db, async_database_url
+from src.cache import stats_cache
+from src.barcode import barcode_cache
+from src.storage import LocalStorage, get_storage
 from src.models import DBGardenBed, DBPlant, DBPlantImage  # Import all models
-from main import app
+from main import app, api_app
 import os
 
 # Use PostgreSQL test database
@@ -22,6 +26,20 @@ def engine():
     yield test_engine
     Base.metadata.drop_all(bind=test_engine)
 
+@pytest.fixture(scope="function")
+def async_engine(engine):
+    """Create an async engine on the same database for the API routes.
+
+    NullPool keeps asyncpg connections from outliving the event loop of the
+    TestClient that opened them.
+    """
+    return create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+
+@pytest.fixture(scope="function")
+def async_session_factory(async_engine):
+    """Create an async session factory bound to the test engine."""
+    return sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="function")
 def session_factory(engine):
     """Create a session factory bound to the test engine."""
@@ -29,7 +47,12 @@ def session_factory(engine):
     return TestingSessionLocal
 
 @pytest.fixture(scope="function")
-def test_db(session_factory):
+def image_storage(tmp_path):
+    """Local image storage rooted in a per-test temporary directory."""
+    return LocalStorage(str(tmp_path / "images"))
+
+@pytest.fixture(scope="function")
+def test_db(session_factory, async_session_factory, image_storage):
     """Provide a test database session."""
     def override_get_db():
         session = session_factory()
@@ -43,7 +66,22 @@ def test_db(session_factory):
         finally:
             session.close()
     
-    app.dependency_overrides[get_db] = override_get_db
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except:
+                await session.rollback()
+                raise
+    
+    # Routes live on the mounted API app, which resolves its own overrides
+    for application in (app, api_app):
+        application.dependency_overrides[get_db] = override_get_db
+        application.dependency_overrides[get_async_db] = override_get_async_db
+        application.dependency_overrides[get_storage] = lambda: image_storage
+    stats_cache.clear()  # Cached stats must not leak between test databases
+    barcode_cache.clear()
     session = session_factory()
     Base.metadata.create_all(bind=session.get_bind())  # Ensure tables exist at fixture setup
     
@@ -52,6 +90,7 @@ def test_db(session_factory):
     session.close()
     # Clear the override after the test
     app.dependency_overrides.clear()
+    api_app.dependency_overrides.clear()
 
 @pytest.fixture(scope="function")
 def client(test_db):
@@ -59,6 +98,24 @@ def client(test_db):
     with TestClient(app) as test_client:
         yield test_client
 
+@pytest.fixture(scope="function")
+def count_queries(async_engine):
+    """Record the SQL statements issued against the test engine inside a block."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    
+    return _count_queries
+
 @pytest.fixture(scope="function")
 def mock_storage():
     """Mock storage for file uploads."""
@@ -0,0 +1,47 @@
+"""Tests for the vectorized computations behind the stats charts."""
+from src.analytics import HarvestWeights, PlantColumns, monthly_timeline, producer_totals, success_rates
+
+def _plants():
+    return PlantColumns.from_rows([
+        ("Tomato", "FINISHED", 3),
+        ("Basil", "HARVESTING", 5),
+        ("Tomato", "PLANTED", 3),
+        ("Pepper", "FINISHED", 4),  # Fewer than 5 plants
+        ("Carrot", "FAILED", 3),
+        ("Carrot", "FINISHED", 3),
+    ])
+
+def test_success_rates_keep_first_seen_order_for_ties():
+    names, rates, totals = success_rates(_plants())
+    assert names == ["Basil", "Tomato", "Carrot"]
+    assert rates == [100.0, 50.0, 50.0]
+    assert totals == [5, 6, 6]
+    assert all(type(total) is int for total in totals)
+
+def test_producer_totals_include_plant_types_without_harvests():
+    harvests = HarvestWeights.from_rows([
+        ("2024-07", "Basil", 0.5),
+        ("2024-07", "Tomato", 4.0),
+        ("2024-08", "Tomato", 6.5),
+        ("2024-08", "Squash", 9.0),  # Not planted this year
+    ])
+    names, weights = producer_totals(_plants(), harvests)
+    assert names == ["Tomato", "Basil", "Pepper", "Carrot"]
+    assert weights == [10.5, 0.5, 0.0, 0.0]
+
+def test_monthly_timeline_fills_missing_months_with_zero():
+    harvests = HarvestWeights.from_rows([
+        ("2024-08", "Tomato", 6.5),
+        ("2024-07", "Tomato", 4.0),
+        ("2024-07", "Basil", 0.5),
+    ])
+    months, names, weights = monthly_timeline(harvests)
+    assert months == ["2024-07", "2024-08"]
+    assert names == ["Basil", "Tomato"]
+    assert weights == [[0.5, 0.0], [4.0, 6.5]]
+
+def test_empty_year():
+    plants, harvests = PlantColumns.from_rows([]), HarvestWeights.from_rows([])
+    assert success_rates(plants) == ([], [], [])
+    assert producer_totals(plants, harvests) == ([], [])
+    assert monthly_timeline(harvests) == ([], [], [])
@@ -0,0 +1,40 @@
+"""Tests for engine and connection pool configuration."""
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from src import database
+
+def test_pool_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", True)
+    options = database.pool_options()
+    assert options["pool_size"] == 2
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is True
+    assert database.async_connect_args() == {}
+
+def test_pgbouncer_mode_keeps_no_connections_or_prepared_statements(engine, monkeypatch):
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+    assert database.pool_options() == {"poolclass": NullPool}
+    
+    pgbouncer_engine = create_async_engine(
+        database.async_database_url(engine.url.render_as_string(hide_password=False)),
+        connect_args=database.async_connect_args(),
+        **database.pool_options()
+    )
+    
+    async def prepared_statements() -> list[list[str]]:
+        names = []
+        async with pgbouncer_engine.connect() as conn:
+            for _ in range(3):
+                result = await conn.execute(text("SELECT name FROM pg_prepared_statements"))
+                names.append(result.scalars().all())
+        await pgbouncer_engine.dispose()
+        return names
+    
+    names = asyncio.run(prepared_statements())
+    # Only the running statement is prepared, and no name is ever reused
+    assert [len(batch) for batch in names] == [1, 1, 1]
+    assert len({batch[0] for batch in names}) == 3
@@ -0,0 +1,61 @@
+"""Tests for the streaming data export."""
+from datetime import date, datetime
+import csv
+import io
+import json
+import pytest
+from src.routes import export
+
+def _create_garden(client, beds=2, plants_per_bed=3):
+    for bed_number in range(beds):
+        bed_id = client.post("/api/garden/beds", json={
+            "name": f"Bed {bed_number}",
+            "dimensions": "4x8",
+            "notes": "Notes, with a comma"
+        }).json()["id"]
+        for _ in range(plants_per_bed):
+            client.post("/api/garden/plants", json={
+                "name": "Tomato",
+                "planting_date": str(date.today()),
+                "location": f"Bed {bed_id}",
+                "status": "PLANTED",
+                "notes": ""
+            })
+
+def test_export_plants_as_ndjson(client, test_db, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)  # Several batches for a few rows
+    _create_garden(client)
+    
+    response = client.get("/api/export/plants")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="garden-plants.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 6
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert rows[0]["name"] == "Tomato"
+    assert rows[0]["status"] == "PLANTED"
+    datetime.fromisoformat(rows[0]["planting_date"])
+
+def test_export_beds_as_csv(client, test_db):
+    _create_garden(client, beds=3, plants_per_bed=0)
+    
+    response = client.get("/api/export/beds?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Bed 0", "Bed 1", "Bed 2"]
+    assert rows[0]["notes"] == "Notes, with a comma"
+
+def test_export_empty_table_as_csv_has_header(client, test_db):
+    response = client.get("/api/export/harvests?format=csv")
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["id,plant_id,harvest_date,quantity,unit,weight_lbs,notes"]
+    assert client.get("/api/export/images").text == ""
+
+@pytest.mark.parametrize("path, status", [
+    ("/api/export/seeds", 404),
+    ("/api/export/plants?format=xml", 400),
+])
+def test_export_rejects_unknown_datasets_and_formats(client, test_db, path, status):
+    assert client.get(path).status_code == status
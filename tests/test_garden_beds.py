@@ -142,11 +142,11 @@ def test_create_garden_bed_db_error(client, test_db, monkeypatch):
     assert "Database" in response.json()["detail"]
 
 def test_list_garden_beds_db_error(client, test_db, monkeypatch):
-    def mock_query(*args, **kwargs):
+    def mock_execute(*args, **kwargs):
         raise SQLAlchemyError("Database error")
         
     from sqlalchemy.orm import Session
-    monkeypatch.setattr(Session, "query", mock_query)
+    monkeypatch.setattr(Session, "execute", mock_execute)
     
     response = client.get("/api/garden/beds")
     assert response.status_code == 500
@@ -264,4 +264,94 @@ def test_garden_bed_with_plant_space(client, test_db):
     assert bed_detail_response.status_code == 200
     data = bed_detail_response.json()
     assert len(data["plants"]) == 1
-    assert data["plants"][0]["space_required"] == 16
\ No newline at end of file
+    assert data["plants"][0]["space_required"] == 16
+
+def _create_beds_with_plants(client, bed_count, plants_per_bed=2):
+    bed_ids = []
+    for i in range(bed_count):
+        bed_response = client.post("/api/garden/beds", json={
+            "name": f"Bed {i}",
+            "dimensions": "3x6",
+            "notes": ""
+        })
+        bed_id = bed_response.json()["id"]
+        bed_ids.append(bed_id)
+        for _ in range(plants_per_bed):
+            client.post("/api/garden/plants", json={
+                "name": "Test Plant",
+                "planting_date": str(date.today()),
+                "location": f"Bed {bed_id}",
+                "status": "PLANTED",
+                "notes": ""
+            })
+    return bed_ids
+
+def test_list_garden_beds_query_count_is_bounded(client, test_db, count_queries):
+    """Listing beds must not issue one lazy load per bed."""
+    _create_beds_with_plants(client, 1)
+    with count_queries() as statements:
+        response = client.get("/api/garden/beds")
+    assert response.status_code == 200
+    baseline = len(statements)
+    
+    _create_beds_with_plants(client, 5)
+    with count_queries() as statements:
+        response = client.get("/api/garden/beds")
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+    assert all(len(bed["plants"]) == 2 for bed in response.json())
+    assert len(statements) == baseline
+    assert 0 < baseline <= 2
+
+def test_get_garden_bed_query_count_is_bounded(client, test_db, count_queries):
+    """Fetching a bed loads its plants with a fixed number of statements."""
+    bed_id = _create_beds_with_plants(client, 1, plants_per_bed=1)[0]
+    with count_queries() as statements:
+        response = client.get(f"/api/garden/beds/{bed_id}")
+    assert response.status_code == 200
+    baseline = len(statements)
+    
+    for _ in range(5):
+        client.post("/api/garden/plants", json={
+            "name": "Another Plant",
+            "planting_date": str(date.today()),
+            "location": f"Bed {bed_id}",
+            "status": "PLANTED",
+            "notes": ""
+        })
+    with count_queries() as statements:
+        response = client.get(f"/api/garden/beds/{bed_id}")
+    assert len(response.json()["plants"]) == 6
+    assert len(statements) == baseline
+    assert 0 < baseline <= 2
+
+def test_get_nonexistent_bed(client, test_db):
+    response = client.get("/api/garden/beds/99999")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Garden bed not found"
+
+def test_delete_garden_bed_removes_its_plants(client, test_db):
+    bed_id = client.post("/api/garden/beds", json={"name": "Old Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+    other_bed_id = client.post("/api/garden/beds", json={"name": "Kept Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+    plant_ids = [
+        client.post("/api/garden/plants", json={
+            "name": "Tomato",
+            "planting_date": str(date.today()),
+            "location": f"Bed {bed}",
+            "status": "PLANTED",
+            "quantity": 2
+        }).json()["id"]
+        for bed in (bed_id, bed_id, other_bed_id)
+    ]
+    assert client.get("/api/stats").json()["total_plants"] == 6
+    
+    response = client.delete(f"/api/garden/beds/{bed_id}")
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+    
+    assert client.get(f"/api/garden/beds/{bed_id}").status_code == 404
+    assert [client.get(f"/api/garden/plants/{plant_id}").status_code for plant_id in plant_ids] == [404, 404, 200]
+    assert [bed["id"] for bed in client.get("/api/garden/beds").json()] == [other_bed_id]
+    assert client.get("/api/stats").json()["total_plants"] == 2
+    
+    assert client.delete(f"/api/garden/beds/{bed_id}").status_code == 404
@@ -230,4 +230,80 @@ def test_invalid_harvest_quantity(client, test_db):
         "notes": "Test harvest"
     }
     response = client.post(f"/api/garden/plants/{plant_id}/harvests", json=harvest_data)
-    assert response.status_code == 422  # Validation error
\ No newline at end of file
+    assert response.status_code == 422  # Validation error
+
+def _flowering_plant(client, name="Test Plant"):
+    bed_id = client.post("/api/garden/beds", json={"name": "Test Bed", "dimensions": "3x6", "notes": ""}).json()["id"]
+    plant_id = client.post("/api/garden/plants", json={
+        "name": name,
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED",
+        "notes": ""
+    }).json()["id"]
+    for status in ["SPROUTED", "FLOWERING"]:
+        client.patch(f"/api/garden/plants/{plant_id}/status", json={"new_status": status})
+    return plant_id
+
+def test_harvest_stores_weight_in_pounds(client, test_db):
+    """Each harvest records its quantity in pounds, whatever unit spelling was used."""
+    from src.models import DBHarvest
+    
+    plant_id = _flowering_plant(client)
+    for quantity, unit in [(2, "lbs"), (8, "Ounces"), (1, "kg"), (453.59237, " g "), (3, "pieces")]:
+        response = client.post(f"/api/garden/plants/{plant_id}/harvests", json={
+            "plant_id": plant_id,
+            "harvest_date": datetime.now().isoformat(),
+            "quantity": quantity,
+            "unit": unit
+        })
+        assert response.status_code == 200
+        assert response.json()["unit"] == unit  # The recorded unit is kept as entered
+    
+    weights = {h.unit: h.weight_lbs for h in test_db.query(DBHarvest).all()}
+    assert weights["lbs"] == pytest.approx(2)
+    assert weights["Ounces"] == pytest.approx(0.5)
+    assert weights["kg"] == pytest.approx(2.20462, abs=1e-5)
+    assert weights[" g "] == pytest.approx(1)
+    assert weights["pieces"] == 3  # Count units have no weight and count as-is
+
+def test_harvest_charts_agree_on_weights(client, test_db):
+    """The timeline and top producers charts sum the same stored weights."""
+    plant_id = _flowering_plant(client, name="Tomato")
+    for quantity, unit in [(1000, "g"), (16, "oz")]:
+        client.post(f"/api/garden/plants/{plant_id}/harvests", json={
+            "plant_id": plant_id,
+            "harvest_date": datetime.now().isoformat(),
+            "quantity": quantity,
+            "unit": unit
+        })
+    
+    timeline = client.get("/api/stats/charts/harvests").json()
+    producers = client.get("/api/stats/charts/top-producers").json()
+    tomato = next(trace for trace in timeline["data"] if trace["name"] == "Tomato")
+    assert sum(tomato["y"]) == pytest.approx(1000 / 453.59237 + 1)
+    assert producers["data"][0]["y"] == [pytest.approx(sum(tomato["y"]))]
+
+def test_harvest_routes_for_missing_plant_or_harvest(client, test_db):
+    """Harvest routes answer 404 for an unknown plant or harvest."""
+    harvest_data = {
+        "plant_id": 99999,
+        "harvest_date": str(date.today()),
+        "quantity": 1,
+        "unit": "lbs"
+    }
+    response = client.post("/api/garden/plants/99999/harvests", json=harvest_data)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Plant not found"
+    assert client.get("/api/garden/plants/99999/harvests").status_code == 404
+    
+    bed_id = client.post("/api/garden/beds", json={"name": "Test Bed", "dimensions": "3x6", "notes": ""}).json()["id"]
+    plant_id = client.post("/api/garden/plants", json={
+        "name": "Test Plant",
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_id}",
+        "status": "FLOWERING"
+    }).json()["id"]
+    response = client.delete(f"/api/garden/plants/{plant_id}/harvests/99999")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Harvest not found"
@@ -0,0 +1,225 @@
+"""Tests for image upload and barcode scanning."""
+import asyncio
+import io
+from PIL import Image
+from src.barcode import barcode_pool
+
+def _blank_png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def test_scan_barcode_no_barcode(client):
+    files = {"file": ("packet.png", _blank_png(), "image/png")}
+    response = client.post("/api/images/scan-barcode", files=files)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No barcode found in image"
+    assert barcode_pool.pending == 0
+
+def test_scan_barcode_when_pool_saturated(client, monkeypatch):
+    monkeypatch.setattr(barcode_pool, "workers", 0)
+    monkeypatch.setattr(barcode_pool, "queue_limit", 0)
+    
+    files = {"file": ("packet.png", _blank_png(), "image/png")}
+    response = client.post("/api/images/scan-barcode", files=files)
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+
+def test_scan_barcode_timeout(client, monkeypatch):
+    monkeypatch.setattr(barcode_pool, "timeout", 0)
+    
+    files = {"file": ("packet.png", _blank_png(), "image/png")}
+    response = client.post("/api/images/scan-barcode", files=files)
+    assert response.status_code == 504
+
+class _FakeBarcode:
+    data = b"0123456789012"
+    type = "EAN13"
+
+def _jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+def test_decode_barcodes_tries_downscaled_grayscale_first(monkeypatch):
+    from src import barcode
+    scanned = []
+    
+    def fake_decode(image):
+        scanned.append((image.mode, image.size))
+        return [_FakeBarcode()]
+    
+    monkeypatch.setattr(barcode, "decode", fake_decode)
+    assert barcode.decode_barcodes(_jpeg(4000, 3000)) == [("0123456789012", "EAN13")]
+    assert scanned == [("L", (1000, 750))]  # JPEG draft decode at 1/4 scale
+
+def test_decode_barcodes_escalates_on_miss(monkeypatch):
+    from src import barcode
+    scanned = []
+    
+    def fake_decode(image):
+        scanned.append(image.size)
+        # Only the first candidate region contains a readable barcode
+        return [_FakeBarcode()] if len(scanned) == 4 else []
+    
+    monkeypatch.setattr(barcode, "decode", fake_decode)
+    assert barcode.decode_barcodes(_jpeg(4000, 3000)) == [("0123456789012", "EAN13")]
+    assert scanned == [(1000, 750), (2000, 1500), (4000, 3000), (2000, 1500)]
+
+def test_decode_barcodes_small_image_skips_downscaling(monkeypatch):
+    from src import barcode
+    scanned = []
+    monkeypatch.setattr(barcode, "decode", lambda image: scanned.append(image.size) or [])
+    
+    assert barcode.decode_barcodes(_blank_png()) == []
+    assert scanned[0] == (64, 64)
+
+def test_scan_barcode_repeat_upload_served_from_cache(client, monkeypatch):
+    calls = []
+    
+    async def fake_decode(contents):
+        calls.append(contents)
+        return [("0123456789012", "EAN13")]
+    
+    monkeypatch.setattr(barcode_pool, "decode", fake_decode)
+    files = {"file": ("packet.png", _blank_png(), "image/png")}
+    first = client.post("/api/images/scan-barcode", files=files)
+    second = client.post("/api/images/scan-barcode", files=files)
+    
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == {
+        "code": "0123456789012",
+        "type": "EAN13",
+        "product_name": None,
+        "manufacturer": None
+    }
+    assert len(calls) == 1
+    
+    cache_stats = client.get("/api/images/scan-barcode/cache").json()
+    assert cache_stats["hits"] == 1
+    assert cache_stats["misses"] == 1
+    assert cache_stats["hit_ratio"] == 0.5
+
+def test_ttl_cache_expires_entries():
+    from src.cache import TTLCache
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", [])
+    assert cache.get("a") == []
+    
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+def _create_plant(client):
+    bed_id = client.post("/api/garden/beds", json={
+        "name": "Image Bed",
+        "dimensions": "4x8",
+        "notes": ""
+    }).json()["id"]
+    plant_id = client.post("/api/garden/plants", json={
+        "name": "Tomato",
+        "planting_date": "2024-04-01",
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED",
+        "year": 2024
+    }).json()["id"]
+    return plant_id
+
+def _upload_image(client, contents, filename="photo.jpg", content_type="image/jpeg"):
+    plant_id = _create_plant(client)
+    files = {"file": (filename, contents, content_type)}
+    response = client.post(f"/api/images/plants/{plant_id}/upload", files=files)
+    assert response.status_code == 200
+    return response.json()["url"]
+
+def test_uploaded_image_is_stored_and_served(client, image_storage):
+    contents = _jpeg(640, 480)
+    url = _upload_image(client, contents)
+    assert "/api/images/files/plants/" in url
+    
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == contents
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "content-disposition" not in response.headers
+    
+    response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+def test_image_range_requests(client, image_storage):
+    contents = bytes(range(256)) * 4
+    url = _upload_image(client, contents)
+    
+    response = client.get(url, headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == contents[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(contents)}"
+    
+    response = client.get(url, headers={"Range": "bytes=-16"})
+    assert response.status_code == 206
+    assert response.content == contents[-16:]
+    
+    response = client.get(url, headers={"Range": f"bytes={len(contents)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(contents)}"
+
+def test_get_image_file_not_found(client, image_storage):
+    assert client.get("/api/images/files/plants/1/missing.jpg").status_code == 404
+    assert client.get("/api/images/files/..%2F..%2Fetc%2Fpasswd").status_code == 404
+
+def test_upload_generates_image_variants(client, image_storage):
+    contents = _jpeg(1600, 1200)
+    _upload_image(client, contents)
+    
+    plants = client.get("/api/garden/plants").json()
+    image = plants[0]["images"][0]
+    assert image["thumbnail_url"] == image["variants"]["thumb_jpeg"]
+    assert {"thumb_jpeg", "thumb_webp", "medium_webp"} <= set(image["variants"])
+    
+    thumbnail = client.get(image["thumbnail_url"])
+    assert thumbnail.status_code == 200
+    assert thumbnail.headers["content-type"] == "image/jpeg"
+    assert Image.open(io.BytesIO(thumbnail.content)).size == (96, 96)
+    assert len(thumbnail.content) < len(contents)
+    
+    medium = client.get(image["variants"]["medium_webp"])
+    assert Image.open(io.BytesIO(medium.content)).size == (1024, 768)
+    
+    plant = client.get(f"/api/garden/plants/{plants[0]['id']}").json()
+    assert plant["images"][0]["variants"] == image["variants"]
+
+def test_unreadable_image_keeps_original_only(client, image_storage):
+    _upload_image(client, b"not an image")
+    
+    image = client.get("/api/garden/plants").json()[0]["images"][0]
+    assert image["thumbnail_url"] is None
+    assert image["variants"] == {}
+    assert client.get(image["url"]).content == b"not an image"
+
+def test_upload_extension_comes_from_the_content_type(client, image_storage):
+    url = _upload_image(client, _blank_png(), filename="photo.html", content_type="image/png")
+    assert url.endswith(".png")
+    assert client.get(url).headers["content-type"] == "image/png"
+
+def test_upload_rejects_non_image_types(client, image_storage):
+    plant_id = _create_plant(client)
+    for filename, content_type in [("x.html", "text/html"), ("x.svg", "image/svg+xml"), ("x.jpg", "")]:
+        files = {"file": (filename, b"<script>alert(1)</script>", content_type)}
+        response = client.post(f"/api/images/plants/{plant_id}/upload", files=files)
+        assert response.status_code == 415
+    assert client.get(f"/api/garden/plants/{plant_id}").json()["images"] == []
+
+async def _single_chunk(data):
+    yield data
+
+def test_stored_non_image_is_served_as_attachment(client, image_storage):
+    asyncio.run(image_storage.save("plants/1/legacy.html", _single_chunk(b"<script>alert(1)</script>")))
+    
+    response = client.get("/api/images/files/plants/1/legacy.html")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == "attachment"
+    assert response.headers["x-content-type-options"] == "nosniff"
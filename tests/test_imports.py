@@ -0,0 +1,176 @@
+"""Tests for bulk plant and harvest imports."""
+from datetime import date
+from src.models import DBHarvest, DBPlant, DBYearRollup
+from src.routes import imports
+
+YEAR = date.today().year
+
+def _create_bed(client):
+    return client.post("/api/garden/beds", json={"name": "Import Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+
+def _plant_rows(bed_id, count):
+    return [
+        {
+            "name": f"Plant {n}",
+            "planting_date": f"{YEAR}-04-01",
+            "location": f"Bed {bed_id}",
+            "status": "FLOWERING",
+            "quantity": 2,
+            "year": YEAR
+        }
+        for n in range(count)
+    ]
+
+def test_import_plants_from_json(client, test_db, monkeypatch):
+    monkeypatch.setattr(imports, "IMPORT_BATCH_SIZE", 2)  # Several INSERT batches
+    bed_id = _create_bed(client)
+    
+    response = client.post("/api/import/plants", json=_plant_rows(bed_id, 5))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 5
+    plants = {p.id: p for p in test_db.query(DBPlant).all()}
+    assert [plants[plant_id].name for plant_id in data["ids"]] == [f"Plant {n}" for n in range(5)]
+    assert test_db.query(DBYearRollup).get(YEAR).plants_total == 10
+    
+    listed = client.get(f"/api/garden/plants?bed_id={bed_id}").json()
+    assert len(listed) == 5
+
+def test_import_plants_from_csv(client, test_db):
+    bed_id = _create_bed(client)
+    body = (
+        "name,variety,planting_date,location,status,quantity,notes\r\n"
+        f"Tomato,Roma,{YEAR}-04-01,Bed {bed_id},PLANTED,3,\r\n"
+        f'Basil,,{YEAR}-05-01,Bed {bed_id},SPROUTED,1,"Two lines,\nof notes"\r\n'
+        "\r\n"
+    )
+    
+    def chunks():  # Split mid-record, mid-quote and mid-character
+        encoded = body.replace("Basil", "Basilé").encode()
+        for start in range(0, len(encoded), 7):
+            yield encoded[start:start + 7]
+    
+    response = client.post("/api/import/plants", content=chunks(), headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    plants = test_db.query(DBPlant).order_by(DBPlant.id).all()
+    assert [(p.name, p.variety, p.quantity, p.year) for p in plants] == [
+        ("Tomato", "Roma", 3, YEAR),
+        ("Basilé", None, 1, YEAR)
+    ]
+    assert plants[1].notes == "Two lines,\nof notes"
+
+def test_import_with_invalid_rows_imports_nothing(client, test_db):
+    bed_id = _create_bed(client)
+    rows = _plant_rows(bed_id, 3)
+    rows[0]["quantity"] = 0
+    rows[2]["location"] = "Bed 999"
+    
+    response = client.post("/api/import/plants", json=rows)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["error_count"] == 2
+    assert [(error["row"], error["field"]) for error in detail["errors"]] == [(1, "quantity"), (3, "location")]
+    assert test_db.query(DBPlant).count() == 0
+    
+    assert client.post("/api/import/plants", json={"name": "Tomato"}).status_code == 400
+
+def test_import_harvests(client, test_db):
+    bed_id = _create_bed(client)
+    plant_ids = client.post("/api/import/plants", json=_plant_rows(bed_id, 2)).json()["ids"]
+    
+    response = client.post("/api/import/harvests", json=[
+        {"plant_id": plant_ids[0], "harvest_date": f"{YEAR}-07-01", "quantity": 16, "unit": "oz"},
+        {"plant_id": plant_ids[1], "harvest_date": f"{YEAR}-07-02", "quantity": 2, "unit": "lbs"},
+    ])
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    assert [h.weight_lbs for h in test_db.query(DBHarvest).order_by(DBHarvest.id)] == [1.0, 2.0]
+    assert {p.status for p in test_db.query(DBPlant)} == {"HARVESTING"}
+    rollup = test_db.query(DBYearRollup).get(YEAR)
+    assert (rollup.harvest_count, rollup.harvest_weight) == (2, 3.0)
+    assert client.get("/api/stats/metrics").json()["total_harvests"] == 2
+
+def test_import_harvests_checks_plants(client, test_db):
+    bed_id = _create_bed(client)
+    planted = client.post("/api/garden/plants", json={
+        "name": "Seedling",
+        "planting_date": f"{YEAR}-04-01",
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED"
+    }).json()["id"]
+    
+    response = client.post("/api/import/harvests", json=[
+        {"plant_id": planted, "harvest_date": f"{YEAR}-07-01", "quantity": 1, "unit": "lbs"},
+        {"plant_id": 999, "harvest_date": f"{YEAR}-07-01", "quantity": 1, "unit": "lbs"},
+    ])
+    assert response.status_code == 422
+    messages = [error["message"] for error in response.json()["detail"]["errors"]]
+    assert messages == ["Cannot record harvest for plant in PLANTED status", "Plant not found"]
+    assert test_db.query(DBHarvest).count() == 0
+
+def _csv(*lines):
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+def test_import_csv_with_unknown_header_imports_nothing(client, test_db):
+    bed_id = _create_bed(client)
+    body = _csv("title,planted,bed", f"Tomato,{YEAR}-04-01,Bed {bed_id}")
+    
+    response = client.post("/api/import/plants", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 422
+    fields = {error["field"] for error in response.json()["detail"]["errors"]}
+    assert {"name", "planting_date", "location", "status"} <= fields
+    assert test_db.query(DBPlant).count() == 0
+
+def test_import_rejects_malformed_json(client, test_db):
+    response = client.post("/api/import/plants", content=b"[{", headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Request body must be a JSON array or text/csv"
+
+def test_bad_row_in_a_later_batch_rolls_back_earlier_batches(client, test_db, monkeypatch):
+    monkeypatch.setattr(imports, "IMPORT_BATCH_SIZE", 2)
+    bed_id = _create_bed(client)
+    rows = [f"Plant {n},{YEAR}-04-01,Bed {bed_id},PLANTED,1" for n in range(4)]
+    rows.append(f"Plant 4,{YEAR}-04-01,Bed {bed_id},PLANTED,0")  # Quantity must be positive
+    body = _csv("name,planting_date,location,status,quantity", *rows)
+    
+    response = client.post("/api/import/plants", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 422
+    assert [(error["row"], error["field"]) for error in response.json()["detail"]["errors"]] == [(5, "quantity")]
+    test_db.expire_all()
+    assert test_db.query(DBPlant).count() == 0
+    assert test_db.query(DBYearRollup).get(YEAR) is None
+    assert client.get("/api/stats").json()["total_plants"] == 0
+
+def test_failed_harvest_import_leaves_no_harvests_or_status_changes(client, test_db, monkeypatch):
+    monkeypatch.setattr(imports, "IMPORT_BATCH_SIZE", 2)
+    bed_id = _create_bed(client)
+    plant_ids = client.post("/api/import/plants", json=_plant_rows(bed_id, 2)).json()["ids"]
+    rows = [f"{plant_ids[n % 2]},{YEAR}-07-0{n + 1},1,lbs" for n in range(4)]
+    rows.append(f"{plant_ids[0]},{YEAR}-07-09,-1,lbs")  # Quantity must be positive
+    body = _csv("plant_id,harvest_date,quantity,unit", *rows)
+    
+    response = client.post("/api/import/harvests", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 422
+    assert response.json()["detail"]["errors"][0]["row"] == 5
+    test_db.expire_all()
+    assert test_db.query(DBHarvest).count() == 0
+    assert {p.status for p in test_db.query(DBPlant)} == {"FLOWERING"}
+    assert test_db.query(DBYearRollup).get(YEAR).harvest_count == 0
+
+def test_import_updates_cached_stats(client, test_db):
+    bed_id = _create_bed(client)
+    assert client.get("/api/stats").json()["total_plants"] == 0
+    assert client.get("/api/stats/metrics").json()["total_harvests"] == 0
+    
+    plant_ids = client.post("/api/import/plants", json=_plant_rows(bed_id, 3)).json()["ids"]
+    stats = client.get("/api/stats").json()
+    assert stats["total_plants"] == 6
+    assert stats["plants_by_status"]["FLOWERING"] == 6
+    
+    client.post("/api/import/harvests", json=[
+        {"plant_id": plant_id, "harvest_date": f"{YEAR}-07-01", "quantity": 1, "unit": "lbs"}
+        for plant_id in plant_ids
+    ])
+    assert client.get("/api/stats/metrics").json()["total_harvests"] == 3
+    assert client.get("/api/stats").json()["plants_by_status"]["HARVESTING"] == 6
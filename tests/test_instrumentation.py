@@ -0,0 +1,45 @@
+"""Tests for per-request SQL timing."""
+from datetime import date
+import json
+import logging
+import re
+from src import instrumentation
+
+def _timing(response) -> dict:
+    """Server-Timing metrics as {name: (duration, description)}."""
+    metrics = {}
+    for metric in response.headers["server-timing"].split(","):
+        name, *params = [part.strip() for part in metric.split(";")]
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return metrics
+
+def test_server_timing_counts_request_queries(client, test_db, count_queries):
+    bed_id = client.post("/api/garden/beds", json={"name": "Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+    client.post("/api/garden/plants", json={
+        "name": "Tomato",
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED"
+    })
+    
+    with count_queries() as statements:
+        response = client.get(f"/api/garden/beds/{bed_id}")
+    timing = _timing(response)
+    assert timing["db"][1] == f"{len(statements)} queries"
+    assert 0 < timing["db-slowest"][0] <= timing["db"][0] <= timing["app"][0]
+    
+    assert _timing(client.get("/health"))["db"] == (0.0, "0 queries")
+
+def test_slow_requests_are_logged(client, test_db, monkeypatch, caplog):
+    client.get("/api/garden/beds")
+    assert not [r for r in caplog.records if r.name == instrumentation.__name__]
+    
+    monkeypatch.setattr(instrumentation, "SLOW_REQUEST_MS", 0)
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        client.get("/api/garden/beds?unused=1")
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry["event"] == "slow_request"
+    assert (entry["method"], entry["path"], entry["status"]) == ("GET", "/api/garden/beds", 200)
+    assert entry["db_statements"] >= 1
+    assert re.match(r"\s*SELECT", entry["slowest_statement"])
@@ -1,4 +1,8 @@
 import pytest
+import os
+import subprocess
+import sys
+from pathlib import Path
 from datetime import date, datetime
 from fastapi.testclient import TestClient
 from unittest.mock import patch
@@ -24,6 +28,28 @@ def test_about_route(client):
     assert response.json() == {"message": "This is the about page."}
 
 
+def test_health_reports_connection_pools(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "healthy"
+    pool = body["database_pools"]["async"]
+    assert pool["pool"] == "AsyncAdaptedQueuePool"
+    assert {"checkouts", "size", "checked_out", "overflow"} <= pool.keys()
+
+
+def test_import_skips_heavy_libraries():
+    """Importing the app must not load analytics or barcode libraries, nor touch the database."""
+    code = "import sys, main; print(','.join(m for m in ('pandas', 'numpy', 'plotly', 'pyzbar') if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "DATABASE_URL": "postgresql://nobody@127.0.0.1:1/unreachable"}
+    )
+    assert result.stdout.strip() == ""
+
+
 def test_create_garden_bed(client, test_db):
     response = client.post("/api/garden/beds", json={
         "name": "Test Bed",
@@ -279,14 +305,19 @@ def test_create_garden_bed_invalid_dimensions(client, test_db):
 
 def test_database_connection_error(client, monkeypatch):
     """Test that database connection errors are handled gracefully."""
-    from sqlalchemy.orm import Session
-    from src.database import get_db
+    from main import api_app
+    from src.database import get_async_db
     from sqlalchemy.exc import SQLAlchemyError
     
-    def mock_db():
-        raise SQLAlchemyError("Database connection error")
+    class FailingSession:
+        async def execute(self, *args, **kwargs):
+            raise SQLAlchemyError("Database connection error")
+    
+    async def mock_db():
+        yield FailingSession()
     
-    monkeypatch.setattr("src.database.get_db", mock_db)
+    # Startup creates the tables, so the error has to come from the session itself
+    monkeypatch.setitem(api_app.dependency_overrides, get_async_db, mock_db)
     response = client.get("/api/garden/beds")
     assert response.status_code == 500
     data = response.json()
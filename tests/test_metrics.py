@@ -0,0 +1,73 @@
+"""Tests for the Prometheus metrics endpoint."""
+from datetime import date
+import re
+from src.metrics import request_metrics
+
+def _samples(text: str) -> dict:
+    """Metric samples as {'name{labels}': value}."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+def test_requests_are_counted_per_route_template(client, test_db):
+    request_metrics.clear()
+    bed_id = client.post("/api/garden/beds", json={"name": "Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+    plant_ids = [
+        client.post("/api/garden/plants", json={
+            "name": name,
+            "planting_date": str(date.today()),
+            "location": f"Bed {bed_id}",
+            "status": "PLANTED"
+        }).json()["id"]
+        for name in ("Tomato", "Basil")
+    ]
+    for plant_id in plant_ids:
+        client.get(f"/api/garden/plants/{plant_id}")
+    client.get("/api/garden/plants/999999")
+    client.get("/no-such-page")
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    
+    route = 'method="GET",route="/api/garden/plants/{plant_id}"'
+    assert samples[f'garden_http_requests_total{{{route},status="200"}}'] == 2
+    assert samples[f'garden_http_requests_total{{{route},status="404"}}'] == 1
+    assert samples['garden_http_requests_total{method="POST",route="/api/garden/plants",status="200"}'] == 2
+    assert samples['garden_http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert not [name for name in samples if f"/{plant_ids[0]}\"" in name]
+    
+    buckets = [
+        value for name, value in samples.items()
+        if name.startswith(f"garden_http_request_duration_seconds_bucket{{{route},")
+    ]
+    assert buckets == sorted(buckets)
+    assert samples[f'garden_http_request_duration_seconds_bucket{{{route},le="+Inf"}}'] == 3
+    assert samples[f"garden_http_request_duration_seconds_count{{{route}}}"] == 3
+    assert samples[f"garden_http_request_duration_seconds_sum{{{route}}}"] > 0
+    
+    # The scrape itself is in flight while it renders
+    assert samples["garden_http_requests_in_flight"] == 1
+    assert _samples(client.get("/metrics").text)['garden_http_requests_total{method="GET",route="/metrics",status="200"}'] == 1
+
+def test_pool_and_cache_metrics(client, test_db):
+    client.get("/api/stats")
+    client.get("/api/stats")
+    
+    text = client.get("/metrics").text
+    samples = _samples(text)
+    for pool in ("async", "sync"):
+        assert f'garden_db_pool_checkouts_total{{pool="{pool}"}}' in samples
+        assert f'garden_db_pool_size{{pool="{pool}"}}' in samples
+    assert "# TYPE garden_db_pool_overflow gauge" in text
+    
+    for cache in ("stats", "barcode"):
+        for metric in ("hits_total", "misses_total", "evictions_total", "hit_ratio", "entries"):
+            assert f'garden_cache_{metric}{{cache="{cache}"}}' in samples
+    assert samples['garden_cache_hits_total{cache="stats"}'] >= 1
+    assert 0 < samples['garden_cache_hit_ratio{cache="stats"}'] <= 1
+    assert re.search(r"^# TYPE garden_cache_hits_total counter$", text, re.M)
@@ -1,6 +1,8 @@
 """Tests for plant management functionality."""
+import json
 import pytest
 from datetime import date, datetime
+from src.models import Plant
 
 def test_create_plant(client, test_db):
     bed_response = client.post("/api/garden/beds", json={
@@ -280,4 +282,182 @@ def test_update_plant_space_required(client, test_db):
     update_response = client.patch(f"/api/garden/plants/{plant_id}", json=update_data)
     assert update_response.status_code == 200
     updated_data = update_response.json()
-    assert updated_data["space_required"] == 16
\ No newline at end of file
+    assert updated_data["space_required"] == 16
+
+def _create_plants_for_listing(client):
+    bed_ids = [
+        client.post("/api/garden/beds", json={"name": name, "dimensions": "4x8", "notes": ""}).json()["id"]
+        for name in ("North Bed", "South Bed")
+    ]
+    plants = [
+        ("Tomato", bed_ids[0], "PLANTED", "2024-04-01"),
+        ("Cherry Tomato", bed_ids[0], "SPROUTED", "2024-04-15"),
+        ("Basil", bed_ids[1], "PLANTED", "2024-05-01"),
+        ("Pepper", bed_ids[1], "SPROUTED", "2024-05-20"),
+        ("100%_Kale", bed_ids[1], "PLANTED", "2024-06-01"),
+    ]
+    for name, bed_id, status, planting_date in plants:
+        response = client.post("/api/garden/plants", json={
+            "name": name,
+            "planting_date": planting_date,
+            "location": f"Bed {bed_id}",
+            "status": status,
+            "year": 2024
+        })
+        assert response.status_code == 200
+    return bed_ids
+
+def test_list_plants_cursor_pagination(client, test_db):
+    _create_plants_for_listing(client)
+    
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/garden/plants", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        names.extend(plant["name"] for plant in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in response.headers
+            break
+        assert f"cursor={cursor}" in response.headers["Link"]
+    
+    assert pages == 3
+    assert names == ["Tomato", "Cherry Tomato", "Basil", "Pepper", "100%_Kale"]
+
+def test_list_plants_filters(client, test_db):
+    bed_ids = _create_plants_for_listing(client)
+    
+    def names(**params):
+        response = client.get("/api/garden/plants", params=params)
+        assert response.status_code == 200
+        return [plant["name"] for plant in response.json()]
+    
+    assert names(bed_id=bed_ids[0]) == ["Tomato", "Cherry Tomato"]
+    assert names(status="SPROUTED") == ["Cherry Tomato", "Pepper"]
+    assert names(status=["SPROUTED", "PLANTED"], bed_id=bed_ids[1]) == ["Basil", "Pepper", "100%_Kale"]
+    assert names(name="tomato") == ["Tomato", "Cherry Tomato"]
+    assert names(name="%_") == ["100%_Kale"]
+    assert names(planted_from="2024-04-15", planted_to="2024-05-20") == ["Cherry Tomato", "Basil", "Pepper"]
+
+def test_list_plants_page_size_cap(client, test_db, monkeypatch):
+    _create_plants_for_listing(client)
+    monkeypatch.setattr("src.pagination.MAX_PAGE_SIZE", 3)
+    
+    response = client.get("/api/garden/plants", params={"limit": 100})
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" in response.headers
+
+def test_list_plants_invalid_cursor(client, test_db):
+    response = client.get("/api/garden/plants", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def _create_bed_of_plants(client, statuses):
+    bed_id = client.post("/api/garden/beds", json={"name": "Batch Bed", "dimensions": "4x8", "notes": ""}).json()["id"]
+    plant_ids = []
+    for status in statuses:
+        plant_ids.append(client.post("/api/garden/plants", json={
+            "name": "Tomato",
+            "planting_date": str(date.today()),
+            "location": f"Bed {bed_id}",
+            "status": status,
+            "quantity": 2
+        }).json()["id"])
+    return bed_id, plant_ids
+
+def test_batch_status_update_by_bed(client, test_db, count_queries):
+    bed_id, plant_ids = _create_bed_of_plants(client, ["SPROUTED", "SPROUTED", "SPROUTED", "PLANTED", "FLOWERING"])
+    client.get("/api/stats")  # Cached stats must see the batch
+    
+    with count_queries() as statements:
+        response = client.patch("/api/garden/plants/status", json={"bed_id": bed_id, "new_status": "FLOWERING"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 3
+    assert [(r["plant_id"], r["outcome"]) for r in data["results"]] == [
+        (plant_ids[0], "updated"),
+        (plant_ids[1], "updated"),
+        (plant_ids[2], "updated"),
+        (plant_ids[3], "invalid_transition"),
+        (plant_ids[4], "unchanged"),
+    ]
+    assert data["results"][3]["previous_status"] == "PLANTED"
+    assert "SPROUTED" in data["results"][3]["detail"]
+    assert sum(statement.lstrip().upper().startswith("UPDATE PLANTS") for statement in statements) == 1
+    
+    statuses = [client.get(f"/api/garden/plants/{plant_id}").json()["status"] for plant_id in plant_ids]
+    assert statuses == ["FLOWERING", "FLOWERING", "FLOWERING", "PLANTED", "FLOWERING"]
+    assert client.get("/api/stats").json()["plants_by_status"]["FLOWERING"] == 8
+
+def test_batch_status_update_by_plant_ids(client, test_db):
+    _, plant_ids = _create_bed_of_plants(client, ["PLANTED", "HARVESTING"])
+    response = client.patch("/api/garden/plants/status", json={
+        "plant_ids": [plant_ids[0], 999, plant_ids[0]],
+        "new_status": "SPROUTED"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 1
+    assert [(r["plant_id"], r["outcome"]) for r in data["results"]] == [(plant_ids[0], "updated"), (999, "not_found")]
+    assert client.get(f"/api/garden/plants/{plant_ids[0]}").json()["status"] == "SPROUTED"
+
+def test_batch_status_update_requires_one_selector(client, test_db):
+    assert client.patch("/api/garden/plants/status", json={"new_status": "SPROUTED"}).status_code == 422
+    assert client.patch("/api/garden/plants/status", json={
+        "plant_ids": [1], "bed_id": 1, "new_status": "SPROUTED"
+    }).status_code == 422
+    assert client.patch("/api/garden/plants/status", json={"bed_id": 999, "new_status": "SPROUTED"}).status_code == 404
+
+def test_plant_responses_match_validated_models(client, test_db):
+    """Plants serialized without re-validation read the same as validated models."""
+    bed_id, plant_ids = _create_bed_of_plants(client, ["PLANTED"])
+    client.patch(f"/api/garden/plants/{plant_ids[0]}", json={
+        "name": "Tomato",
+        "variety": "Roma",
+        "planting_date": "2024-04-01T08:30:15.250000",
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED",
+        "quantity": 2,
+        "notes": "Staked"
+    })
+    
+    responses = [
+        client.get(f"/api/garden/plants/{plant_ids[0]}").json(),
+        client.get("/api/garden/plants").json()[0],
+        client.get(f"/api/garden/beds/{bed_id}").json()["plants"][0],
+        client.get("/api/garden/beds").json()[0]["plants"][0],
+    ]
+    for data in responses:
+        assert data == json.loads(Plant.parse_obj(data).json())
+    assert responses[0]["planting_date"] == "2024-04-01T08:30:15.250000"
+    assert responses[0]["status"] == "PLANTED"
+
+def test_batch_status_update_with_nothing_to_update(client, test_db):
+    _, plant_ids = _create_bed_of_plants(client, ["PLANTED", "FINISHED"])
+    response = client.patch("/api/garden/plants/status", json={"plant_ids": plant_ids, "new_status": "FINISHED"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 0
+    assert [r["outcome"] for r in data["results"]] == ["invalid_transition", "unchanged"]
+    assert client.get(f"/api/garden/plants/{plant_ids[0]}").json()["status"] == "PLANTED"
+
+def test_delete_plant(client, test_db):
+    _, plant_ids = _create_bed_of_plants(client, ["PLANTED", "SPROUTED"])
+    assert client.get("/api/stats").json()["total_plants"] == 4
+    
+    response = client.delete(f"/api/garden/plants/{plant_ids[0]}")
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+    assert client.get(f"/api/garden/plants/{plant_ids[0]}").status_code == 404
+    assert client.get(f"/api/garden/plants/{plant_ids[1]}").status_code == 200
+    assert client.get("/api/stats").json()["total_plants"] == 2  # Cached stats were invalidated
+    
+    response = client.delete(f"/api/garden/plants/{plant_ids[0]}")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Plant not found"
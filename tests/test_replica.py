@@ -0,0 +1,98 @@
+"""Tests for routing read-only requests to a read replica."""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import NullPool
+from main import app
+from src import replica
+
+@pytest.fixture
+def replica_statements(async_engine, monkeypatch):
+    """Route reads to a second engine on the test database and record what it runs."""
+    replica_engine = create_async_engine(async_engine.url, poolclass=NullPool)
+    monkeypatch.setattr(replica, "replica_router", replica.ReplicaRouter(replica_engine))
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(replica_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(replica_engine.sync_engine, "before_cursor_execute", record)
+
+@contextmanager
+def _new_replica_statements(statements):
+    start = len(statements)
+    new = []
+    yield new
+    new.extend(statements[start:])
+
+def test_reads_use_the_replica_until_the_client_writes(client, test_db, replica_statements):
+    with _new_replica_statements(replica_statements) as statements:
+        assert client.get("/api/garden/beds").json() == []
+    assert any("garden_beds" in statement for statement in statements)
+
+    response = client.post("/api/garden/beds", json={"name": "Bed", "dimensions": "4x8", "notes": ""})
+    assert replica.STICKY_COOKIE in response.cookies
+
+    # The writer reads from the primary for a while, other clients don't
+    with _new_replica_statements(replica_statements) as statements:
+        assert [bed["name"] for bed in client.get("/api/garden/beds").json()] == ["Bed"]
+    assert statements == []
+
+    client.cookies.clear()
+    with _new_replica_statements(replica_statements) as statements:
+        client.get("/api/garden/beds")
+    assert statements
+
+def test_cached_stats_stay_on_the_primary_after_any_write(client, test_db, replica_statements):
+    client.post("/api/garden/beds", json={"name": "Bed", "dimensions": "4x8", "notes": ""})
+    client.cookies.clear()
+
+    with _new_replica_statements(replica_statements) as statements:
+        client.get("/api/stats/years")
+    assert not [statement for statement in statements if "plants" in statement]
+
+    replica.replica_router.last_write = float("-inf")
+    with _new_replica_statements(replica_statements) as statements:
+        client.get("/api/stats")
+    assert [statement for statement in statements if "plants" in statement or "rollups" in statement]
+
+def test_lagging_or_unreachable_replica_falls_back_to_the_primary(client, test_db, replica_statements, monkeypatch):
+    monkeypatch.setattr(replica, "LAG_QUERY", text("SELECT 60"))
+    with _new_replica_statements(replica_statements) as statements:
+        assert client.get("/api/garden/beds").status_code == 200
+    assert statements == ["SELECT 60"]
+    assert client.get("/health").json()["replica"] == {"lag_seconds": 60.0, "in_use": False}
+
+    unreachable = create_async_engine("postgresql+asyncpg://garden@127.0.0.1:1/garden", poolclass=NullPool)
+    monkeypatch.setattr(replica, "replica_router", replica.ReplicaRouter(unreachable))
+    assert client.get("/api/garden/beds").json() == []
+    assert replica.replica_router.stats() == {"lag_seconds": None, "in_use": False}
+
+def test_replica_going_down_between_lag_checks_falls_back_to_the_primary(client, test_db, monkeypatch):
+    unreachable = create_async_engine("postgresql+asyncpg://garden@127.0.0.1:1/garden", poolclass=NullPool)
+    router = replica.ReplicaRouter(unreachable)
+    
+    async def lag_check_passed():
+        return 0.0  # Measured before the replica went away
+    
+    monkeypatch.setattr(router, "_measure_lag", lag_check_passed)
+    monkeypatch.setattr(replica, "replica_router", router)
+    assert router.stats()["in_use"] is False  # Not checked yet
+    
+    response = client.get("/api/garden/plants")
+    assert response.status_code == 200
+    assert response.json() == []
+    assert router.stats() == {"lag_seconds": None, "in_use": False}
+
+def test_replica_engine_is_disposed_on_shutdown(test_db, async_engine, monkeypatch):
+    replica_engine = create_async_engine(async_engine.url)
+    monkeypatch.setattr(replica, "replica_router", replica.ReplicaRouter(replica_engine))
+    
+    with TestClient(app) as client:
+        assert client.get("/api/garden/beds").status_code == 200
+        assert replica_engine.sync_engine.pool.checkedin() > 0
+    assert replica_engine.sync_engine.pool.checkedin() == 0
@@ -0,0 +1,171 @@
+"""Tests for the yearly and per-bed rollup tables."""
+from datetime import date
+from sqlalchemy import select, text
+from src.models import DBBedYearRollup, DBYearRollup
+from src.rollups import TOTAL_COLUMNS, rebuild_statements
+
+YEAR = date.today().year
+
+def _create_bed(client, name="Rollup Bed", dimensions="4x8"):
+    response = client.post("/api/garden/beds", json={"name": name, "dimensions": dimensions, "notes": ""})
+    return response.json()["id"]
+
+def _create_plant(client, bed_id, quantity=1, status="PLANTED", year=YEAR):
+    response = client.post("/api/garden/plants", json={
+        "name": "Tomato",
+        "planting_date": f"{year}-04-01",
+        "location": f"Bed {bed_id}",
+        "status": status,
+        "quantity": quantity,
+        "space_required": 2,
+        "year": year,
+        "notes": ""
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def _rollups(session):
+    """Current rollup rows as plain dicts, keyed by (year, bed_id) and by year."""
+    session.expire_all()
+    beds = {
+        (row.year, row.bed_id): {column: getattr(row, column) for column in TOTAL_COLUMNS}
+        for row in session.scalars(select(DBBedYearRollup))
+    }
+    years = {
+        row.year: {column: getattr(row, column) for column in TOTAL_COLUMNS}
+        for row in session.scalars(select(DBYearRollup))
+    }
+    return beds, years
+
+def _rebuilt(session):
+    """Rollup rows as a full rebuild computes them, without keeping the rebuild."""
+    for statement in rebuild_statements():
+        session.execute(statement)
+    rebuilt = _rollups(session)
+    session.rollback()
+    return rebuilt
+
+def _without_empty_rows(rollups):
+    # Refreshes keep rows that dropped to zero; a rebuild only creates rows with plants
+    beds, years = rollups
+    return (
+        {key: row for key, row in beds.items() if row["plants_total"]},
+        {key: row for key, row in years.items() if row["plants_total"]}
+    )
+
+def test_rollups_follow_plant_and_harvest_changes(client, test_db):
+    first_bed = _create_bed(client, "First")
+    second_bed = _create_bed(client, "Second")
+    plant = _create_plant(client, first_bed, quantity=3)
+    _create_plant(client, second_bed, quantity=2, status="SPROUTED")
+    
+    beds, years = _rollups(test_db)
+    assert beds[(YEAR, first_bed)]["plants_planted"] == 3
+    assert beds[(YEAR, first_bed)]["space_used"] == 6
+    assert years[YEAR]["plants_total"] == 5
+    assert years[YEAR]["plants_sprouted"] == 2
+    
+    for status in ("SPROUTED", "FLOWERING"):
+        client.patch(f"/api/garden/plants/{plant['id']}/status", json={"new_status": status})
+    harvest = client.post(f"/api/garden/plants/{plant['id']}/harvests", json={
+        "plant_id": plant["id"],
+        "harvest_date": f"{YEAR}-07-01",
+        "quantity": 32,
+        "unit": "oz"
+    })
+    assert harvest.status_code == 200
+    beds, years = _rollups(test_db)
+    assert beds[(YEAR, first_bed)]["plants_harvesting"] == 3
+    assert beds[(YEAR, first_bed)]["harvest_count"] == 1
+    assert years[YEAR]["harvest_weight"] == 2.0
+    assert _rollups(test_db) == _rebuilt(test_db)
+    
+    response = client.patch(f"/api/garden/plants/{plant['id']}", json={
+        "name": "Tomato",
+        "planting_date": f"{YEAR}-04-01",
+        "location": f"Bed {first_bed}",
+        "status": "HARVESTING",
+        "quantity": 5,
+        "space_required": 2,
+        "year": YEAR
+    })
+    assert response.status_code == 200
+    beds, years = _rollups(test_db)
+    assert beds[(YEAR, first_bed)]["plants_total"] == 5
+    assert beds[(YEAR, first_bed)]["space_used"] == 10
+    assert beds[(YEAR, second_bed)]["plants_total"] == 2
+    assert years[YEAR]["plants_total"] == 7
+    
+    client.delete(f"/api/garden/plants/{plant['id']}/harvests/{harvest.json()['id']}")
+    client.delete(f"/api/garden/plants/{plant['id']}")
+    client.delete(f"/api/garden/beds/{second_bed}")
+    beds, years = _rollups(test_db)
+    assert years[YEAR]["plants_total"] == 0
+    assert years[YEAR]["harvest_count"] == 0
+    assert _without_empty_rows(_rollups(test_db)) == _rebuilt(test_db)
+
+def test_metrics_read_rollups_with_constant_queries(client, test_db, count_queries):
+    bed_id = _create_bed(client)
+    _create_plant(client, bed_id, quantity=2)
+    _create_plant(client, bed_id, quantity=1, year=YEAR - 1)
+    with count_queries() as statements:
+        response = client.get(f"/api/stats/metrics?year={YEAR}")
+    assert response.status_code == 200
+    baseline = len(statements)
+    
+    for _ in range(5):
+        _create_plant(client, _create_bed(client), quantity=1)
+    with count_queries() as statements:
+        response = client.get(f"/api/stats/metrics?year={YEAR}")
+    assert response.status_code == 200
+    assert response.json()["total_plants"] == 7
+    assert len(statements) == baseline
+    assert baseline <= 2
+
+def test_rebuild_recovers_rows_written_outside_the_api(client, test_db):
+    bed_id = _create_bed(client)
+    plant = _create_plant(client, bed_id, quantity=2)
+    test_db.execute(text("UPDATE plants SET quantity = 10 WHERE id = :id"), {"id": plant["id"]})
+    test_db.commit()
+    assert _rollups(test_db)[1][YEAR]["plants_total"] == 2
+    
+    for statement in rebuild_statements():
+        test_db.execute(statement)
+    test_db.commit()
+    assert _rollups(test_db)[1][YEAR]["plants_total"] == 10
+    
+    response = client.get(f"/api/stats/metrics?year={YEAR}")
+    assert response.json()["total_plants"] == 10
+
+def test_rollup_rows_are_zeroed_when_the_last_plant_goes(client, test_db):
+    bed_id = _create_bed(client)
+    other_bed_id = _create_bed(client, "Other")
+    last = _create_plant(client, bed_id, quantity=3, status="FLOWERING")
+    client.post(f"/api/garden/plants/{last['id']}/harvests", json={
+        "plant_id": last["id"],
+        "harvest_date": f"{YEAR}-07-01",
+        "quantity": 1,
+        "unit": "lbs"
+    })
+    _create_plant(client, other_bed_id, quantity=2)
+    previous = _create_plant(client, bed_id, quantity=4, year=YEAR - 1)
+    empty = dict.fromkeys(TOTAL_COLUMNS, 0)
+    
+    # The bed's last plant of this year: its row is zeroed, the rest of the year stays
+    client.delete(f"/api/garden/plants/{last['id']}")
+    beds, years = _rollups(test_db)
+    assert beds[(YEAR, bed_id)] == empty
+    assert beds[(YEAR - 1, bed_id)]["plants_total"] == 4
+    assert years[YEAR]["plants_total"] == 2
+    assert years[YEAR]["harvest_count"] == 0
+    rebuilt = _rebuilt(test_db)
+    assert (YEAR, bed_id) not in rebuilt[0]
+    assert _without_empty_rows(_rollups(test_db)) == rebuilt
+    
+    # The last plant of a whole year zeroes the year row as well
+    client.delete(f"/api/garden/plants/{previous['id']}")
+    beds, years = _rollups(test_db)
+    assert beds[(YEAR - 1, bed_id)] == empty
+    assert years[YEAR - 1] == empty
+    assert _without_empty_rows(_rollups(test_db)) == _rebuilt(test_db)
+    assert client.get(f"/api/stats/metrics?year={YEAR - 1}").json()["total_plants"] == 0
@@ -559,4 +559,91 @@ def test_get_top_producers_chart(client, test_db):
     # Verify sorting (highest to lowest)
     assert chart_data["y"][0] >= chart_data["y"][1]  # First amount should be highest
     if len(chart_data["y"]) > 2:
-        assert chart_data["y"][1] >= chart_data["y"][2]  # Second amount should be higher than third
\ No newline at end of file
+        assert chart_data["y"][1] >= chart_data["y"][2]  # Second amount should be higher than third
+
+def test_plants_by_year_chart_sums_quantities(client, test_db):
+    """Test year chart rolls up plant quantities per year"""
+    bed_response = client.post("/api/garden/beds", json={
+        "name": "Year Chart Bed",
+        "dimensions": "3x6",
+        "notes": ""
+    })
+    bed_id = bed_response.json()["id"]
+    current_year = datetime.now().year
+    
+    for year, quantity in [(current_year - 1, 2), (current_year, 3), (current_year, 4)]:
+        client.post("/api/garden/plants", json={
+            "name": "Bean",
+            "planting_date": str(date.today()),
+            "location": f"Bed {bed_id}",
+            "status": "PLANTED",
+            "quantity": quantity,
+            "year": year,
+            "notes": ""
+        })
+    
+    response = client.get("/api/stats/charts/plants-by-year")
+    assert response.status_code == 200
+    chart_data = response.json()["data"][0]
+    
+    # Years are returned oldest first with quantities summed
+    assert chart_data["x"] == [str(current_year - 1), str(current_year)]
+    assert chart_data["y"] == [2, 7]
+
+def test_get_dashboard(client, test_db):
+    """Test combined dashboard payload matches the individual endpoints"""
+    current_year = datetime.now().year
+    bed_ids = []
+    for name in ["Dashboard Bed A", "Dashboard Bed B"]:
+        bed_response = client.post("/api/garden/beds", json={
+            "name": name,
+            "dimensions": "3x6",
+            "notes": ""
+        })
+        bed_ids.append(bed_response.json()["id"])
+    
+    plant_response = client.post("/api/garden/plants", json={
+        "name": "Tomato",
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_ids[0]}",
+        "status": "FLOWERING",
+        "quantity": 2,
+        "year": current_year,
+        "notes": ""
+    })
+    plant_id = plant_response.json()["id"]
+    client.post(f"/api/garden/plants/{plant_id}/harvests", json={
+        "quantity": 16,
+        "unit": "oz",
+        "harvest_date": str(date.today())
+    })
+    client.post("/api/garden/plants", json={
+        "name": "Lettuce",
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_ids[1]}",
+        "status": "PLANTED",
+        "quantity": 3,
+        "year": current_year - 1,
+        "notes": ""
+    })
+    
+    response = client.get(f"/api/stats/dashboard?year={current_year}")
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["year"] == current_year
+    assert data["metrics"] == client.get(f"/api/stats/metrics?year={current_year}").json()
+    for key, path in [
+        ("status", "status"),
+        ("harvests", "harvests"),
+        ("success_rate", "success-rate"),
+        ("top_producers", "top-producers")
+    ]:
+        expected = client.get(f"/api/stats/charts/{path}?year={current_year}").json()
+        assert data["charts"][key] == expected
+    
+    # One summary per bed, matching the per-bed stats endpoint for the year
+    assert [bed["id"] for bed in data["beds"]] == bed_ids
+    for bed in data["beds"]:
+        expected = client.get(f"/api/stats/beds/{bed['id']}?year={current_year}").json()
+        assert {k: v for k, v in bed.items() if k != "id"} == expected
@@ -0,0 +1,63 @@
+"""Tests for the stats response cache."""
+from datetime import date, datetime
+from src.cache import StatsCache
+
+def test_cache_evicts_least_recently_used():
+    cache = StatsCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 0)  # Touch "a" so "b" is the oldest
+    cache.get_or_compute("c", lambda: 3)
+    
+    assert cache.get_or_compute("a", lambda: "recomputed") == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+
+def test_cache_invalidates_only_affected_years_and_beds():
+    cache = StatsCache()
+    cache.get_or_compute(("metrics", 2024), lambda: "m2024", years=[2024, 2023])
+    cache.get_or_compute(("metrics", 2022), lambda: "m2022", years=[2022, 2021])
+    cache.get_or_compute(("beds", 1, 2024), lambda: "b1", years=[2024], bed_id=1)
+    cache.get_or_compute(("beds", 2, 2024), lambda: "b2", years=[2024], bed_id=2)
+    cache.get_or_compute(("stats",), lambda: "all")
+    
+    removed = cache.invalidate(years=[2023], bed_ids=[1])
+    
+    assert removed == 2  # 2024 metrics (trend uses 2023) and all-years stats
+    assert cache.stats()["size"] == 3
+    assert cache.get_or_compute(("beds", 1, 2024), lambda: "new") == "b1"
+    assert cache.get_or_compute(("metrics", 2022), lambda: "new") == "m2022"
+
+def test_stats_endpoints_are_cached_and_invalidated_on_write(client, test_db):
+    current_year = datetime.now().year
+    bed_response = client.post("/api/garden/beds", json={
+        "name": "Cache Test Bed",
+        "dimensions": "3x6",
+        "notes": ""
+    })
+    bed_id = bed_response.json()["id"]
+    plant = {
+        "name": "Tomato",
+        "planting_date": str(date.today()),
+        "location": f"Bed {bed_id}",
+        "status": "PLANTED",
+        "quantity": 2,
+        "year": current_year,
+        "notes": ""
+    }
+    client.post("/api/garden/plants", json=plant)
+    
+    first = client.get(f"/api/stats/metrics?year={current_year}").json()
+    second = client.get(f"/api/stats/metrics?year={current_year}").json()
+    assert first == second
+    cache_stats = client.get("/api/stats/cache").json()
+    assert cache_stats["hits"] == 1
+    assert cache_stats["misses"] == 1
+    
+    # A new plant in the same year must be reflected immediately
+    client.post("/api/garden/plants", json=plant)
+    updated = client.get(f"/api/stats/metrics?year={current_year}").json()
+    assert updated["total_plants"] == 4
@@ -0,0 +1,143 @@
+"""Tests for the image storage backends."""
+import asyncio
+import pytest
+from src.storage import S3Storage, StorageBackend, StoredObject
+
+class _ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+class _Body:
+    def __init__(self, data):
+        self.data = data
+        self.closed = False
+
+    def iter_chunks(self, size):
+        for start in range(0, len(self.data), size):
+            yield self.data[start:start + size]
+
+    def close(self):
+        self.closed = True
+
+class _StubS3Client:
+    """The subset of a boto3 S3 client that S3Storage calls, kept in memory."""
+
+    class exceptions:
+        ClientError = _ClientError
+
+    def __init__(self, fail_on_part=None):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.fail_on_part = fail_on_part
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = (Body, ContentType)
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        upload_id = f"upload-{len(self.uploads) + len(self.aborted) + 1}"
+        self.uploads[upload_id] = {"key": Key, "content_type": ContentType, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            raise _ClientError("InternalError")
+        self.uploads[UploadId]["parts"][PartNumber] = Body
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        parts = MultipartUpload["Parts"]
+        assert [part["ETag"] for part in parts] == [f'"etag-{part["PartNumber"]}"' for part in parts]
+        body = b"".join(upload["parts"][part["PartNumber"]] for part in parts)
+        self.objects[Key] = (body, upload["content_type"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+        self.aborted.append(UploadId)
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _ClientError("404")
+        body, content_type = self.objects[Key]
+        return {"ContentLength": len(body), "ContentType": content_type}
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(value) for value in Range[len("bytes="):].split("-"))
+        return {"Body": _Body(self.objects[Key][0][start:end + 1])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def _read(storage, key, start, end):
+    return b"".join([chunk async for chunk in storage.read(key, start, end)])
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+def test_s3_small_upload_is_a_single_put():
+    client = _StubS3Client()
+    storage = S3Storage(part_size=8, client=client)
+
+    assert asyncio.run(storage.save("plants/1/a.png", _chunks(b"abc", b"de"))) == 5
+    assert client.objects["plants/1/a.png"] == (b"abcde", "image/png")
+    assert client.uploads == {}
+
+def test_s3_large_upload_completes_a_multipart_upload():
+    client = _StubS3Client()
+    storage = S3Storage(part_size=4, client=client)
+    data = bytes(range(26))
+
+    size = asyncio.run(storage.save("plants/1/b.jpg", _chunks(data[:10], data[10:13], data[13:]), "image/jpeg"))
+    assert size == len(data)
+    assert client.objects["plants/1/b.jpg"] == (data, "image/jpeg")
+    assert client.uploads == {} and client.aborted == []
+
+    assert asyncio.run(storage.stat("plants/1/b.jpg")) == StoredObject(len(data), "image/jpeg")
+    assert asyncio.run(_read(storage, "plants/1/b.jpg", 3, 20)) == data[3:21]
+
+def test_s3_failed_upload_aborts_the_multipart_upload():
+    client = _StubS3Client(fail_on_part=2)
+    storage = S3Storage(part_size=4, client=client)
+
+    with pytest.raises(_ClientError):
+        asyncio.run(storage.save("plants/1/c.jpg", _chunks(b"12345", b"67890")))
+    assert client.aborted == ["upload-1"]
+    assert client.uploads == {}
+    assert "plants/1/c.jpg" not in client.objects
+
+def test_s3_client_going_away_mid_upload_aborts():
+    client = _StubS3Client()
+    storage = S3Storage(part_size=4, client=client)
+
+    async def interrupted():
+        yield b"12345"
+        raise ConnectionResetError()
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(storage.save("plants/1/d.jpg", interrupted()))
+    assert client.aborted == ["upload-1"]
+
+def test_s3_missing_key():
+    client = _StubS3Client()
+    storage = S3Storage(client=client)
+
+    assert asyncio.run(storage.stat("plants/1/missing.jpg")) is None
+    asyncio.run(storage.delete("plants/1/missing.jpg"))
+
+def test_s3_other_errors_are_raised():
+    client = _StubS3Client()
+    storage = S3Storage(client=client)
+
+    def denied(Bucket, Key):
+        raise _ClientError("AccessDenied")
+
+    client.head_object = denied
+    with pytest.raises(_ClientError):
+        asyncio.run(storage.stat("plants/1/a.jpg"))